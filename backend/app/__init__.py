@@ -1,20 +1,35 @@
 from flask import Flask
 from app.config import Config
 from app.db.database import db
+from app.db.engine_profile import configure_engines, install_pragmas
+from app.db.migrations import create_tables, run_migrations
 from app.utils.errors import APIError, handle_api_error
-from app.routes import api_bp
+from app.utils.json_provider import FastJSONProvider
+from app.utils.request_metrics import init_request_metrics
+from app.routes import api_bp, metrics_bp
+from app.services.recommendation_catalog_service import RecommendationCatalogService
+from app.services.follow_similarity_service import FollowSimilarityService
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
     
+    configure_engines(app)
     db.init_app(app)
     
     app.register_blueprint(api_bp)
+    app.register_blueprint(metrics_bp)
     
     app.register_error_handler(APIError, handle_api_error)
     
     with app.app_context():
-        db.create_all()
+        install_pragmas(db.engines, app.config)
+        init_request_metrics(app, db.engines)
+        create_tables(db.engine, db.metadata)
+        run_migrations(db.engine)
+        RecommendationCatalogService.reload()
+        if FollowSimilarityService.is_enabled():
+            FollowSimilarityService.rebuild_in_background()
     
     return app
\ No newline at end of file
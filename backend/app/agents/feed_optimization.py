@@ -0,0 +1,160 @@
+"""
+Feed optimization task for browser-use agents.
+
+browser-use and pydantic are optional dependencies of the backend: they are
+only imported when a real agent run is started, so the API and the stub
+runner work without them.
+"""
+
+PLATFORM_LOGIN_URLS = {
+    'instagram': 'https://www.instagram.com/accounts/login/',
+    'twitter': 'https://x.com/i/flow/login',
+}
+
+PLATFORM_HOME_URLS = {
+    'instagram': 'https://www.instagram.com/',
+    'twitter': 'https://x.com/home',
+}
+
+PLATFORM_FEED_PAGES = {
+    'instagram': 'the Reels page (/reels)',
+    'twitter': 'the "For you" timeline',
+}
+
+# Posts per run when a job does not set posts_to_optimize
+DEFAULT_POSTS_TO_OPTIMIZE = 50
+
+# Placeholders the agent sees instead of real credentials
+SENSITIVE_USERNAME_KEY = 'fw_user'
+SENSITIVE_PASSWORD_KEY = 'fw_pass'
+
+
+def get_result_model():
+    """Structured output schema for a feed optimization run (same shape as poc/script.py)"""
+    from typing import List
+    from pydantic import BaseModel
+
+    class InterestAction(BaseModel):
+        topic: str
+        action_taken: str
+        posts_affected: int
+
+    class FeedOptimizationResult(BaseModel):
+        interests_processed: List[str]
+        actions_taken: List[InterestAction]
+        feed_relevance_score: int
+        recommendations_for_future: List[str]
+
+    return FeedOptimizationResult
+
+
+def build_login_task(platform):
+    login_url = PLATFORM_LOGIN_URLS.get(platform, f'https://www.{platform}.com/')
+    return f"""
+    PHASE 1: LOGIN
+    1. Go to {login_url}
+    2. Enter the username {SENSITIVE_USERNAME_KEY} and click "Next" if the form asks for it
+    3. Enter the password {SENSITIVE_PASSWORD_KEY} and click "Log In"
+    4. Dismiss "Save Info" / notification prompts
+    5. If you encounter 2FA or additional verification, wait for manual intervention
+    6. Wait until you are logged in and on the main feed
+    """
+
+
+def build_session_check_task(platform):
+    """Login phase for runs that start from a cached session: log in only if it was rejected"""
+    home_url = PLATFORM_HOME_URLS.get(platform, f'https://www.{platform}.com/')
+    return f"""
+    PHASE 1: SESSION CHECK
+    The browser should already be logged in from a previous session.
+    1. Go to {home_url}
+    2. If the feed loads, skip straight to phase 2
+    3. Only if a login form appears, log in as follows:
+    {build_login_task(platform)}
+    """
+
+
+def build_feed_optimization_task(platform, interests, posts_to_optimize, include_login=True, session_cached=False):
+    interests_str = ", ".join(interests) if interests else 'general'
+    feed_page = PLATFORM_FEED_PAGES.get(platform, 'the main feed')
+    if session_cached:
+        login = build_session_check_task(platform)
+    else:
+        login = build_login_task(platform) if include_login else ''
+    return f"""
+    Optimize this {platform} feed for the target interests: {interests_str}
+    Posts to optimize: {posts_to_optimize}
+    {login}
+    PHASE 2: FEED OPTIMIZATION
+    1. Navigate to {feed_page}
+    2. For each post you see (up to {posts_to_optimize} posts total):
+       - If it matches our interests ({interests_str}), engage with it by liking or saving it
+       - If it doesn't match our interests, choose "Not Interested" from its menu
+       - After every 5 interactions, refresh the page to get fresh content
+    3. Search for each interest topic and engage with high-quality posts about it
+
+    Return structured data about what actions were taken during optimization.
+    """
+
+
+def build_login_only_task(platform, session_cached=False):
+    """First step of an orchestrated run: get a logged-in session and stop"""
+    login = build_session_check_task(platform) if session_cached else build_login_task(platform)
+    return f"""
+    Log in to {platform} so that later tasks can reuse this browser session.
+    {login}
+    Stop as soon as the main feed is showing; do not interact with any posts.
+    """
+
+
+def build_triage_steps(triage):
+    """Steps for posts the extraction stage already read and classified"""
+    if not triage or not (triage.get('engage') or triage.get('hide')):
+        return ''
+    engage = '\n'.join(f'       - {url}' for url in triage.get('engage', [])) or '       (none)'
+    hide = '\n'.join(f'       - {url}' for url in triage.get('hide', [])) or '       (none)'
+    return f"""
+    These posts have already been read and classified; open each link directly instead of inspecting it:
+    - Like or save:
+{engage}
+    - Choose "Not Interested" from the post's menu:
+{hide}
+    Then continue with the steps below for the remaining posts.
+    """
+
+
+def build_feed_pass_subtask(platform, interests, posts_to_optimize, triage=None):
+    """Orchestrated subtask: the main feed pass, in a browser that is already logged in"""
+    interests_str = ", ".join(interests) if interests else 'general'
+    home_url = PLATFORM_HOME_URLS.get(platform, f'https://www.{platform}.com/')
+    feed_page = PLATFORM_FEED_PAGES.get(platform, 'the main feed')
+    # Triaged posts count against the budget
+    triaged = len((triage or {}).get('engage', [])) + len((triage or {}).get('hide', []))
+    posts_left = max(0, posts_to_optimize - triaged)
+    return f"""
+    Optimize this {platform} feed for the target interests: {interests_str}
+    The browser is already logged in. Go to {home_url}; if a login form appears, stop and report it.
+    {build_triage_steps(triage)}
+    1. Navigate to {feed_page}
+    2. For each post you see (up to {posts_left} posts total):
+       - If it matches our interests ({interests_str}), engage with it by liking or saving it
+       - If it doesn't match our interests, choose "Not Interested" from its menu
+       - After every 5 interactions, refresh the page to get fresh content
+
+    Return structured data about what actions were taken during optimization.
+    """
+
+
+def build_interest_subtask(platform, interest, posts_to_optimize):
+    """Orchestrated subtask: research and engagement for a single interest, already logged in"""
+    home_url = PLATFORM_HOME_URLS.get(platform, f'https://www.{platform}.com/')
+    return f"""
+    Optimize this {platform} feed for one interest: {interest}
+    The browser is already logged in. Go to {home_url}; if a login form appears, stop and report it.
+    1. Search {platform} for "{interest}" and find accounts that post mainly about it; follow the best few
+    2. From the search results, engage with up to {posts_to_optimize} high-quality posts about {interest}
+       by liking or saving them
+    3. Choose "Not Interested" on results that are not actually about {interest}
+
+    Return structured data about what actions were taken, with {interest} as the only interest processed.
+    """
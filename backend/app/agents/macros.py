@@ -0,0 +1,402 @@
+"""
+Deterministic login macros with an LLM agent fallback.
+
+Logging in is the same fixed click sequence on every run, so asking the
+LLM to plan each step costs several model calls for no benefit. A login
+macro is an ActionScript: a list of Playwright steps (goto, fill, click,
+press, wait_for), each with fallback selectors tried in order, plus the
+selectors that prove the login worked. LoginMacros.login() replays the
+account's platform script; only when a required step finds none of its
+selectors does it hand over to the browser-use agent. The agent's
+history from a successful fallback is recorded as a new script, and a
+macro run that only got through on a fallback selector moves that
+selector to the front, so scripts follow the login pages as they change.
+
+Credentials never enter a script: inputs hold <secret>username</secret>
+and <secret>password</secret> tokens, resolved when the macro runs.
+
+Playwright is an optional dependency, imported when a macro runs.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import List, Optional
+
+from app.agents.session_cache import is_storage_state_valid
+
+SECRET_PATTERN = re.compile(r'<secret>(\w+)</secret>')
+
+# browser-use action names across versions, mapped to macro actions
+AGENT_NAVIGATE_ACTIONS = ('go_to_url', 'navigate', 'open_tab')
+AGENT_CLICK_ACTIONS = ('click_element_by_index', 'click_element', 'click')
+AGENT_INPUT_ACTIONS = ('input_text', 'input')
+AGENT_KEY_ACTIONS = ('send_keys',)
+
+# Element attributes that make stable selectors, most stable first
+SELECTOR_ATTRIBUTES = ('data-testid', 'id', 'name', 'autocomplete', 'aria-label', 'type')
+
+
+@dataclass
+class MacroStep:
+    action: str
+    selectors: List[str] = field(default_factory=list)
+    value: Optional[str] = None     # URL for goto, text (may hold secret tokens) for fill, key for press
+    optional: bool = False          # e.g. cookie banners and "Save info" prompts that do not always appear
+
+
+@dataclass
+class ActionScript:
+    platform: str
+    name: str
+    steps: List[MacroStep]
+    done_selectors: List[str] = field(default_factory=list)
+    source: str = 'builtin'         # 'builtin' or 'recorded'
+    version: int = 1
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{**data, 'steps': [MacroStep(**step) for step in data['steps']]})
+
+
+class MacroStepError(Exception):
+    """A required step found none of its selectors"""
+
+    def __init__(self, index, step):
+        super().__init__(f"Step {index + 1} ({step.action}) matched none of: {', '.join(step.selectors)}")
+        self.index = index
+        self.step = step
+
+
+def _secret(role):
+    return f'<secret>{role}</secret>'
+
+
+BUILTIN_SCRIPTS = {
+    ('twitter', 'login'): ActionScript('twitter', 'login', [
+        MacroStep('goto', value='https://x.com/i/flow/login'),
+        MacroStep('fill', ['input[autocomplete="username"]', 'input[name="text"]'], _secret('username')),
+        MacroStep('click', ['button:has-text("Next")', '[role="button"]:has-text("Next")']),
+        MacroStep('fill', ['input[name="password"]', 'input[type="password"]'], _secret('password')),
+        MacroStep('click', ['[data-testid="LoginForm_Login_Button"]', 'button:has-text("Log in")']),
+    ], done_selectors=['[data-testid="AppTabBar_Home_Link"]', '[data-testid="SideNav_AccountSwitcher_Button"]']),
+    ('instagram', 'login'): ActionScript('instagram', 'login', [
+        MacroStep('goto', value='https://www.instagram.com/accounts/login/'),
+        MacroStep('click', ['button:has-text("Allow all cookies")', 'button:has-text("Decline optional cookies")'],
+                  optional=True),
+        MacroStep('fill', ['input[name="username"]', 'input[aria-label*="username" i]'], _secret('username')),
+        MacroStep('fill', ['input[name="password"]', 'input[type="password"]'], _secret('password')),
+        MacroStep('click', ['button[type="submit"]', 'button:has-text("Log in")']),
+        MacroStep('click', ['button:has-text("Not now")', '[role="button"]:has-text("Not now")'], optional=True),
+    ], done_selectors=['svg[aria-label="Home"]', 'a[href="/direct/inbox/"]']),
+}
+
+
+class MacroStore:
+    """Scripts as JSON files; a recorded script replaces the builtin one for its platform"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, platform, name):
+        return os.path.join(self.directory, f'{platform}-{name}.json')
+
+    def get(self, platform, name='login'):
+        path = self._path(platform, name)
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    return ActionScript.from_dict(json.load(f))
+            except (ValueError, TypeError, KeyError):
+                pass    # unreadable script: fall back to the builtin one
+        builtin = BUILTIN_SCRIPTS.get((platform, name))
+        return ActionScript.from_dict(builtin.to_dict()) if builtin is not None else None
+
+    def save(self, script):
+        path = self._path(script.platform, script.name)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(script.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class MacroLoginResult:
+    path: str                       # 'macro', 'agent' or 'failed'
+    seconds: float
+    failed_step: Optional[int] = None
+    error: Optional[str] = None
+    recorded: bool = False
+    agent_result: Optional[object] = None
+
+
+async def run_script(page, script, credentials, step_timeout_ms=8000, optional_timeout_ms=1500, poll_seconds=0.05):
+    """
+    Replay script on a Playwright page.
+
+    Returns the index of the selector that matched for each step (None
+    for goto and skipped optional steps). Every step also watches the
+    done selectors, so a still-valid session that lands on the logged-in
+    page ends the script as soon as that page shows. Raises
+    MacroStepError when a required step matches nothing.
+    """
+    matched = []
+    for index, step in enumerate(script.steps):
+        if step.action == 'goto':
+            await page.goto(step.value)
+            matched.append(None)
+            continue
+
+        timeout_ms = optional_timeout_ms if step.optional else step_timeout_ms
+        selector_index = await _wait_for_any(page, step.selectors + script.done_selectors, timeout_ms, poll_seconds)
+        if selector_index is not None and selector_index >= len(step.selectors):
+            return matched
+        if selector_index is None:
+            if step.optional:
+                matched.append(None)
+                continue
+            raise MacroStepError(index, step)
+
+        locator = page.locator(step.selectors[selector_index]).first
+        if step.action == 'fill':
+            await locator.fill(_resolve_secrets(step.value or '', credentials))
+        elif step.action == 'click':
+            await locator.click()
+        elif step.action == 'press':
+            await locator.press(step.value)
+        matched.append(selector_index)
+
+    if script.done_selectors and await _wait_for_any(page, script.done_selectors, step_timeout_ms, poll_seconds) is None:
+        raise MacroStepError(len(script.steps), MacroStep('wait_for', script.done_selectors))
+    return matched
+
+
+async def _wait_for_any(page, selectors, timeout_ms, poll_seconds):
+    """Index of the first selector with a visible match, polling until timeout_ms"""
+    deadline = time.monotonic() + timeout_ms / 1000
+    while True:
+        for index, selector in enumerate(selectors):
+            try:
+                if await page.locator(selector).first.is_visible():
+                    return index
+            except Exception:
+                pass    # a selector this page cannot parse is just a miss
+        if time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(poll_seconds)
+
+
+def _resolve_secrets(value, credentials):
+    return SECRET_PATTERN.sub(lambda match: credentials.get(match.group(1), match.group(0)), value)
+
+
+def promote_selectors(script, matched):
+    """Move each step's matching fallback selector to the front; returns True if anything moved"""
+    changed = False
+    for step, selector_index in zip(script.steps, matched):
+        if selector_index:
+            step.selectors.insert(0, step.selectors.pop(selector_index))
+            changed = True
+    if changed:
+        script.version += 1
+    return changed
+
+
+def record_script(platform, history, credentials, placeholders=None, name='login', done_selectors=None):
+    """
+    Build an ActionScript from a successful browser-use run.
+
+    Navigation, clicks, text input and key presses are kept; selectors come
+    from the attributes of the element each action touched, with its XPath
+    as the last resort. Typed credentials, whether literal or as the agent's
+    <secret>key</secret> placeholders, become secret tokens. Returns None if
+    the history has no usable actions.
+    """
+    roles = {value: role for role, value in credentials.items() if value}
+    placeholder_roles = {key: roles[value] for key, value in (placeholders or {}).items() if value in roles}
+
+    def tokenize(text):
+        text = SECRET_PATTERN.sub(lambda match: _secret(placeholder_roles.get(match.group(1), match.group(1))), text)
+        return _secret(roles[text]) if text in roles else text
+
+    steps = []
+    for action in _model_actions(history):
+        element = action.get('interacted_element')
+        for action_name, params in action.items():
+            if action_name == 'interacted_element' or not isinstance(params, dict):
+                continue
+            if action_name in AGENT_NAVIGATE_ACTIONS and params.get('url'):
+                steps.append(MacroStep('goto', value=params['url']))
+            elif action_name in AGENT_CLICK_ACTIONS and element is not None:
+                steps.append(MacroStep('click', element_selectors(element)))
+            elif action_name in AGENT_INPUT_ACTIONS and element is not None:
+                steps.append(MacroStep('fill', element_selectors(element), tokenize(str(params.get('text', '')))))
+            elif action_name in AGENT_KEY_ACTIONS and params.get('keys') and steps and steps[-1].selectors:
+                steps.append(MacroStep('press', list(steps[-1].selectors), params['keys']))
+
+    steps = [step for step in steps if step.action == 'goto' or step.selectors]
+    if not any(step.action != 'goto' for step in steps):
+        return None
+    return ActionScript(platform, name, steps, done_selectors=list(done_selectors or []), source='recorded')
+
+
+def element_selectors(element):
+    """Playwright selectors for a browser-use DOMHistoryElement, most stable first"""
+    attributes = getattr(element, 'attributes', None) or {}
+    tag = (getattr(element, 'tag_name', None) or '').lower()
+    selectors = []
+    for attribute in SELECTOR_ATTRIBUTES:
+        value = attributes.get(attribute)
+        if not value:
+            continue
+        if attribute == 'id' and re.fullmatch(r'[A-Za-z][\w-]*', value):
+            selectors.append(f'#{value}')
+        elif attribute != 'type' or (tag == 'input' and value == 'password'):
+            selectors.append(f'{tag}[{attribute}="{_quote(value)}"]')
+    css_selector = getattr(element, 'css_selector', None)
+    if css_selector:
+        selectors.append(css_selector)
+    xpath = getattr(element, 'xpath', None)
+    if xpath:
+        selectors.append(f'xpath=/{xpath.lstrip("/")}' if not xpath.startswith('//') else f'xpath={xpath}')
+    return list(dict.fromkeys(selectors))
+
+
+def _quote(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _model_actions(history):
+    """[{action_name: params, 'interacted_element': element}] from a browser-use history"""
+    if callable(getattr(history, 'model_actions', None)):
+        return history.model_actions()
+    actions = []
+    for item in getattr(history, 'history', None) or []:
+        output = getattr(item, 'model_output', None)
+        elements = getattr(getattr(item, 'state', None), 'interacted_element', None) or []
+        for index, action in enumerate(getattr(output, 'action', None) or []):
+            data = action.model_dump(exclude_unset=True) if hasattr(action, 'model_dump') else dict(action)
+            data['interacted_element'] = elements[index] if index < len(elements) else None
+            actions.append(data)
+    return actions
+
+
+def _history_succeeded(history):
+    is_done = getattr(history, 'is_done', None)
+    is_successful = getattr(history, 'is_successful', None)
+    if callable(is_done) and not is_done():
+        return False
+    return not (callable(is_successful) and is_successful() is False)
+
+
+class LoginMacros:
+    """Runs login macros in Playwright, falling back to (and learning from) an agent"""
+
+    def __init__(self, store, headless=True, step_timeout_ms=8000, launch_options=None):
+        self.store = store
+        self.headless = headless
+        self.step_timeout_ms = step_timeout_ms
+        self.launch_options = launch_options or {}
+
+    @classmethod
+    def from_config(cls, config, default_directory=None):
+        """Build from app config; returns None when AGENT_LOGIN_MACROS_ENABLED is off"""
+        if not config.get('AGENT_LOGIN_MACROS_ENABLED', True):
+            return None
+        directory = (config.get('AGENT_MACRO_DIR') or default_directory
+                     or os.path.expanduser('~/.feedwise/login_macros'))
+        return cls(MacroStore(directory), step_timeout_ms=config.get('AGENT_MACRO_STEP_TIMEOUT_MS', 8000))
+
+    async def login(self, platform, username, password, storage_state_path, agent_login=None,
+                    placeholders=None, telemetry=None, start_url=None):
+        """
+        Log in and leave the session in storage_state_path.
+
+        agent_login() is awaited only if the macro fails; it must log in with
+        the browser-use agent, write the resulting storage state to
+        storage_state_path and return the agent's history. Without it a
+        failed macro returns path='failed' and the caller decides.
+        """
+        credentials = {'username': username, 'password': password}
+        start = time.perf_counter()
+        script = self.store.get(platform)
+
+        failed_step, error = None, "No login script for this platform"
+        if script is not None:
+            try:
+                matched = await self.run_in_playwright(script, credentials, storage_state_path, start_url)
+                if promote_selectors(script, matched):
+                    self.store.save(script)
+                seconds = time.perf_counter() - start
+                if telemetry is not None:
+                    telemetry.record_step(
+                        [f'macro_{step.action}' for step in script.steps], seconds, goal='log in with recorded script'
+                    )
+                return MacroLoginResult('macro', seconds)
+            except MacroStepError as e:
+                failed_step, error = e.index, str(e)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+        if agent_login is None:
+            return MacroLoginResult('failed', time.perf_counter() - start, failed_step, error)
+
+        history = await agent_login()
+        recorded = self.learn(platform, history, username, password, placeholders)
+        return MacroLoginResult(
+            'agent', time.perf_counter() - start, failed_step, error, recorded=recorded, agent_result=history
+        )
+
+    def learn(self, platform, history, username, password, placeholders=None):
+        """Record a successful agent login as the platform's script; returns True if one was saved"""
+        if not _history_succeeded(history):
+            return False
+        current = self.store.get(platform)
+        script = record_script(
+            platform, history, {'username': username, 'password': password}, placeholders,
+            done_selectors=current.done_selectors if current is not None else []
+        )
+        if script is None:
+            return False
+        if current is not None:
+            script.version = current.version + 1
+        self.store.save(script)
+        return True
+
+    async def run_in_playwright(self, script, credentials, storage_state_path, start_url=None):
+        """Replay script in a fresh Chromium context and save its storage state; returns the matched selectors"""
+        from playwright.async_api import async_playwright
+
+        if start_url:
+            script = replace(script, steps=[
+                replace(step, value=start_url) if step.action == 'goto' and index == 0 else step
+                for index, step in enumerate(script.steps)
+            ])
+        storage_state = storage_state_path if _has_state(storage_state_path) else None
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=self.headless, **self.launch_options)
+            try:
+                context = await browser.new_context(storage_state=storage_state)
+                page = await context.new_page()
+                matched = await run_script(page, script, credentials, self.step_timeout_ms)
+                await context.storage_state(path=storage_state_path)
+            finally:
+                await browser.close()
+
+        if not script.done_selectors:
+            # Recorded scripts may not know what the logged-in page looks like; require the auth cookie
+            with open(storage_state_path) as f:
+                if not is_storage_state_valid(script.platform, json.load(f)):
+                    raise MacroStepError(len(script.steps), MacroStep('wait_for', ['auth cookie']))
+        return matched
+
+
+def _has_state(path):
+    return bool(path) and os.path.exists(path) and os.path.getsize(path) > 0
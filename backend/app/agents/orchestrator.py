@@ -0,0 +1,115 @@
+"""
+Fan-out orchestration of a feed optimization run.
+
+Instead of one agent working through login, every interest and the feed
+in a single prompt, the run logs in once and then runs a pass over the
+main feed plus one research-and-engagement subtask per interest, at most
+`concurrency` at a time, each in its own browser seeded with the
+logged-in session. A failed subtask is retried up to `subtask_retries`
+times and otherwise only loses its own part of the run; the subtask
+results are merged into one FeedOptimizationResult-shaped dict.
+
+The orchestrator is browser-agnostic: the runner supplies `login(context)`
+returning a session and `run_subtask(context, subtask, session)`
+returning a FeedOptimizationResult-shaped dict.
+"""
+import asyncio
+import math
+from dataclasses import dataclass
+
+from app.agents.feed_optimization import DEFAULT_POSTS_TO_OPTIMIZE
+
+
+@dataclass(frozen=True)
+class Subtask:
+    kind: str                # 'feed' or 'interest'
+    name: str                # 'feed', or the interest
+    posts_to_optimize: int
+
+
+def plan_subtasks(interests, posts_to_optimize):
+    """A feed pass plus one subtask per distinct interest, splitting the post budget evenly"""
+    distinct = list(dict.fromkeys(interest.strip() for interest in interests or [] if interest and interest.strip()))
+    share = max(1, math.ceil(posts_to_optimize / (len(distinct) + 1)))
+    return [Subtask('feed', 'feed', share)] + [Subtask('interest', interest, share) for interest in distinct]
+
+
+def merge_results(outcomes):
+    """
+    Merge [(subtask, result or None, error or None)] into one result.
+
+    Interests keep first-seen order, identical (topic, action) entries
+    have their posts summed, the relevance score is the average of the
+    subtasks' scores weighted by the posts each one affected, and failed
+    subtasks are listed under failed_subtasks.
+    """
+    interests = {}
+    actions = {}
+    recommendations = {}
+    weighted_score = 0.0
+    weight = 0
+    failed = []
+
+    for subtask, result, error in outcomes:
+        if result is None:
+            failed.append({'subtask': subtask.name, 'error': error})
+            continue
+        for interest in result.get('interests_processed') or []:
+            interests.setdefault(interest.casefold(), interest)
+        affected = 0
+        for action in result.get('actions_taken') or []:
+            key = (action.get('topic', ''), action.get('action_taken', ''))
+            posts = max(0, int(action.get('posts_affected') or 0))
+            actions[key] = actions.get(key, 0) + posts
+            affected += posts
+        score_weight = max(1, affected)
+        weighted_score += (result.get('feed_relevance_score') or 0) * score_weight
+        weight += score_weight
+        for recommendation in result.get('recommendations_for_future') or []:
+            recommendations.setdefault(recommendation.strip().casefold(), recommendation.strip())
+
+    return {
+        'interests_processed': list(interests.values()),
+        'actions_taken': [
+            {'topic': topic, 'action_taken': action_taken, 'posts_affected': posts}
+            for (topic, action_taken), posts in actions.items()
+        ],
+        'feed_relevance_score': round(weighted_score / weight) if weight else 0,
+        'recommendations_for_future': list(recommendations.values()),
+        'failed_subtasks': failed,
+    }
+
+
+class FeedOptimizationOrchestrator:
+    def __init__(self, login, run_subtask, concurrency=3, subtask_retries=1):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.login = login
+        self.run_subtask = run_subtask
+        self.concurrency = concurrency
+        self.subtask_retries = subtask_retries
+
+    async def run(self, context):
+        session = await self.login(context)
+        subtasks = plan_subtasks(
+            context.interests, context.payload.get('posts_to_optimize', DEFAULT_POSTS_TO_OPTIMIZE)
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(subtask):
+            async with semaphore:
+                error = None
+                for _ in range(self.subtask_retries + 1):
+                    try:
+                        return subtask, await self.run_subtask(context, subtask, session), None
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                return subtask, None, error
+
+        # A cancelled run (job cancelled, lease lost) cancels every pending subtask with it
+        outcomes = await asyncio.gather(*(run_one(subtask) for subtask in subtasks))
+        if all(result is None for _, result, _ in outcomes):
+            raise RuntimeError(f"All {len(outcomes)} subtasks failed, e.g. {outcomes[0][2]}")
+        return merge_results(outcomes)
@@ -0,0 +1,337 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.agents.feed_optimization import (
+    DEFAULT_POSTS_TO_OPTIMIZE,
+    PLATFORM_HOME_URLS,
+    SENSITIVE_PASSWORD_KEY,
+    SENSITIVE_USERNAME_KEY,
+    build_feed_optimization_task,
+    build_feed_pass_subtask,
+    build_interest_subtask,
+    build_login_only_task,
+    get_result_model,
+)
+from app.agents.orchestrator import FeedOptimizationOrchestrator
+from app.agents.session_cache import StorageStateFile
+
+
+@dataclass
+class AgentRunContext:
+    """Everything a runner needs, detached from the DB session"""
+    job_id: int
+    account_id: int
+    username: str
+    password: str
+    platform: str
+    interests: List[str]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempt: int = 1
+    sentiment_filter: Optional[str] = None   # SentimentFilter value, None passes every post
+    noise_blocker_enabled: bool = True
+    telemetry: Optional[Any] = None   # AgentRunTelemetry for this attempt, when recording
+
+
+class StubAgentRunner:
+    """Stands in for browser-use in tests and local development.
+
+    Sleeps for `delay` seconds (cancellable) and fails the first `fail_times`
+    attempts of each job, then returns a FeedOptimizationResult-shaped dict.
+    """
+
+    def __init__(self, delay=0.0, fail_times=0, result=None):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.result = result
+        self.calls = []
+
+    async def run(self, context):
+        self.calls.append(context)
+        await asyncio.sleep(self.delay)
+        failed = context.attempt <= self.fail_times
+        if context.telemetry is not None:
+            context.telemetry.record_step(
+                ['stub'], self.delay, error="Stub agent failure" if failed else None
+            )
+        if failed:
+            raise RuntimeError(f"Stub agent failure on attempt {context.attempt}")
+        return self.result or {
+            'interests_processed': context.interests,
+            'actions_taken': [],
+            'feed_relevance_score': 0,
+            'recommendations_for_future': [],
+        }
+
+
+async def save_browser_storage_state(browser, path):
+    """Write the browser's cookies/localStorage to path (the method name varies across browser-use versions)"""
+    if hasattr(browser, 'export_storage_state'):
+        await browser.export_storage_state(output_path=path)
+    else:
+        await browser.save_storage_state(path)
+
+
+def _telemetry_hooks(telemetry):
+    if telemetry is None:
+        return {}
+    return {'on_step_start': telemetry.on_step_start, 'on_step_end': telemetry.on_step_end}
+
+
+class BrowserUseFeedOptimizationRunner:
+    """Runs the feed optimization task with real browser-use Agents.
+
+    With a session_cache, runs start from the account's cached storage state
+    and the agent only logs in if the platform rejects it; the state left by
+    every run is cached for the next one.
+
+    mode='sequential' gives one agent the whole task. mode='parallel' logs in
+    once and hands the feed pass and each interest to its own agent and
+    browser, at most subtask_concurrency at a time (see orchestrator.py).
+
+    With login_macros, logins without a cached session replay the platform's
+    recorded login script first and fall back to the agent (see macros.py).
+
+    With feed_extraction, the parallel feed pass first reads the feed with
+    one in-page extraction per scroll, records the posts in PostsSeen and
+    classifies them with feed_classifier, so the agent gets a list of post
+    URLs to act on instead of judging posts one step at a time. Posts
+    noise_blocker blocks (for accounts with noise_blocker_enabled) and,
+    with a sentiment_scorer, posts that do not match the account's
+    sentiment_filter are hidden without being classified.
+    """
+
+    MODES = ('sequential', 'parallel')
+
+    def __init__(self, model='gpt-4o-mini', headless=True, use_vision=True, session_cache=None,
+                 mode='sequential', subtask_concurrency=3, subtask_retries=1, login_macros=None,
+                 feed_extraction=False, feed_classifier=None, noise_blocker=None,
+                 sentiment_scorer=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown agent run mode '{mode}', expected one of: {', '.join(self.MODES)}")
+        self.model = model
+        self.headless = headless
+        self.use_vision = use_vision
+        self.session_cache = session_cache
+        self.mode = mode
+        self.subtask_concurrency = subtask_concurrency
+        self.subtask_retries = subtask_retries
+        self.login_macros = login_macros
+        self.feed_extraction = feed_extraction
+        self.feed_classifier = feed_classifier
+        self.noise_blocker = noise_blocker
+        self.sentiment_scorer = sentiment_scorer
+
+    async def run(self, context):
+        if self.mode == 'parallel':
+            return await self._run_parallel(context)
+        return await self._run_sequential(context)
+
+    async def _run_sequential(self, context):
+        from browser_use import Agent, Browser, ChatOpenAI
+
+        cached_state = None
+        if self.session_cache is not None:
+            cached_state = self.session_cache.get(context.account_id, context.platform)
+
+        start_state = cached_state
+        if start_state is None and self.login_macros is not None:
+            with StorageStateFile() as state_file:
+                outcome = await self.login_macros.login(
+                    context.platform, context.username, context.password, state_file.path,
+                    telemetry=context.telemetry
+                )
+                if outcome.path == 'macro':
+                    start_state = state_file.read()
+
+        result_model = get_result_model()
+        task = build_feed_optimization_task(
+            context.platform,
+            context.interests,
+            context.payload.get('posts_to_optimize', DEFAULT_POSTS_TO_OPTIMIZE),
+            session_cached=start_state is not None
+        )
+
+        with StorageStateFile(start_state) as state_file:
+            browser = Browser(headless=self.headless, storage_state=state_file.path)
+            agent = Agent(
+                llm=ChatOpenAI(model=self.model),
+                task=task,
+                browser=browser,
+                sensitive_data={
+                    SENSITIVE_USERNAME_KEY: context.username,
+                    SENSITIVE_PASSWORD_KEY: context.password,
+                },
+                output_model_schema=result_model,
+                use_vision=self.use_vision,
+            )
+            telemetry = context.telemetry
+            try:
+                history = await agent.run(**_telemetry_hooks(telemetry))
+                if telemetry is not None:
+                    telemetry.finish(history)
+                if self.session_cache is not None:
+                    await save_browser_storage_state(browser, state_file.path)
+                    self.session_cache.put(
+                        context.account_id, context.platform, state_file.read(),
+                        after_miss=cached_state is None
+                    )
+            finally:
+                await browser.kill()
+
+        final_result = history.final_result()
+        if not final_result:
+            raise RuntimeError("Agent finished without a result")
+        return result_model.model_validate_json(final_result).model_dump()
+
+    async def _run_parallel(self, context):
+        from browser_use import Agent, Browser, ChatOpenAI
+
+        cached_state = None
+        if self.session_cache is not None:
+            cached_state = self.session_cache.get(context.account_id, context.platform)
+
+        result_model = get_result_model()
+        telemetry = context.telemetry
+        interests = context.interests
+
+        sensitive_data = {
+            SENSITIVE_USERNAME_KEY: context.username,
+            SENSITIVE_PASSWORD_KEY: context.password,
+        }
+
+        async def agent_login(state_file):
+            browser = Browser(headless=self.headless, storage_state=state_file.path)
+            agent = Agent(
+                llm=ChatOpenAI(model=self.model),
+                task=build_login_only_task(context.platform, session_cached=cached_state is not None),
+                browser=browser,
+                sensitive_data=sensitive_data,
+                use_vision=self.use_vision,
+            )
+            try:
+                history = await agent.run(**_telemetry_hooks(telemetry))
+                if telemetry is not None:
+                    telemetry.add_usage(history)
+                if not history.is_done():
+                    raise RuntimeError("Login agent stopped before reaching the feed")
+                await save_browser_storage_state(browser, state_file.path)
+            finally:
+                await browser.kill()
+            return history
+
+        async def login(context):
+            # Only the login step sees the credentials; subtasks reuse its session
+            with StorageStateFile(cached_state) as state_file:
+                if self.login_macros is not None:
+                    await self.login_macros.login(
+                        context.platform, context.username, context.password, state_file.path,
+                        agent_login=lambda: agent_login(state_file),
+                        placeholders=sensitive_data, telemetry=telemetry
+                    )
+                else:
+                    await agent_login(state_file)
+                storage_state = state_file.read()
+
+            if self.session_cache is not None:
+                self.session_cache.put(
+                    context.account_id, context.platform, storage_state,
+                    after_miss=cached_state is None
+                )
+            return storage_state
+
+        triage = {}
+
+        async def run_subtask(context, subtask, storage_state):
+            if subtask.kind == 'feed':
+                # A retried feed pass reuses the first triage; its posts only count as seen once a pass succeeds
+                if self.feed_extraction and 'posts' not in triage:
+                    try:
+                        triage['posts'] = await self._triage_feed(context, storage_state, subtask.posts_to_optimize)
+                    except Exception as e:
+                        triage['posts'] = None
+                        print(f"Feed extraction error: {str(e)}")  # Debug logging
+                task = build_feed_pass_subtask(
+                    context.platform, interests, subtask.posts_to_optimize, triage=triage.get('posts')
+                )
+            else:
+                task = build_interest_subtask(context.platform, subtask.name, subtask.posts_to_optimize)
+            # Each subtask gets its own copy of the session, so no two browsers share a profile
+            with StorageStateFile(storage_state) as state_file:
+                browser = Browser(headless=self.headless, storage_state=state_file.path)
+                agent = Agent(
+                    llm=ChatOpenAI(model=self.model),
+                    task=task,
+                    browser=browser,
+                    output_model_schema=result_model,
+                    use_vision=self.use_vision,
+                )
+                try:
+                    history = await agent.run(**_telemetry_hooks(telemetry))
+                    if telemetry is not None:
+                        telemetry.add_usage(history)
+                finally:
+                    await browser.kill()
+
+            final_result = history.final_result()
+            if not final_result:
+                raise RuntimeError(f"Subtask '{subtask.name}' finished without a result")
+            result = result_model.model_validate_json(final_result).model_dump()
+            if subtask.kind == 'feed' and triage.get('posts'):
+                from app.services.feed_extraction_service import FeedExtractionService
+                await FeedExtractionService.mark_handled(
+                    context.account_id, triage['posts']['engage'] + triage['posts']['hide']
+                )
+            return result
+
+        orchestrator = FeedOptimizationOrchestrator(
+            login, run_subtask,
+            concurrency=self.subtask_concurrency,
+            subtask_retries=self.subtask_retries
+        )
+        return await orchestrator.run(context)
+
+    async def _triage_feed(self, context, storage_state, max_posts):
+        """
+        Extract, record and classify the logged-in feed in Playwright; {'engage': [urls], 'hide': [urls]}.
+
+        The posts are recorded as NOT_SEEN; run_subtask marks the triaged
+        ones seen after the feed pass succeeds.
+        """
+        from playwright.async_api import async_playwright
+        from app.services.feed_extraction_service import FeedExtractionService
+
+        with StorageStateFile(storage_state) as state_file:
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=self.headless)
+                try:
+                    browser_context = await browser.new_context(storage_state=state_file.path)
+                    page = await browser_context.new_page()
+                    await page.goto(PLATFORM_HOME_URLS.get(context.platform, f'https://www.{context.platform}.com/'))
+                    extraction = await FeedExtractionService.extract(
+                        page, context.account_id, context.platform, context.interests,
+                        classifier=self.feed_classifier, max_posts=max_posts,
+                        account=context, noise_blocker=self.noise_blocker,
+                        sentiment_scorer=self.sentiment_scorer
+                    )
+                finally:
+                    await browser.close()
+
+        labelled = [(post, label) for post, label in extraction['posts'] if label is not None]
+        return {
+            'engage': [post.url for post, label in labelled if label.get('relevant')],
+            # An unknown label (relevant None) goes in neither list and is left to the agent
+            'hide': [post.url for post, label in labelled if label.get('relevant') is False],
+        }
+
+
+RUNNERS = {
+    'stub': StubAgentRunner,
+    'browser_use': BrowserUseFeedOptimizationRunner,
+}
+
+
+def get_runner(name, **kwargs):
+    if name not in RUNNERS:
+        raise ValueError(f"Unknown agent runner '{name}', expected one of: {', '.join(RUNNERS)}")
+    return RUNNERS[name](**kwargs)
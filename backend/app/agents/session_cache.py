@@ -0,0 +1,263 @@
+"""
+Reusable authenticated browser sessions.
+
+A successful login leaves cookies and localStorage in the browser
+(Playwright/browser-use "storage state"). Caching that state per account,
+encrypted with Fernet, lets later runs start already logged in. A cached
+state is validated offline (auth cookie present and unexpired) before it
+is handed to a browser; the agent only performs a full login when the
+cache misses or the platform rejects the session.
+
+`cryptography` is an optional dependency, imported when a cipher is built.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Cookies that prove a logged-in session, per platform
+AUTH_COOKIES = {
+    'instagram': ('sessionid',),
+    'twitter': ('auth_token',),
+}
+
+
+def auth_cookie_expiry(platform, storage_state):
+    """Earliest expiry of the platform's auth cookies.
+
+    Returns None if any auth cookie is missing or the platform has no
+    known auth cookies (its sessions can't be checked offline, so they are
+    never cached), datetime.max for browser-session cookies without an
+    expiry.
+    """
+    auth_cookies = AUTH_COOKIES.get(platform)
+    if not auth_cookies:
+        return None
+    cookies = {cookie.get('name'): cookie for cookie in storage_state.get('cookies', [])}
+    expiry = datetime.max
+    for name in auth_cookies:
+        cookie = cookies.get(name)
+        if cookie is None or not cookie.get('value'):
+            return None
+        expires = cookie.get('expires', -1)
+        if expires is not None and expires > 0:
+            expiry = min(expiry, datetime.utcfromtimestamp(expires))
+    return expiry
+
+
+def is_storage_state_valid(platform, storage_state, now=None):
+    """Cheap offline check: every auth cookie is present and not expired"""
+    expiry = auth_cookie_expiry(platform, storage_state)
+    return expiry is not None and expiry > (now or datetime.utcnow())
+
+
+class SessionCipher:
+    """Fernet (AES-128-CBC + HMAC-SHA256) encryption for storage state blobs"""
+
+    def __init__(self, key):
+        from cryptography.fernet import Fernet
+        self._fernet = Fernet(key)
+
+    @staticmethod
+    def generate_key():
+        from cryptography.fernet import Fernet
+        return Fernet.generate_key().decode()
+
+    def encrypt(self, storage_state):
+        return self._fernet.encrypt(json.dumps(storage_state).encode('utf-8'))
+
+    def decrypt(self, token):
+        """Returns None if the blob was tampered with or encrypted under another key"""
+        from cryptography.fernet import InvalidToken
+        try:
+            return json.loads(self._fernet.decrypt(bytes(token)))
+        except (InvalidToken, ValueError):
+            return None
+
+
+@dataclass
+class StoredSession:
+    platform: str
+    encrypted_state: bytes
+    expires_at: datetime
+
+
+class DatabaseSessionStore:
+    """Sessions in the browser_sessions table (needs an app context)"""
+
+    def load(self, account_id):
+        from app.db.repository.browser_session_repository import BrowserSessionRepository
+        row = BrowserSessionRepository.get_by_account_id(account_id)
+        if row is None:
+            return None
+        return StoredSession(row.platform.value, row.encrypted_state, row.expires_at)
+
+    def save(self, account_id, platform, encrypted_state, expires_at, now, after_miss):
+        from app.db.repository.browser_session_repository import BrowserSessionRepository
+        from app.types.enums import Platform
+        BrowserSessionRepository.upsert(account_id, Platform(platform), encrypted_state, expires_at, now, after_miss)
+
+    def record_hit(self, account_id, now):
+        from app.db.repository.browser_session_repository import BrowserSessionRepository
+        BrowserSessionRepository.record_hit(account_id, now)
+
+    def delete(self, account_id):
+        from app.db.repository.browser_session_repository import BrowserSessionRepository
+        BrowserSessionRepository.delete_by_account_id(account_id)
+
+    def evict(self, now, max_entries):
+        from app.db.repository.browser_session_repository import BrowserSessionRepository
+        return BrowserSessionRepository.evict(now, max_entries)
+
+
+class FileSessionStore:
+    """Sessions as encrypted files, for standalone scripts without the database"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, account_key):
+        safe_key = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(account_key))
+        return os.path.join(self.directory, f'{safe_key}.session')
+
+    def load(self, account_key):
+        path = self._path(account_key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            header, _, encrypted_state = f.read().partition(b'\n')
+        platform, _, expires_at = header.decode().partition(' ')
+        return StoredSession(platform, encrypted_state, datetime.fromisoformat(expires_at))
+
+    def save(self, account_key, platform, encrypted_state, expires_at, now, after_miss):
+        path = self._path(account_key)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(f"{platform} {expires_at.isoformat()}\n".encode() + encrypted_state)
+
+    def record_hit(self, account_key, now):
+        os.utime(self._path(account_key))
+
+    def delete(self, account_key):
+        path = self._path(account_key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def evict(self, now, max_entries):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.session'):
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name[:-len('.session')]))
+        evicted = 0
+        for _, key in entries:
+            stored = self.load(key)
+            if stored is None or stored.expires_at <= now:
+                self.delete(key)
+                evicted += 1
+        remaining = sorted((mtime, key) for mtime, key in entries if os.path.exists(self._path(key)))
+        for _, key in remaining[:max(0, len(remaining) - max_entries)]:
+            self.delete(key)
+            evicted += 1
+        return evicted
+
+
+class BrowserSessionCache:
+    """Per-account storage state cache with TTL, LRU eviction and hit-rate metrics"""
+
+    def __init__(self, store, cipher, ttl_seconds=72 * 3600, max_entries=1000):
+        self.store = store
+        self.cipher = cipher
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalid = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, store=None):
+        """Build from app config; returns None when no SESSION_CACHE_KEY is configured"""
+        key = config.get('SESSION_CACHE_KEY')
+        if not key:
+            return None
+        return cls(
+            store or DatabaseSessionStore(),
+            SessionCipher(key),
+            ttl_seconds=config.get('BROWSER_SESSION_TTL_SECONDS', 72 * 3600),
+            max_entries=config.get('BROWSER_SESSION_MAX_ENTRIES', 1000)
+        )
+
+    def get(self, account_key, platform):
+        """Return a validated storage state, or None when a full login is needed"""
+        now = datetime.utcnow()
+        stored = self.store.load(account_key)
+        storage_state = None
+        if stored is not None and stored.platform == platform and stored.expires_at > now:
+            storage_state = self.cipher.decrypt(stored.encrypted_state)
+            if storage_state is not None and not is_storage_state_valid(platform, storage_state, now):
+                storage_state = None
+
+        with self._lock:
+            if storage_state is None:
+                self.misses += 1
+                if stored is not None:
+                    self.invalid += 1
+            else:
+                self.hits += 1
+
+        if storage_state is None:
+            if stored is not None:
+                self.store.delete(account_key)
+            return None
+
+        self.store.record_hit(account_key, now)
+        return storage_state
+
+    def put(self, account_key, platform, storage_state, after_miss=True):
+        """Cache the state left by a run; ignored if it does not hold a live session"""
+        now = datetime.utcnow()
+        cookie_expiry = auth_cookie_expiry(platform, storage_state)
+        if cookie_expiry is None or cookie_expiry <= now:
+            return False
+        expires_at = min(now + timedelta(seconds=self.ttl_seconds), cookie_expiry)
+        self.store.save(account_key, platform, self.cipher.encrypt(storage_state), expires_at, now, after_miss)
+        self.store.evict(now, self.max_entries)
+        return True
+
+    def invalidate(self, account_key):
+        self.store.delete(account_key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalid': self.invalid,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class StorageStateFile:
+    """Decrypted storage state in a private temp file for the lifetime of one browser run"""
+
+    def __init__(self, storage_state=None):
+        self.storage_state = storage_state
+        self.path = None
+
+    def __enter__(self):
+        import tempfile
+        fd, self.path = tempfile.mkstemp(prefix='feedwise-state-', suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.storage_state or {'cookies': [], 'origins': []}, f)
+        return self
+
+    def read(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def __exit__(self, *exc):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,211 @@
+"""
+Telemetry for agent runs.
+
+One AgentRunTelemetry follows one attempt of an agent job. The browser-use
+runner hands its on_step_start / on_step_end hooks to Agent.run(), and
+each finished step is recorded with its duration, token counts, actions
+and error. Every step is attributed to a phase of the task (login,
+research, optimization) from its stated goal and actions; phases only
+move forward, so a late "search" step stays in optimization.
+
+The parallel runner hands the same hooks to several agents at once, so
+step start times and phases are kept per agent (keyed by id(agent)); a
+new agent starts from the phase reached by steps recorded without one.
+
+browser-use's history objects differ between versions, so fields are
+read defensively and anything a version does not report stays None.
+Run-level token totals come from the history's usage summary when there
+is one and from the per-step counts otherwise; an orchestrated run adds
+up the usage of every agent it started.
+"""
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+PHASES = ('login', 'research', 'optimization')
+
+PHASE_PATTERNS = {
+    'login': re.compile(r'\b(log ?in|sign ?in|password|username|2fa|two-factor|verification|session)\b', re.I),
+    'research': re.compile(r'\b(google|research|top (users|accounts|\d+)|collect(ed|ing)? (the )?usernames?)\b', re.I),
+    'optimization': re.compile(r'\b(reels?|like[ds]?|liking|not interested|engag\w*|hashtags?|refresh\w*)\b', re.I),
+}
+
+
+@dataclass
+class StepRecord:
+    number: int
+    phase: str
+    seconds: float
+    actions: List[str] = field(default_factory=list)
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+
+def detect_phase(text, current):
+    """Latest phase whose keywords appear in text, never earlier than current"""
+    detected = current
+    for phase in PHASES[PHASES.index(current) + 1:]:
+        if PHASE_PATTERNS[phase].search(text):
+            detected = phase
+    return detected
+
+
+class AgentRunTelemetry:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self.steps = []
+        self.phase = PHASES[0]
+        self.input_tokens = None
+        self.output_tokens = None
+        self.cost_usd = None
+        self._started = clock()
+        self._step_started = {}   # id(agent) -> clock() at the start of its current step
+        self._agent_phases = {}   # id(agent) -> phase reached by that agent's steps
+        self._duration = None
+
+    # browser-use Agent.run(on_step_start=..., on_step_end=...) hooks
+
+    async def on_step_start(self, agent):
+        self._step_started[id(agent)] = self.clock()
+
+    async def on_step_end(self, agent):
+        item = _last_history_item(agent)
+        output = getattr(item, 'model_output', None)
+        metadata = getattr(item, 'metadata', None)
+        errors = [r.error for r in (getattr(item, 'result', None) or []) if getattr(r, 'error', None)]
+
+        seconds = None
+        step_started = self._step_started.pop(id(agent), None)
+        if metadata is not None and getattr(metadata, 'step_end_time', None) and getattr(metadata, 'step_start_time', None):
+            seconds = metadata.step_end_time - metadata.step_start_time
+        elif step_started is not None:
+            seconds = self.clock() - step_started
+
+        self.record_step(
+            actions=_action_names(output),
+            seconds=seconds or 0.0,
+            goal=_goal_text(output),
+            input_tokens=getattr(metadata, 'input_tokens', None),
+            output_tokens=getattr(metadata, 'output_tokens', None),
+            error='; '.join(str(e) for e in errors) or None,
+            agent_key=id(agent)
+        )
+
+    def record_step(self, actions, seconds, goal='', input_tokens=None, output_tokens=None, error=None,
+                    agent_key=None):
+        """Record one finished step; steps with an agent_key advance only that agent's phase"""
+        text = ' '.join([goal or ''] + list(actions))
+        if agent_key is None:
+            phase = self.phase = detect_phase(text, self.phase)
+        else:
+            phase = self._agent_phases[agent_key] = detect_phase(text, self._agent_phases.get(agent_key, self.phase))
+        step = StepRecord(
+            number=len(self.steps) + 1,
+            phase=phase,
+            seconds=round(seconds, 3),
+            actions=list(actions),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            error=error
+        )
+        self.steps.append(step)
+        return step
+
+    def add_usage(self, history):
+        """Add one agent's token totals; an orchestrated run has one history per subtask"""
+        usage = getattr(history, 'usage', None) if history is not None else None
+        if usage is not None:
+            self.input_tokens = _add_known(self.input_tokens, getattr(usage, 'total_prompt_tokens', None))
+            self.output_tokens = _add_known(self.output_tokens, getattr(usage, 'total_completion_tokens', None))
+            self.cost_usd = _add_known(self.cost_usd, getattr(usage, 'total_cost', None) or None)
+        elif history is not None and callable(getattr(history, 'total_input_tokens', None)):
+            self.input_tokens = _add_known(self.input_tokens, history.total_input_tokens())
+
+    def finish(self, history=None):
+        """Stop the clock and add the final history's token totals (safe to call twice)"""
+        if self._duration is None:
+            self._duration = self.clock() - self._started
+            self.finished_at = datetime.utcnow()
+            self.add_usage(history)
+
+    @property
+    def duration_seconds(self):
+        return self._duration if self._duration is not None else self.clock() - self._started
+
+    def token_totals(self):
+        """(input, output) for the run, from the usage summary or summed over the steps"""
+        input_tokens, output_tokens = self.input_tokens, self.output_tokens
+        if input_tokens is None:
+            input_tokens = _sum_known(step.input_tokens for step in self.steps)
+        if output_tokens is None:
+            output_tokens = _sum_known(step.output_tokens for step in self.steps)
+        return input_tokens, output_tokens
+
+    def phase_summary(self):
+        """{phase: {steps, seconds, input_tokens, output_tokens, retries, actions: {name: count}}}"""
+        phases = {}
+        for step in self.steps:
+            phase = phases.setdefault(step.phase, {
+                'steps': 0, 'seconds': 0.0, 'input_tokens': None, 'output_tokens': None,
+                'retries': 0, 'actions': {}
+            })
+            phase['steps'] += 1
+            phase['seconds'] = round(phase['seconds'] + step.seconds, 3)
+            for key in ('input_tokens', 'output_tokens'):
+                value = getattr(step, key)
+                if value is not None:
+                    phase[key] = (phase[key] or 0) + value
+            phase['retries'] += step.error is not None
+            for action in step.actions:
+                phase['actions'][action] = phase['actions'].get(action, 0) + 1
+        return phases
+
+    @property
+    def retries(self):
+        """Steps that failed and had to be retried by the agent"""
+        return sum(1 for step in self.steps if step.error is not None)
+
+    @property
+    def action_count(self):
+        return sum(len(step.actions) for step in self.steps)
+
+    def step_dicts(self):
+        return [asdict(step) for step in self.steps]
+
+
+def _last_history_item(agent):
+    history = getattr(getattr(agent, 'state', None), 'history', None) or getattr(agent, 'history', None)
+    items = getattr(history, 'history', None) or []
+    return items[-1] if items else None
+
+
+def _action_names(output):
+    names = []
+    for action in getattr(output, 'action', None) or []:
+        data = action.model_dump(exclude_unset=True) if hasattr(action, 'model_dump') else dict(action)
+        names.extend(name for name, params in data.items() if params is not None)
+    return names
+
+
+def _goal_text(output):
+    if output is None:
+        return ''
+    state = getattr(output, 'current_state', output)
+    parts = [getattr(state, name, None) for name in ('next_goal', 'memory', 'evaluation_previous_goal')]
+    return ' '.join(part for part in parts if isinstance(part, str))
+
+
+def _add_known(total, value):
+    if value is None:
+        return total
+    return (total or 0) + value
+
+
+def _sum_known(values):
+    known = [value for value in values if value is not None]
+    return sum(known) if known else None
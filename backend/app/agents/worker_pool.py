@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import traceback
+
+from app.agents.runners import AgentRunContext
+from app.agents.telemetry import AgentRunTelemetry
+from app.services.agent_job_service import AgentJobService
+from app.services.agent_run_service import AgentRunService
+from app.types.enums import Platform
+
+
+def parse_concurrency(value):
+    """Parse "instagram=2,twitter=1" into {Platform.INSTAGRAM: 2, Platform.TWITTER: 1}"""
+    concurrency = {}
+    for entry in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, _, count = entry.partition('=')
+        try:
+            concurrency[Platform(name.strip().lower())] = int(count)
+        except ValueError:
+            raise ValueError(f"Invalid worker concurrency entry '{entry}', expected platform=count")
+    return concurrency
+
+
+class AgentWorkerPool:
+    """Bounded pool of worker threads that claim and run agent jobs.
+
+    Each platform gets its own number of workers, so slow platforms cannot
+    starve the others. A worker claims a job with a lease, renews it every
+    heartbeat while the agent runs, and stops the agent if the job is
+    cancelled or the lease is lost. Failures are retried with exponential
+    backoff until the job's max_attempts is reached.
+    """
+
+    def __init__(self, app, runner, concurrency, lease_seconds=120, heartbeat_seconds=15,
+                 poll_seconds=2.0, backoff_base_seconds=30, backoff_max_seconds=1800):
+        if heartbeat_seconds >= lease_seconds:
+            raise ValueError("heartbeat_seconds must be shorter than lease_seconds")
+        self.app = app
+        self.runner = runner
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    @classmethod
+    def from_config(cls, app, runner):
+        config = app.config
+        return cls(
+            app,
+            runner,
+            parse_concurrency(config.get('AGENT_WORKER_CONCURRENCY')),
+            lease_seconds=config.get('AGENT_JOB_LEASE_SECONDS', 120),
+            heartbeat_seconds=config.get('AGENT_JOB_HEARTBEAT_SECONDS', 15),
+            poll_seconds=config.get('AGENT_WORKER_POLL_SECONDS', 2.0),
+            backoff_base_seconds=config.get('AGENT_JOB_BACKOFF_BASE_SECONDS', 30),
+            backoff_max_seconds=config.get('AGENT_JOB_BACKOFF_MAX_SECONDS', 1800),
+        )
+
+    def start(self):
+        self._stop_event.clear()
+        for platform, count in self.concurrency.items():
+            for index in range(count):
+                worker_id = f"{self._worker_prefix}:{platform.value}:{index}"
+                thread = threading.Thread(
+                    target=self._work_loop, args=(platform, worker_id), name=worker_id, daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Stop claiming new jobs and wait for running ones to finish"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work_loop(self, platform, worker_id):
+        while not self._stop_event.is_set():
+            try:
+                processed = self.run_once(platform, worker_id)
+            except Exception:
+                traceback.print_exc()
+                processed = False
+            if not processed:
+                self._stop_event.wait(self.poll_seconds)
+
+    def run_once(self, platform, worker_id):
+        """Claim and run at most one job; returns True if a job was processed"""
+        with self.app.app_context():
+            job = AgentJobService.claim_next_job(platform, worker_id, self.lease_seconds)
+            if job is None:
+                return False
+
+            if job.attempts > job.max_attempts:
+                # Reclaimed after its previous worker died, with no attempts left
+                AgentJobService.fail_job(job, worker_id, "Lease expired and no attempts remain")
+                return True
+
+            context = self._build_context(job)
+            outcome, value = asyncio.run(self._execute(job.id, worker_id, context))
+
+            if outcome == 'succeeded':
+                AgentJobService.complete_job(job.id, worker_id, value)
+            elif outcome == 'cancelled':
+                AgentJobService.mark_cancelled(job.id, worker_id)
+            elif outcome == 'failed':
+                AgentJobService.fail_job(
+                    job, worker_id, value,
+                    backoff_base_seconds=self.backoff_base_seconds,
+                    backoff_max_seconds=self.backoff_max_seconds
+                )
+            # 'lease_lost': another worker owns the job now, leave it alone
+            
+            try:
+                AgentRunService.record_run(context, outcome, value)
+            except Exception as e:
+                print(f"Agent run telemetry error: {str(e)}")  # Debug logging
+            return True
+
+    async def _execute(self, job_id, worker_id, context):
+        task = asyncio.create_task(self.runner.run(context))
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.heartbeat_seconds)
+            if done:
+                break
+            if not AgentJobService.heartbeat(job_id, worker_id, self.lease_seconds):
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                if AgentJobService.is_cancel_requested(job_id):
+                    return 'cancelled', None
+                return 'lease_lost', None
+
+        try:
+            return 'succeeded', task.result()
+        except asyncio.CancelledError:
+            return 'cancelled', None
+        except Exception as e:
+            return 'failed', f"{type(e).__name__}: {e}"
+
+    @staticmethod
+    def _build_context(job):
+        account = job.account
+        return AgentRunContext(
+            job_id=job.id,
+            account_id=account.id,
+            username=account.username,
+            password=account.password,
+            platform=account.platform.value,
+            interests=list(account.interests or []),
+            payload=json.loads(job.payload) if job.payload else {},
+            attempt=job.attempts,
+            sentiment_filter=account.sentiment_filter.value if account.sentiment_filter else None,
+            noise_blocker_enabled=account.noise_blocker_enabled is not False,
+            telemetry=AgentRunTelemetry() if AgentRunService.is_enabled() else None
+        )
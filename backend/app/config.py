@@ -3,4 +3,93 @@ import os
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///feedwise.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Read-only GETs (onboarding steps 2/3) go to this URI when set: a replica, or the same SQLite
+    # file to give readers their own query_only connection pool
+    SQLALCHEMY_READ_DATABASE_URI = os.environ.get('DATABASE_READ_URL')
+    # Connection pool sizing (not applied to in-memory SQLite)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() == 'true'
+    # SQLite pragmas applied on every new connection; WAL lets readers run alongside the single writer
+    SQLITE_TUNING_ENABLED = os.environ.get('SQLITE_TUNING_ENABLED', 'true').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    POSTS_SEEN_INGEST_BATCH_SIZE = int(os.environ.get('POSTS_SEEN_INGEST_BATCH_SIZE', 500))
+    RECOMMENDATIONS_PAGE_MAX_LIMIT = int(os.environ.get('RECOMMENDATIONS_PAGE_MAX_LIMIT', 100))
+    # Maintain account_recommendation_stats in the same transaction as follow status writes so
+    # step 3 is an O(1) read. When disabled, stats come from a GROUP BY and the counters go stale;
+    # empty account_recommendation_stats before re-enabling so rows are re-seeded on next write.
+    RECOMMENDATION_COUNTERS_ENABLED = os.environ.get('RECOMMENDATION_COUNTERS_ENABLED', 'true').lower() == 'true'
+    # Per-account Bloom filters over seen post URLs (files default to <instance>/seen_posts_filters)
+    SEEN_POSTS_FILTER_ENABLED = os.environ.get('SEEN_POSTS_FILTER_ENABLED', 'true').lower() == 'true'
+    SEEN_POSTS_FILTER_DIR = os.environ.get('SEEN_POSTS_FILTER_DIR')
+    SEEN_POSTS_FILTER_CAPACITY = int(os.environ.get('SEEN_POSTS_FILTER_CAPACITY', 100000))
+    SEEN_POSTS_FILTER_ERROR_RATE = float(os.environ.get('SEEN_POSTS_FILTER_ERROR_RATE', 0.01))
+    # Agent job queue: runner is 'browser_use' or 'stub'; concurrency is per platform, e.g. "instagram=2,twitter=1"
+    AGENT_RUNNER = os.environ.get('AGENT_RUNNER', 'browser_use')
+    AGENT_WORKER_CONCURRENCY = os.environ.get('AGENT_WORKER_CONCURRENCY', 'instagram=1,twitter=1')
+    AGENT_WORKER_POLL_SECONDS = float(os.environ.get('AGENT_WORKER_POLL_SECONDS', 2))
+    AGENT_JOB_MAX_ATTEMPTS = int(os.environ.get('AGENT_JOB_MAX_ATTEMPTS', 3))
+    AGENT_JOB_LEASE_SECONDS = int(os.environ.get('AGENT_JOB_LEASE_SECONDS', 120))
+    AGENT_JOB_HEARTBEAT_SECONDS = int(os.environ.get('AGENT_JOB_HEARTBEAT_SECONDS', 15))
+    AGENT_JOB_BACKOFF_BASE_SECONDS = int(os.environ.get('AGENT_JOB_BACKOFF_BASE_SECONDS', 30))
+    AGENT_JOB_BACKOFF_MAX_SECONDS = int(os.environ.get('AGENT_JOB_BACKOFF_MAX_SECONDS', 1800))
+    # browser_use run mode: 'sequential' (one agent, one prompt) or 'parallel' (log in once, one agent per interest)
+    AGENT_RUN_MODE = os.environ.get('AGENT_RUN_MODE', 'parallel')
+    AGENT_SUBTASK_CONCURRENCY = int(os.environ.get('AGENT_SUBTASK_CONCURRENCY', 3))
+    AGENT_SUBTASK_RETRIES = int(os.environ.get('AGENT_SUBTASK_RETRIES', 1))
+    # Recorded Playwright login scripts tried before the LLM agent (directory defaults to <instance>/login_macros)
+    AGENT_LOGIN_MACROS_ENABLED = os.environ.get('AGENT_LOGIN_MACROS_ENABLED', 'true').lower() == 'true'
+    AGENT_MACRO_DIR = os.environ.get('AGENT_MACRO_DIR')
+    AGENT_MACRO_STEP_TIMEOUT_MS = int(os.environ.get('AGENT_MACRO_STEP_TIMEOUT_MS', 8000))
+    # In-page feed extraction before the parallel feed pass: one JS evaluation per scroll, recorded in PostsSeen
+    FEED_EXTRACTION_ENABLED = os.environ.get('FEED_EXTRACTION_ENABLED', 'true').lower() == 'true'
+    FEED_EXTRACTION_MAX_SCROLLS = int(os.environ.get('FEED_EXTRACTION_MAX_SCROLLS', 30))
+    FEED_EXTRACTION_WRITE_BATCH = int(os.environ.get('FEED_EXTRACTION_WRITE_BATCH', 50))
+    FEED_EXTRACTION_CLASSIFY_BATCH = int(os.environ.get('FEED_EXTRACTION_CLASSIFY_BATCH', 20))
+    # Per-attempt agent run telemetry (agent_runs table); prices estimate cost when browser-use reports none
+    AGENT_TELEMETRY_ENABLED = os.environ.get('AGENT_TELEMETRY_ENABLED', 'true').lower() == 'true'
+    AGENT_LLM_INPUT_COST_PER_MTOK = float(os.environ.get('AGENT_LLM_INPUT_COST_PER_MTOK', 0.15))
+    AGENT_LLM_OUTPUT_COST_PER_MTOK = float(os.environ.get('AGENT_LLM_OUTPUT_COST_PER_MTOK', 0.60))
+    # Encrypted browser session cache; generate a key with SessionCipher.generate_key(). Unset disables caching.
+    SESSION_CACHE_KEY = os.environ.get('SESSION_CACHE_KEY')
+    BROWSER_SESSION_TTL_SECONDS = int(os.environ.get('BROWSER_SESSION_TTL_SECONDS', 72 * 3600))
+    BROWSER_SESSION_MAX_ENTRIES = int(os.environ.get('BROWSER_SESSION_MAX_ENTRIES', 1000))
+    # Two-tier cache for LLM interest classifications (unset path = memory tier only)
+    CLASSIFICATION_CACHE_PATH = os.environ.get('CLASSIFICATION_CACHE_PATH')
+    CLASSIFICATION_CACHE_MEMORY_ENTRIES = int(os.environ.get('CLASSIFICATION_CACHE_MEMORY_ENTRIES', 10000))
+    CLASSIFICATION_CACHE_MEMORY_TTL_SECONDS = int(os.environ.get('CLASSIFICATION_CACHE_MEMORY_TTL_SECONDS', 3600))
+    CLASSIFICATION_CACHE_DISK_ENTRIES = int(os.environ.get('CLASSIFICATION_CACHE_DISK_ENTRIES', 1000000))
+    CLASSIFICATION_CACHE_DISK_TTL_SECONDS = int(os.environ.get('CLASSIFICATION_CACHE_DISK_TTL_SECONDS', 7 * 24 * 3600))
+    # Local sentiment scoring for Account.sentiment_filter (LRU keyed by normalized post text)
+    SENTIMENT_CACHE_ENTRIES = int(os.environ.get('SENTIMENT_CACHE_ENTRIES', 50000))
+    SENTIMENT_CACHE_TTL_SECONDS = int(os.environ.get('SENTIMENT_CACHE_TTL_SECONDS', 24 * 3600))
+    # Noise/scam blocker rules file (defaults to app/feed/data/noise_rules.json), re-read when it changes
+    NOISE_RULES_PATH = os.environ.get('NOISE_RULES_PATH')
+    NOISE_RULES_RELOAD_SECONDS = float(os.environ.get('NOISE_RULES_RELOAD_SECONDS', 5))
+    # Recommendation catalog file (defaults to app/data/recommendation_catalog.json); checked for changes
+    # at most every RECOMMENDATION_CATALOG_RELOAD_SECONDS (negative disables reloading)
+    RECOMMENDATION_CATALOG_PATH = os.environ.get('RECOMMENDATION_CATALOG_PATH')
+    RECOMMENDATION_CATALOG_RELOAD_SECONDS = float(os.environ.get('RECOMMENDATION_CATALOG_RELOAD_SECONDS', 30))
+    # Item-item collaborative filtering over FOLLOWED/SKIPPED decisions, blended into generated recommendations
+    COLLABORATIVE_RECOMMENDATIONS_ENABLED = os.environ.get('COLLABORATIVE_RECOMMENDATIONS_ENABLED', 'true').lower() == 'true'
+    COLLABORATIVE_MIN_SUPPORT = int(os.environ.get('COLLABORATIVE_MIN_SUPPORT', 2))
+    COLLABORATIVE_WEIGHT = float(os.environ.get('COLLABORATIVE_WEIGHT', 1.0))
+    # Background rebuild from the table at startup and then at most this often (negative: startup only)
+    COLLABORATIVE_REBUILD_SECONDS = int(os.environ.get('COLLABORATIVE_REBUILD_SECONDS', 3600))
+    # Process-wide Account cache in front of AccountRepository lookups (per process; TTL bounds cross-process staleness)
+    ACCOUNT_CACHE_ENABLED = os.environ.get('ACCOUNT_CACHE_ENABLED', 'true').lower() == 'true'
+    ACCOUNT_CACHE_MAX_ENTRIES = int(os.environ.get('ACCOUNT_CACHE_MAX_ENTRIES', 10000))
+    ACCOUNT_CACHE_TTL_SECONDS = int(os.environ.get('ACCOUNT_CACHE_TTL_SECONDS', 60))
+    # Server-side cache of onboarding step 2/3 responses, tagged with the per-account change counter
+    # that also backs their ETags (stale entries never match, so invalidation only frees memory)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+    # Per-request SQL/latency instrumentation exposed on /metrics (when off, no hooks are installed)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('METRICS_N_PLUS_ONE_THRESHOLD', 5))
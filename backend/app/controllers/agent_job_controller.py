@@ -0,0 +1,106 @@
+from flask import request, jsonify, current_app
+from app.services.agent_job_service import AgentJobService
+from app.services.agent_run_service import AgentRunService
+from app.types.enums import Platform
+from app.utils.errors import APIError, ValidationError
+import json
+
+class AgentJobController:
+    @staticmethod
+    def submit_feed_optimization_job():
+        """Queue a feed optimization run for an account"""
+        try:
+            data = request.get_json()
+            if not data:
+                raise ValidationError("Request body is required")
+            
+            account_id = data.get('account_id')
+            if not account_id:
+                raise ValidationError("account_id is required")
+            try:
+                account_id = int(account_id)
+            except (TypeError, ValueError):
+                raise ValidationError("account_id must be a valid number")
+            
+            job = AgentJobService.enqueue_feed_optimization(
+                account_id,
+                data.get('options', {}),
+                max_attempts=current_app.config.get('AGENT_JOB_MAX_ATTEMPTS', 3)
+            )
+            
+            return jsonify({
+                'message': 'Feed optimization job queued',
+                'job': AgentJobController._format_job(job)
+            }), 202
+        
+        except (ValidationError, APIError):
+            raise
+        except Exception as e:
+            print(f"Job submit error: {str(e)}")  # Debug logging
+            raise APIError(f"Failed to queue job: {str(e)}", status_code=500)
+    
+    @staticmethod
+    def get_job_status(job_id):
+        """Poll the status of a job"""
+        job = AgentJobService.get_job_by_id(job_id)
+        return jsonify({
+            'message': 'Job fetched successfully',
+            'job': AgentJobController._format_job(job)
+        }), 200
+    
+    @staticmethod
+    def cancel_job(job_id):
+        """Cancel a queued or running job"""
+        job = AgentJobService.cancel_job(job_id)
+        return jsonify({
+            'message': 'Job cancellation requested',
+            'job': AgentJobController._format_job(job)
+        }), 200
+    
+    @staticmethod
+    def get_run_report():
+        """Cost and latency per post processed, grouped by posts_to_optimize"""
+        platform = request.args.get('platform')
+        if platform:
+            try:
+                platform = Platform(platform.lower())
+            except ValueError:
+                raise ValidationError(f"Invalid platform: {platform}")
+        else:
+            platform = None
+        
+        days = request.args.get('days')
+        if days:
+            try:
+                days = int(days)
+            except ValueError:
+                raise ValidationError("days must be a valid number")
+            if days < 1:
+                raise ValidationError("days must be at least 1")
+        else:
+            days = None
+        
+        return jsonify({
+            'message': 'Run report fetched successfully',
+            'report': AgentRunService.get_cost_latency_report(platform=platform, days=days)
+        }), 200
+    
+    @staticmethod
+    def _format_job(job):
+        return {
+            'id': job.id,
+            'account_id': job.account_id,
+            'job_type': job.job_type.value if job.job_type else None,
+            'platform': job.platform.value if job.platform else None,
+            'status': job.status.value if job.status else None,
+            'options': json.loads(job.payload) if job.payload else {},
+            'result': json.loads(job.result) if job.result else None,
+            'error': job.error,
+            'attempts': job.attempts,
+            'max_attempts': job.max_attempts,
+            'cancel_requested': job.cancel_requested,
+            'available_at': job.available_at.isoformat() if job.available_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+            'created_at': job.created_at.isoformat() if job.created_at else None
+        }
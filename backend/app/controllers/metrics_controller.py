@@ -0,0 +1,15 @@
+from flask import current_app
+from app.utils import request_metrics
+from app.utils.errors import NotFoundError
+
+class MetricsController:
+    @staticmethod
+    def export_metrics():
+        """Request, SQL and cache metrics in Prometheus text format"""
+        if not current_app.config.get('METRICS_ENABLED', False):
+            raise NotFoundError("Metrics are disabled")
+        
+        return current_app.response_class(
+            request_metrics.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
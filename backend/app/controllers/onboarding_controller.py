@@ -1,7 +1,9 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
+from app.db.database import read_only_routing
 from app.services.onboarding_service import OnboardingService
+from app.services.response_cache_service import ResponseCacheService
 from app.utils.errors import APIError, ValidationError
-import json
+from app.utils.serializers import ACCOUNT_DETAIL, ACCOUNT_PROFILE, ACCOUNT_SUMMARY, RECOMMENDATION, RECOMMENDATION_STATUS
 
 class OnboardingController:
     @staticmethod
@@ -46,12 +48,7 @@ class OnboardingController:
         account = OnboardingService.create_account(account_data)
         return jsonify({
             'message': 'Account created successfully',
-            'account': {
-                'id': account.id,
-                'username': account.username,
-                'platform': account.platform.value if account.platform else None,
-                'created_at': account.created_at.isoformat() if account.created_at else None
-            },
+            'account': ACCOUNT_SUMMARY(account),
             'next_step': 1
         }), 201
     
@@ -59,12 +56,57 @@ class OnboardingController:
     def _execute_get_step(step):
         """Execute GET operations for specific onboarding steps"""
         if step == 2:
-            return OnboardingController._fetch_user_recommendations()
+            return OnboardingController._conditional_get(step, OnboardingController._fetch_user_recommendations)
         elif step == 3:
-            return OnboardingController._complete_user_onboarding()
+            return OnboardingController._conditional_get(step, OnboardingController._complete_user_onboarding)
         else:
             raise ValidationError(f"Invalid GET step: {step}")
     
+    @staticmethod
+    def _conditional_get(step, render):
+        """Serve a per-account GET step with a versioned ETag, 304s and the server-side response cache"""
+        # Steps 2 and 3 only read, so they can be served from the read engine
+        with read_only_routing():
+            return OnboardingController._conditional_response(step, render)
+    
+    @staticmethod
+    def _conditional_response(step, render):
+        account_id = request.args.get('account_id')
+        try:
+            account_id = int(account_id) if account_id else None
+        except ValueError:
+            account_id = None
+        if account_id is None:
+            # Let the step handler report the missing/invalid parameter
+            return render()
+        
+        # Read the version before rendering: a write racing the render can only make
+        # the stored body newer than its tag, never older
+        version = ResponseCacheService.current_version(account_id)
+        key = ResponseCacheService.cache_key(
+            account_id, step,
+            [(name, value) for name, value in request.args.items(multi=True) if name not in ('step', 'account_id')]
+        )
+        etag = ResponseCacheService.etag(key, version)
+        
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            cached = ResponseCacheService.lookup(key, version)
+            if cached is not None:
+                status, body = cached
+                response = current_app.response_class(body, status=status, mimetype='application/json')
+            else:
+                with ResponseCacheService.fresh_render():
+                    response, status = render()
+                response.status_code = status
+                if status == 200:
+                    ResponseCacheService.store(key, version, status, response.get_data())
+        
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    
     @staticmethod
     def _fetch_user_recommendations():
         """Fetch pending recommendations for user (Step 2)"""
@@ -77,19 +119,49 @@ class OnboardingController:
         except ValueError:
             raise ValidationError("account_id must be a valid number")
         
-        pending_recommendations = OnboardingService.get_pending_recommendations(account_id)
+        limit = OnboardingController._parse_optional_int_arg('limit', minimum=1)
+        after_id = OnboardingController._parse_optional_int_arg('after_id', minimum=0)
+        
+        if limit is None:
+            pending_recommendations = OnboardingService.get_pending_recommendations(account_id, after_id=after_id)
+            has_more = False
+        else:
+            limit = min(limit, current_app.config.get('RECOMMENDATIONS_PAGE_MAX_LIMIT', 100))
+            # Fetch one extra row to learn whether another page exists
+            pending_recommendations = OnboardingService.get_pending_recommendations(
+                account_id, limit=limit + 1, after_id=after_id
+            )
+            has_more = len(pending_recommendations) > limit
+            pending_recommendations = pending_recommendations[:limit]
         
         return jsonify({
             'message': 'Recommendations fetched successfully',
-            'recommendations': [{
-                'id': rec.id,
-                'recommended_user': rec.recommended_user,
-                'reason': rec.reason,
-                'follow_status': rec.follow_status.value if rec.follow_status else None
-            } for rec in pending_recommendations],
+            'recommendations': RECOMMENDATION.many(pending_recommendations),
+            'pagination': {
+                'limit': limit,
+                'after_id': after_id,
+                'next_after_id': pending_recommendations[-1].id if has_more else None,
+                'has_more': has_more
+            },
             'next_step': 'dashboard'
         }), 200
     
+    @staticmethod
+    def _parse_optional_int_arg(name, minimum=None):
+        """Parse an optional integer query parameter"""
+        value = request.args.get(name)
+        if value is None or value == '':
+            return None
+        
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError(f"{name} must be a valid number")
+        
+        if minimum is not None and value < minimum:
+            raise ValidationError(f"{name} must be at least {minimum}")
+        return value
+    
     @staticmethod
     def _complete_user_onboarding():
         """Complete onboarding process and return final data (Step 3)"""
@@ -108,14 +180,7 @@ class OnboardingController:
         
         return jsonify({
             'message': 'Onboarding completed successfully',
-            'account': {
-                'id': account.id,
-                'username': account.username,
-                'platform': account.platform.value if account.platform else None,
-                'interests': json.loads(account.interests) if account.interests else [],
-                'sentiment_filter': account.sentiment_filter.value if account.sentiment_filter else None,
-                'noise_blocker_enabled': account.noise_blocker_enabled
-            },
+            'account': ACCOUNT_PROFILE(account),
             'stats': stats,
             'status': 'onboarding_complete'
         }), 200
@@ -157,18 +222,11 @@ class OnboardingController:
         
         # Generate recommendations based on interests
         OnboardingService.generate_recommendations(account_id)
+        ResponseCacheService.invalidate_accounts([account.id])
         
         return jsonify({
             'message': 'Preferences set successfully',
-            'account': {
-                'id': account.id,
-                'username': account.username,
-                'platform': account.platform.value if account.platform else None,
-                'interests': json.loads(account.interests) if account.interests else [],
-                'sentiment_filter': account.sentiment_filter.value if account.sentiment_filter else None,
-                'noise_blocker_enabled': account.noise_blocker_enabled,
-                'created_at': account.created_at.isoformat() if account.created_at else None
-            },
+            'account': ACCOUNT_DETAIL(account),
             'next_step': 2
         }), 200
     
@@ -176,16 +234,19 @@ class OnboardingController:
     def _update_follow_status(data):
         """Update follow status for recommendations (Step 2)"""
         recommendation_updates = data.get('recommendations', [])
-        updated_recommendations = OnboardingService.update_follow_decisions(recommendation_updates)
+        account_id = data.get('account_id')
+        if not account_id:
+            raise ValidationError("account_id is required for follow status update")
+        try:
+            account_id = int(account_id)
+        except (TypeError, ValueError):
+            raise ValidationError("account_id must be a valid number")
         
-        formatted_recommendations = [{
-            'id': rec.id,
-            'recommended_user': rec.recommended_user,
-            'follow_status': rec.follow_status.value if rec.follow_status else None
-        } for rec in updated_recommendations]
+        updated_recommendations = OnboardingService.update_follow_decisions(account_id, recommendation_updates)
+        ResponseCacheService.invalidate_accounts(rec.account_id for rec in updated_recommendations)
         
         return jsonify({
             'message': 'Follow status updated successfully',
-            'updated_recommendations': formatted_recommendations,
+            'updated_recommendations': RECOMMENDATION_STATUS.many(updated_recommendations),
             'next_step': 3
         }), 200
\ No newline at end of file
@@ -0,0 +1,69 @@
+from flask import request, jsonify, current_app
+from app.services.posts_seen_service import PostsSeenService
+from app.services.seen_posts_filter_service import SeenPostsFilterService
+from app.utils.errors import APIError, ValidationError
+from app.utils.ndjson import iter_ndjson
+
+class PostsSeenController:
+    @staticmethod
+    def ingest_posts_seen():
+        """Bulk upsert seen posts from a streamed NDJSON request body"""
+        try:
+            account_id = request.args.get('account_id')
+            if account_id is not None:
+                try:
+                    account_id = int(account_id)
+                except ValueError:
+                    raise ValidationError("account_id must be a valid number")
+            
+            batch_size = current_app.config.get('POSTS_SEEN_INGEST_BATCH_SIZE', 500)
+            summary = PostsSeenService.ingest_posts_seen(
+                iter_ndjson(request.stream),
+                account_id=account_id,
+                batch_size=batch_size
+            )
+            
+            return jsonify({
+                'message': 'Posts seen ingested',
+                **summary
+            }), 200
+        
+        except (ValidationError, APIError):
+            raise
+        except Exception as e:
+            print(f"Ingest error: {str(e)}")  # Debug logging
+            raise APIError(f"Failed to ingest posts seen: {str(e)}", status_code=500)
+    
+    @staticmethod
+    def check_posts_seen():
+        """Bulk membership check against the account's seen-post filter"""
+        try:
+            data = request.get_json()
+            if not data:
+                raise ValidationError("Request body is required")
+            
+            account_id = data.get('account_id')
+            if not account_id:
+                raise ValidationError("account_id is required")
+            try:
+                account_id = int(account_id)
+            except (TypeError, ValueError):
+                raise ValidationError("account_id must be a valid number")
+            
+            post_urls = data.get('post_urls')
+            if not isinstance(post_urls, list) or not all(isinstance(url, str) for url in post_urls):
+                raise ValidationError("post_urls must be a list of strings")
+            
+            unseen = SeenPostsFilterService.filter_unseen(account_id, post_urls)
+            
+            return jsonify({
+                'message': 'Posts checked successfully',
+                'unseen': unseen,
+                'seen_count': len(post_urls) - len(unseen)
+            }), 200
+        
+        except (ValidationError, APIError):
+            raise
+        except Exception as e:
+            print(f"Check error: {str(e)}")  # Debug logging
+            raise APIError(f"Failed to check posts seen: {str(e)}", status_code=500)
@@ -1,3 +1,35 @@
+from contextlib import contextmanager
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from app.db.engine_profile import READ_BIND_KEY
 
-db = SQLAlchemy()
\ No newline at end of file
+
+class RoutingSession(Session):
+    """Sends reads to the read engine inside read_only_routing(); flushes and DML stay on the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._route_to_read_engine(clause):
+            return self._db.engines[READ_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _route_to_read_engine(self, clause):
+        if self._flushing or not has_app_context() or not g.get('_db_read_routing'):
+            return False
+        if clause is not None and getattr(clause, 'is_dml', False):
+            return False
+        return READ_BIND_KEY in self._db.engines
+
+
+@contextmanager
+def read_only_routing():
+    """Route this request's reads to the read engine (a no-op when none is configured)"""
+    previous = g.get('_db_read_routing', False)
+    g._db_read_routing = True
+    try:
+        yield
+    finally:
+        g._db_read_routing = previous
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
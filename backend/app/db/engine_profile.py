@@ -0,0 +1,84 @@
+"""
+Engine profile: pool sizing, SQLite pragmas and the optional read engine.
+
+configure_engines() runs before db.init_app() and turns the DB_* /
+SQLITE_* settings into SQLALCHEMY_ENGINE_OPTIONS, registering the read
+URI (when set) as the READ_BIND_KEY bind. install_pragmas() then hooks
+every SQLite engine so each new connection gets the WAL / synchronous /
+mmap / busy_timeout pragmas; the read engine's connections are also put
+in query_only mode.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+READ_BIND_KEY = 'read'
+
+
+def is_memory_sqlite(uri):
+    url = make_url(uri)
+    return (
+        url.get_backend_name() == 'sqlite'
+        and (url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+    )
+
+
+def engine_options(uri, config):
+    """create_engine() keyword arguments for the URI under the configured profile"""
+    # In-memory SQLite uses SingletonThreadPool, which takes no sizing arguments
+    if is_memory_sqlite(uri):
+        return {}
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', False),
+    }
+
+
+def configure_engines(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS / SQLALCHEMY_BINDS from the profile (explicit settings win)"""
+    config = app.config
+    options = engine_options(config['SQLALCHEMY_DATABASE_URI'], config)
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    read_uri = config.get('SQLALCHEMY_READ_DATABASE_URI')
+    if read_uri:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(READ_BIND_KEY, {'url': read_uri, **engine_options(read_uri, config)})
+        config['SQLALCHEMY_BINDS'] = binds
+
+
+def sqlite_pragmas(config, read_only=False):
+    if not config.get('SQLITE_TUNING_ENABLED', True):
+        return []
+    pragmas = [
+        f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"PRAGMA journal_mode={config.get('SQLITE_JOURNAL_MODE', 'WAL')}",
+        f"PRAGMA synchronous={config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 0))}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def install_pragmas(engines, config):
+    """Apply the SQLite pragmas on every new connection of each SQLite engine"""
+    for bind_key, engine in engines.items():
+        if engine.dialect.name != 'sqlite':
+            continue
+        pragmas = sqlite_pragmas(config, read_only=bind_key == READ_BIND_KEY)
+        if not pragmas:
+            continue
+
+        def on_connect(dbapi_connection, connection_record, pragmas=pragmas):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+        event.listen(engine, 'connect', on_connect)
@@ -0,0 +1,170 @@
+"""
+Versioned, incremental schema migrations.
+
+db.create_all() only creates missing tables; it never alters existing ones.
+Each migration here brings a live database forward without dropping it.
+Applied versions are recorded in the schema_migrations table, and every
+migration is written to be safe on a database that create_all() already
+built at the latest schema.
+
+Every worker runs this at startup, so table creation and each migration
+take a schema lock first (a Postgres advisory lock, or the SQLite write
+lock) and re-read the applied versions under it; a worker that loses the
+race skips the versions the winner already recorded.
+"""
+from sqlalchemy import text
+
+MIGRATIONS = []
+
+# pg_advisory_xact_lock key shared by every FeedWise process touching the schema
+_SCHEMA_LOCK_KEY = 0x46574D47
+
+
+def migration(version, description):
+    """Register a migration function under a unique, increasing version"""
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return decorator
+
+
+@migration(1, "Unique index on posts_seen (account_id, post_url)")
+def _unique_posts_seen_account_post_url(conn):
+    # Collapse existing duplicates onto the most recent row before enforcing uniqueness
+    conn.execute(text("""
+        DELETE FROM posts_seen
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM posts_seen GROUP BY account_id, post_url
+        )
+    """))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_posts_seen_account_post_url "
+        "ON posts_seen (account_id, post_url)"
+    ))
+
+
+@migration(2, "Composite indexes for per-account status lookups")
+def _account_status_indexes(conn):
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_posts_seen_account_status "
+        "ON posts_seen (account_id, status)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_following_recommendations_account_follow_status "
+        "ON following_recommendations (account_id, follow_status)"
+    ))
+
+
+@migration(3, "Backfill per-account recommendation counters")
+def _backfill_recommendation_stats(conn):
+    from app.models.account_recommendation_stats_model import AccountRecommendationStats
+    AccountRecommendationStats.__table__.create(conn, checkfirst=True)
+    conn.execute(text("""
+        INSERT INTO account_recommendation_stats
+            (account_id, followed_count, skipped_count, pending_count, total_count)
+        SELECT
+            account_id,
+            SUM(CASE WHEN follow_status = 'FOLLOWED' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN follow_status = 'SKIPPED' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN follow_status = 'PENDING' OR follow_status IS NULL THEN 1 ELSE 0 END),
+            COUNT(*)
+        FROM following_recommendations
+        WHERE account_id NOT IN (SELECT account_id FROM account_recommendation_stats)
+        GROUP BY account_id
+    """))
+
+
+@migration(4, "Store account.interests as a native JSON column")
+def _account_interests_json(conn):
+    if conn.dialect.name == 'postgresql':
+        # create_all() already builds the column as JSON; only a column still holding text needs converting
+        data_type = conn.execute(text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'account' AND column_name = 'interests'
+        """)).scalar()
+        if data_type in ('text', 'character varying'):
+            conn.execute(text(
+                "ALTER TABLE account ALTER COLUMN interests TYPE JSON USING NULLIF(TRIM(interests), '')::json"
+            ))
+        return
+    # SQLite stores JSON as TEXT, so the column keeps its affinity; clear values the JSON type cannot load
+    conn.execute(text("""
+        UPDATE account SET interests = NULL
+        WHERE interests IS NOT NULL
+          AND (TRIM(interests) = '' OR interests = 'null' OR json_valid(interests) = 0)
+    """))
+
+
+@migration(5, "Add NEUTRAL to the post status enum")
+def _post_status_neutral(conn):
+    if conn.dialect.name != 'postgresql':
+        # SQLite stores Enum columns as plain VARCHAR without a CHECK constraint
+        return
+    # Postgres keeps Enum(PostStatus) as the native type "poststatus", holding member names;
+    # ADD VALUE runs inside the migration's transaction on Postgres 12+
+    conn.execute(text("ALTER TYPE poststatus ADD VALUE IF NOT EXISTS 'NEUTRAL'"))
+
+
+def _lock_schema(conn):
+    """Hold the schema lock until conn's transaction ends; call before reading anything"""
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': _SCHEMA_LOCK_KEY})
+    elif conn.dialect.name == 'sqlite':
+        # pysqlite begins lazily; take the write lock now so the reads below see the latest schema
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _ensure_version_table(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+
+def _applied_versions(conn):
+    _ensure_version_table(conn)
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def create_tables(engine, metadata):
+    """metadata.create_all() under the schema lock, so concurrent workers don't both create a table"""
+    with engine.begin() as conn:
+        _lock_schema(conn)
+        metadata.create_all(conn)
+
+
+def get_applied_versions(engine):
+    with engine.begin() as conn:
+        _lock_schema(conn)
+        return _applied_versions(conn)
+
+
+def get_pending_migrations(engine):
+    applied = get_applied_versions(engine)
+    return [m for m in sorted(MIGRATIONS, key=lambda m: m[0]) if m[0] not in applied]
+
+
+def run_migrations(engine, verbose=False):
+    """Apply pending migrations in version order, each in its own transaction.
+
+    Returns the list of versions this call applied; versions another
+    process applied while we waited for the schema lock are skipped.
+    """
+    applied_now = []
+    for version, description, func in get_pending_migrations(engine):
+        with engine.begin() as conn:
+            _lock_schema(conn)
+            if version in _applied_versions(conn):
+                continue
+            func(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description) VALUES (:version, :description)"),
+                {'version': version, 'description': description}
+            )
+        if verbose:
+            print(f"  ⬆️  {version:04d} {description}")
+        applied_now.append(version)
+    return applied_now
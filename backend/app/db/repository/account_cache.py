@@ -0,0 +1,254 @@
+"""
+Caching for AccountRepository lookups.
+
+Two layers sit in front of the database:
+
+- a request-scoped identity map on flask.g (the same lifetime as the
+  Flask-SQLAlchemy session), indexed by id and by username, so repeated
+  lookups within one request return the already-loaded instance;
+- an optional process-wide LRU of committed column snapshots keyed by id
+  and by username. A hit is attached to the current session with
+  merge(load=False), so no SELECT is issued.
+
+Writes through AccountRepository invalidate both layers. Other processes
+are not notified, so ACCOUNT_CACHE_TTL_SECONDS bounds how stale a
+snapshot can be. Reads that must match the current account version (e.g.
+bodies stored and ETagged under it) run inside fresh_reads(), which skips
+the snapshots and refreshes them from the database.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.database import db
+from app.models.account_model import Account
+
+_COLUMNS = [column.key for column in inspect(Account).column_attrs]
+
+
+class AccountSnapshotCache:
+    """Thread-safe LRU of {column: value} snapshots with id and username keys"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._by_id = OrderedDict()    # id -> (snapshot, expires_at)
+        self._ids_by_username = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get_by_id(self, account_id, now=None):
+        now = now or time.monotonic()
+        with self._lock:
+            entry = self._by_id.get(account_id)
+            if entry is None:
+                return None
+            snapshot, expires_at = entry
+            if expires_at <= now:
+                self._drop(account_id)
+                return None
+            self._by_id.move_to_end(account_id)
+            return snapshot
+
+    def get_by_username(self, username, now=None):
+        account_id = self._ids_by_username.get(username)
+        if account_id is None:
+            return None
+        snapshot = self.get_by_id(account_id, now)
+        return snapshot if snapshot is not None and snapshot['username'] == username else None
+
+    def put(self, snapshot, now=None):
+        expires_at = (now or time.monotonic()) + self.ttl_seconds
+        with self._lock:
+            self._drop(snapshot['id'])
+            self._by_id[snapshot['id']] = (snapshot, expires_at)
+            self._ids_by_username[snapshot['username']] = snapshot['id']
+            while len(self._by_id) > self.max_entries:
+                self._drop(next(iter(self._by_id)))
+                self.evictions += 1
+
+    def invalidate(self, account_id=None, username=None):
+        with self._lock:
+            if account_id is not None:
+                self._drop(account_id)
+            if username is not None:
+                stale_id = self._ids_by_username.pop(username, None)
+                if stale_id is not None:
+                    self._drop(stale_id)
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._ids_by_username.clear()
+
+    def _drop(self, account_id):
+        entry = self._by_id.pop(account_id, None)
+        if entry is not None and self._ids_by_username.get(entry[0]['username']) == account_id:
+            del self._ids_by_username[entry[0]['username']]
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+# Per-process snapshot cache (created from config on first use) and hit counters
+_snapshots = None
+_snapshots_lock = threading.Lock()
+_metrics = {'request_hits': 0, 'process_hits': 0, 'misses': 0, 'invalidations': 0}
+_metrics_lock = threading.Lock()
+
+
+def _count(metric):
+    with _metrics_lock:
+        _metrics[metric] += 1
+
+
+def _snapshot_cache():
+    global _snapshots
+    config = current_app.config
+    if not config.get('ACCOUNT_CACHE_ENABLED', True):
+        return None
+    if _snapshots is None:
+        with _snapshots_lock:
+            if _snapshots is None:
+                _snapshots = AccountSnapshotCache(
+                    max_entries=config.get('ACCOUNT_CACHE_MAX_ENTRIES', 10000),
+                    ttl_seconds=config.get('ACCOUNT_CACHE_TTL_SECONDS', 60)
+                )
+    return _snapshots
+
+
+def _request_map():
+    """(by_id, by_username) dicts living as long as the current app/request context"""
+    if not has_app_context():
+        return None
+    maps = g.get('_account_identity_map')
+    if maps is None:
+        maps = g._account_identity_map = ({}, {})
+    return maps
+
+
+def _live(account):
+    """Still attached to the current session and not deleted"""
+    state = inspect(account)
+    return account in db.session and not state.deleted and not state.was_deleted
+
+
+def _remember(account):
+    maps = _request_map()
+    if maps is not None:
+        maps[0][account.id] = account
+        maps[1][account.username] = account
+
+
+def _attach(snapshot):
+    """Turn a snapshot into a persistent instance of the current session without a SELECT"""
+    account = Account(**copy.deepcopy(snapshot))
+    make_transient_to_detached(account)
+    return db.session.merge(account, load=False)
+
+
+def lookup(account_id=None, username=None):
+    """Cached instance for the id or username, or None when the caller must query"""
+    maps = _request_map()
+    if maps is not None:
+        account = maps[0].get(account_id) if account_id is not None else maps[1].get(username)
+        if account is not None and _live(account) and (username is None or account.username == username):
+            _count('request_hits')
+            return account
+
+    cache = _snapshot_cache() if not g.get('_account_fresh_reads') else None
+    if cache is not None:
+        snapshot = cache.get_by_id(account_id) if account_id is not None else cache.get_by_username(username)
+        if snapshot is not None:
+            account = _attach(snapshot)
+            _remember(account)
+            _count('process_hits')
+            return account
+
+    _count('misses')
+    return None
+
+
+@contextmanager
+def fresh_reads():
+    """Within the block, lookups skip the process-wide snapshots and query the database"""
+    previous = g.get('_account_fresh_reads', False)
+    g._account_fresh_reads = True
+    try:
+        yield
+    finally:
+        g._account_fresh_reads = previous
+
+
+def store(account):
+    """Record an account loaded from the database in both layers"""
+    if account is None:
+        return None
+    _remember(account)
+    cache = _snapshot_cache()
+    state = inspect(account)
+    # Only committed state goes process-wide; in-flight changes stay in this request
+    if cache is not None and state.persistent and not state.modified:
+        cache.put(snapshot(account))
+    return account
+
+
+def snapshot(account):
+    # Deep-copy so JSON columns (interests) are never shared between sessions
+    return {column: copy.deepcopy(getattr(account, column)) for column in _COLUMNS}
+
+
+def write_through(account, values):
+    """After a commit, restore the values just written as committed state and cache them.
+
+    Saves the refresh SELECT that expire_on_commit would otherwise cause on
+    the next attribute access. Account has no server-side onupdate columns,
+    so what we wrote is exactly what the row holds.
+    """
+    for column, value in values.items():
+        set_committed_value(account, column, value)
+    return store(account)
+
+
+def invalidate(account, previous_username=None):
+    """Forget an account after an update or delete (both its old and new username)"""
+    _count('invalidations')
+    maps = _request_map()
+    usernames = {account.username, previous_username} - {None}
+    if maps is not None:
+        for username in usernames:
+            maps[1].pop(username, None)
+        if inspect(account).deleted or account in db.session.deleted:
+            maps[0].pop(account.id, None)
+        else:
+            # Same instance stays valid for this request; the commit only expires it
+            maps[1][account.username] = account
+    cache = _snapshot_cache() if has_app_context() else None
+    if cache is not None:
+        cache.invalidate(account_id=account.id)
+        for username in usernames:
+            cache.invalidate(username=username)
+
+
+def clear():
+    if _snapshots is not None:
+        _snapshots.clear()
+    if has_app_context():
+        g.pop('_account_identity_map', None)
+
+
+def stats():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    lookups = metrics['request_hits'] + metrics['process_hits'] + metrics['misses']
+    metrics['hit_rate'] = (metrics['request_hits'] + metrics['process_hits']) / lookups if lookups else 0.0
+    metrics['process_entries'] = len(_snapshots) if _snapshots is not None else 0
+    metrics['process_evictions'] = _snapshots.evictions if _snapshots is not None else 0
+    return metrics
@@ -0,0 +1,75 @@
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from app.db.database import db
+from app.models.account_recommendation_stats_model import AccountRecommendationStats
+from app.models.following_recommendations_model import FollowingRecommendation
+from app.types.enums import FollowStatus
+
+COUNTER_COLUMNS = {
+    FollowStatus.FOLLOWED: 'followed_count',
+    FollowStatus.SKIPPED: 'skipped_count',
+    FollowStatus.PENDING: 'pending_count',
+}
+
+class AccountRecommendationStatsRepository:
+    @staticmethod
+    def get_by_account_id(account_id):
+        return AccountRecommendationStats.query.get(account_id)
+
+    @staticmethod
+    def count_by_status(account_id):
+        """One GROUP BY follow_status aggregate over the account's recommendations"""
+        rows = db.session.query(
+            FollowingRecommendation.follow_status, func.count(FollowingRecommendation.id)
+        ).filter_by(account_id=account_id).group_by(FollowingRecommendation.follow_status).all()
+        # Rows created before the default applied may carry a NULL status; treat them as pending
+        counts = {}
+        for follow_status, count in rows:
+            follow_status = follow_status or FollowStatus.PENDING
+            counts[follow_status] = counts.get(follow_status, 0) + count
+        return counts
+
+    @staticmethod
+    def apply_deltas(account_id, deltas):
+        """Adjust counters inside the caller's transaction (no commit).
+
+        deltas maps FollowStatus -> change in count. The counter row is seeded
+        from the committed table state the first time an account is touched;
+        the seed is an INSERT ... ON CONFLICT DO NOTHING, so two first writers
+        racing on the same account both go on to apply their deltas.
+        """
+        # Pending ORM changes from the caller must not be flushed before seeding,
+        # otherwise they would be counted twice (once in the seed, once in deltas)
+        with db.session.no_autoflush:
+            exists = db.session.execute(
+                db.select(AccountRecommendationStats.account_id).filter_by(account_id=account_id)
+            ).first()
+            if not exists:
+                counts = AccountRecommendationStatsRepository.count_by_status(account_id)
+                dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+                db.session.execute(dialect_insert(AccountRecommendationStats).values(
+                    account_id=account_id,
+                    followed_count=counts.get(FollowStatus.FOLLOWED, 0),
+                    skipped_count=counts.get(FollowStatus.SKIPPED, 0),
+                    pending_count=counts.get(FollowStatus.PENDING, 0),
+                    total_count=sum(counts.values())
+                ).on_conflict_do_nothing(index_elements=['account_id']))
+
+            values = {}
+            for follow_status, delta in deltas.items():
+                if delta:
+                    column = COUNTER_COLUMNS[follow_status]
+                    values[column] = getattr(AccountRecommendationStats, column) + delta
+            total_delta = sum(deltas.values())
+            if total_delta:
+                values['total_count'] = AccountRecommendationStats.total_count + total_delta
+            if not values:
+                return
+
+            # Relative UPDATE so concurrent writers never lose increments
+            db.session.execute(
+                db.update(AccountRecommendationStats)
+                .where(AccountRecommendationStats.account_id == account_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
@@ -1,4 +1,7 @@
+from sqlalchemy import inspect
 from app.db.database import db
+from app.db.repository import account_cache
+from app.db.repository.account_version_repository import AccountVersionRepository
 from app.models.account_model import Account
 
 class AccountRepository:
@@ -8,11 +11,27 @@ class AccountRepository:
 
     @staticmethod
     def get_by_id(account_id):
-        return Account.query.get(account_id)
+        account = account_cache.lookup(account_id=account_id)
+        if account is None:
+            account = account_cache.store(Account.query.get(account_id))
+        return account
+
+    @staticmethod
+    def fresh_reads():
+        """Context manager: lookups inside it skip the process-wide snapshot cache"""
+        return account_cache.fresh_reads()
 
     @staticmethod
     def get_by_username(username):
-        return Account.query.filter_by(username=username).first()
+        account = account_cache.lookup(username=username)
+        if account is None:
+            account = account_cache.store(Account.query.filter_by(username=username).first())
+        return account
+
+    @staticmethod
+    def get_platforms(account_ids):
+        """(account_id, platform) pairs for the given ids, in one query"""
+        return db.session.query(Account.id, Account.platform).filter(Account.id.in_(list(account_ids))).all()
 
     @staticmethod
     def create(account):
@@ -20,16 +39,33 @@ class AccountRepository:
         db.session.commit()
         return account
 
+    @staticmethod
+    def create_many(accounts):
+        db.session.add_all(accounts)
+        db.session.commit()
+        return accounts
+
     @staticmethod
     def update(account):
+        # Invalidate before the commit expires the instance (and under the old username too)
+        previous_usernames = inspect(account).attrs.username.history.deleted
+        values = account_cache.snapshot(account)
+        account_cache.invalidate(account, previous_username=previous_usernames[0] if previous_usernames else None)
+        AccountVersionRepository.bump_many([account.id])
         db.session.commit()
-        return account
+        return account_cache.write_through(account, values)
 
     @staticmethod
     def delete(account):
         db.session.delete(account)
+        account_cache.invalidate(account)
+        AccountVersionRepository.bump_many([account.id])
         db.session.commit()
 
     @staticmethod
     def rollback():
-        db.session.rollback()
\ No newline at end of file
+        db.session.rollback()
+
+    @staticmethod
+    def cache_stats():
+        return account_cache.stats()
\ No newline at end of file
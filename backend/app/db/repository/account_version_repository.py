@@ -0,0 +1,28 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app.db.database import db
+from app.models.account_version_model import AccountVersion
+
+class AccountVersionRepository:
+    @staticmethod
+    def get_version(account_id):
+        """Current change counter for the account (0 if it never changed); one primary-key read"""
+        version = db.session.execute(
+            db.select(AccountVersion.version).where(AccountVersion.account_id == account_id)
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump_many(account_ids):
+        """Increment the counters inside the caller's transaction (no commit)"""
+        account_ids = sorted({int(account_id) for account_id in account_ids if account_id is not None})
+        if not account_ids:
+            return
+        dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(AccountVersion).values([
+            {'account_id': account_id, 'version': 1} for account_id in account_ids
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['account_id'],
+            set_={'version': AccountVersion.version + 1}
+        )
+        db.session.execute(stmt)
@@ -0,0 +1,124 @@
+from sqlalchemy import and_, or_
+from app.db.database import db
+from app.models.agent_job_model import AgentJob
+from app.types.enums import AgentJobStatus
+
+class AgentJobRepository:
+    @staticmethod
+    def get_by_id(job_id):
+        return AgentJob.query.get(job_id)
+
+    @staticmethod
+    def get_by_account_id(account_id):
+        return AgentJob.query.filter_by(account_id=account_id).order_by(AgentJob.id.desc()).all()
+
+    @staticmethod
+    def create(job):
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def update(job):
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def claim_next(platform, worker_id, now, lease_expires_at, candidates=5):
+        """Atomically claim the oldest runnable job for a platform.
+
+        Runnable means queued and past its backoff, or running with an expired
+        lease (its worker died). Each candidate is claimed with a conditional
+        UPDATE, so two workers can never both win the same job. A running job
+        whose worker died after it was cancelled is never re-run: it is moved
+        straight to CANCELLED.
+        """
+        expired = and_(
+            AgentJob.status == AgentJobStatus.RUNNING,
+            AgentJob.lease_expires_at < now
+        )
+        claimable = and_(
+            AgentJob.cancel_requested.is_(False),
+            or_(
+                and_(AgentJob.status == AgentJobStatus.QUEUED, AgentJob.available_at <= now),
+                expired
+            )
+        )
+        abandoned = and_(expired, AgentJob.cancel_requested.is_(True))
+        candidate_rows = db.session.query(AgentJob.id, AgentJob.cancel_requested).filter(
+            AgentJob.platform == platform, or_(claimable, abandoned)
+        ).order_by(AgentJob.available_at, AgentJob.id).limit(candidates).all()
+
+        abandoned_ids = [job_id for job_id, cancel_requested in candidate_rows if cancel_requested]
+        if abandoned_ids:
+            db.session.execute(
+                db.update(AgentJob)
+                .where(AgentJob.id.in_(abandoned_ids), abandoned)
+                .values(status=AgentJobStatus.CANCELLED, lease_owner=None, lease_expires_at=None, finished_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+
+        for job_id, cancel_requested in candidate_rows:
+            if cancel_requested:
+                continue
+            claimed = db.session.execute(
+                db.update(AgentJob)
+                .where(AgentJob.id == job_id, claimable)
+                .values(
+                    status=AgentJobStatus.RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=lease_expires_at,
+                    heartbeat_at=now,
+                    started_at=now,
+                    attempts=AgentJob.attempts + 1
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                job = AgentJob.query.get(job_id)
+                db.session.refresh(job)
+                return job
+        return None
+
+    @staticmethod
+    def renew_lease(job_id, worker_id, now, lease_expires_at):
+        """Extend the lease if this worker still owns the job; returns False if it was lost"""
+        renewed = db.session.execute(
+            db.update(AgentJob)
+            .where(
+                AgentJob.id == job_id,
+                AgentJob.lease_owner == worker_id,
+                AgentJob.status == AgentJobStatus.RUNNING
+            )
+            .values(heartbeat_at=now, lease_expires_at=lease_expires_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return bool(renewed)
+
+    @staticmethod
+    def is_cancel_requested(job_id):
+        row = db.session.query(AgentJob.cancel_requested).filter_by(id=job_id).first()
+        return bool(row and row[0])
+
+    @staticmethod
+    def finish(job_id, worker_id, values):
+        """Write a terminal (or re-queued) state if this worker still owns the job"""
+        updated = db.session.execute(
+            db.update(AgentJob)
+            .where(
+                AgentJob.id == job_id,
+                AgentJob.lease_owner == worker_id,
+                AgentJob.status == AgentJobStatus.RUNNING
+            )
+            .values(lease_owner=None, lease_expires_at=None, **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return bool(updated)
+
+    @staticmethod
+    def rollback():
+        db.session.rollback()
@@ -0,0 +1,48 @@
+from sqlalchemy import case, func
+from app.db.database import db
+from app.models.agent_run_model import AgentRun
+from app.types.enums import AgentJobStatus
+
+class AgentRunRepository:
+    @staticmethod
+    def create(run):
+        db.session.add(run)
+        db.session.commit()
+        return run
+
+    @staticmethod
+    def get_by_job_id(job_id):
+        return AgentRun.query.filter_by(job_id=job_id).order_by(AgentRun.attempt).all()
+
+    @staticmethod
+    def _filtered(query, platform=None, since=None):
+        if platform is not None:
+            query = query.where(AgentRun.platform == platform)
+        if since is not None:
+            query = query.where(AgentRun.started_at >= since)
+        return query
+
+    @staticmethod
+    def totals_by_posts_to_optimize(platform=None, since=None):
+        """One aggregate row per posts_to_optimize setting (runs, successes and summed cost/latency)"""
+        query = db.select(
+            AgentRun.posts_to_optimize,
+            func.count(AgentRun.id).label('runs'),
+            func.sum(case((AgentRun.status == AgentJobStatus.SUCCEEDED, 1), else_=0)).label('succeeded'),
+            func.sum(AgentRun.posts_processed).label('posts_processed'),
+            func.sum(AgentRun.duration_seconds).label('duration_seconds'),
+            func.sum(AgentRun.step_count).label('steps'),
+            func.sum(AgentRun.action_count).label('actions'),
+            func.sum(AgentRun.retries).label('retries'),
+            func.sum(AgentRun.input_tokens).label('input_tokens'),
+            func.sum(AgentRun.output_tokens).label('output_tokens'),
+            func.sum(AgentRun.cost_usd).label('cost_usd'),
+        ).group_by(AgentRun.posts_to_optimize).order_by(AgentRun.posts_to_optimize)
+        return db.session.execute(AgentRunRepository._filtered(query, platform, since)).all()
+
+    @staticmethod
+    def iter_phases(platform=None, since=None, batch_size=500):
+        """(posts_to_optimize, phases) for each run, streamed"""
+        query = db.select(AgentRun.posts_to_optimize, AgentRun.phases)
+        query = AgentRunRepository._filtered(query, platform, since).execution_options(yield_per=batch_size)
+        return db.session.execute(query)
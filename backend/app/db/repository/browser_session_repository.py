@@ -0,0 +1,62 @@
+from sqlalchemy import func
+from app.db.database import db
+from app.models.browser_session_model import BrowserSession
+
+class BrowserSessionRepository:
+    @staticmethod
+    def get_by_account_id(account_id):
+        return BrowserSession.query.get(account_id)
+
+    @staticmethod
+    def upsert(account_id, platform, encrypted_state, expires_at, now, after_miss=True):
+        """Store a fresh session; after_miss counts the full login that produced it as a miss"""
+        session = BrowserSession.query.get(account_id)
+        if session is None:
+            session = BrowserSession(account_id=account_id, hit_count=0, miss_count=0)
+            db.session.add(session)
+        session.platform = platform
+        session.encrypted_state = encrypted_state
+        session.expires_at = expires_at
+        session.last_used_at = now
+        if after_miss:
+            session.miss_count = (session.miss_count or 0) + 1
+        db.session.commit()
+        return session
+
+    @staticmethod
+    def record_hit(account_id, now):
+        db.session.execute(
+            db.update(BrowserSession)
+            .where(BrowserSession.account_id == account_id)
+            .values(hit_count=BrowserSession.hit_count + 1, last_used_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    @staticmethod
+    def delete_by_account_id(account_id):
+        BrowserSession.query.filter_by(account_id=account_id).delete()
+        db.session.commit()
+
+    @staticmethod
+    def evict(now, max_entries):
+        """Drop expired sessions, then the least recently used ones beyond max_entries"""
+        evicted = BrowserSession.query.filter(BrowserSession.expires_at <= now).delete()
+        overflow = BrowserSession.query.count() - max_entries
+        if overflow > 0:
+            stale_ids = [row[0] for row in db.session.query(BrowserSession.account_id)
+                         .order_by(BrowserSession.last_used_at.asc().nullsfirst())
+                         .limit(overflow).all()]
+            evicted += BrowserSession.query.filter(
+                BrowserSession.account_id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+        db.session.commit()
+        return evicted
+
+    @staticmethod
+    def get_hit_totals():
+        hits, misses = db.session.query(
+            func.coalesce(func.sum(BrowserSession.hit_count), 0),
+            func.coalesce(func.sum(BrowserSession.miss_count), 0)
+        ).one()
+        return hits, misses
@@ -1,5 +1,8 @@
 from app.db.database import db
+from app.db.repository.account_version_repository import AccountVersionRepository
+from app.models.account_model import Account
 from app.models.following_recommendations_model import FollowingRecommendation
+from app.types.enums import FollowStatus
 
 class FollowingRecommendationsRepository:
     @staticmethod
@@ -10,24 +13,87 @@ class FollowingRecommendationsRepository:
     def get_by_id(rec_id):
         return FollowingRecommendation.query.get(rec_id)
 
+    @staticmethod
+    def get_by_ids(rec_ids):
+        return FollowingRecommendation.query.filter(FollowingRecommendation.id.in_(rec_ids)).all()
+
+    @staticmethod
+    def get_by_ids_with_platforms(rec_ids):
+        """(recommendation, account platform) pairs for the given ids, in one joined query"""
+        return db.session.query(FollowingRecommendation, Account.platform).join(
+            Account, Account.id == FollowingRecommendation.account_id
+        ).filter(FollowingRecommendation.id.in_(rec_ids)).all()
+
     @staticmethod
     def get_by_account_id(account_id):
         return FollowingRecommendation.query.filter_by(account_id=account_id).all()
 
+    @staticmethod
+    def get_by_account_id_and_status(account_id, follow_status, limit=None, after_id=None):
+        """Keyset page of an account's recommendations with the given status, ordered by id"""
+        query = FollowingRecommendation.query.filter_by(account_id=account_id, follow_status=follow_status)
+        if after_id is not None:
+            query = query.filter(FollowingRecommendation.id > after_id)
+        query = query.order_by(FollowingRecommendation.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def iter_decisions(batch_size=10000):
+        """Stream (platform, account_id, recommended_user, follow_status) for every followed/skipped row"""
+        query = db.session.query(
+            Account.platform,
+            FollowingRecommendation.account_id,
+            FollowingRecommendation.recommended_user,
+            FollowingRecommendation.follow_status
+        ).join(Account, Account.id == FollowingRecommendation.account_id).filter(
+            FollowingRecommendation.follow_status.in_([FollowStatus.FOLLOWED, FollowStatus.SKIPPED])
+        )
+        return query.yield_per(batch_size)
+
     @staticmethod
     def create(recommendation):
         db.session.add(recommendation)
+        AccountVersionRepository.bump_many([recommendation.account_id])
         db.session.commit()
         return recommendation
 
+    @staticmethod
+    def insert_many(rows):
+        """Insert row dicts with one multi-row INSERT ... RETURNING and commit once.
+
+        The commit would expire ORM instances and cost a refresh SELECT per
+        row, so the inserted rows are loaded afterwards with one IN query.
+        """
+        if not rows:
+            return []
+        rec_ids = db.session.scalars(
+            db.insert(FollowingRecommendation).returning(FollowingRecommendation.id),
+            rows
+        ).all()
+        AccountVersionRepository.bump_many(row['account_id'] for row in rows)
+        db.session.commit()
+        return FollowingRecommendation.query.filter(
+            FollowingRecommendation.id.in_(rec_ids)
+        ).order_by(FollowingRecommendation.id).all()
+
     @staticmethod
     def update(recommendation):
+        AccountVersionRepository.bump_many([recommendation.account_id])
         db.session.commit()
         return recommendation
 
+    @staticmethod
+    def update_many(recommendations):
+        AccountVersionRepository.bump_many(rec.account_id for rec in recommendations)
+        db.session.commit()
+        return recommendations
+
     @staticmethod
     def delete(recommendation):
         db.session.delete(recommendation)
+        AccountVersionRepository.bump_many([recommendation.account_id])
         db.session.commit()
 
     @staticmethod
@@ -1,5 +1,8 @@
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
 from app.db.database import db
 from app.models.posts_seen_model import PostsSeen
+from app.types.enums import PostStatus
 
 class PostsSeenRepository:
     @staticmethod
@@ -14,12 +17,67 @@ class PostsSeenRepository:
     def get_by_account_id(account_id):
         return PostsSeen.query.filter_by(account_id=account_id).all()
 
+    @staticmethod
+    def get_seen_post_urls(account_id):
+        """URLs of an account's posts, leaving out extracted posts still NOT_SEEN"""
+        query = db.session.query(PostsSeen.post_url).filter(
+            PostsSeen.account_id == account_id,
+            or_(PostsSeen.status.is_(None), PostsSeen.status != PostStatus.NOT_SEEN)
+        )
+        return [post_url for post_url, in query]
+
     @staticmethod
     def create(post):
         db.session.add(post)
         db.session.commit()
         return post
 
+    @staticmethod
+    def create_many(posts):
+        db.session.add_all(posts)
+        db.session.commit()
+        return posts
+
+    @staticmethod
+    def upsert_many(rows):
+        """Insert rows, updating status/seen_at on (account_id, post_url) conflicts. Commits once."""
+        if not rows:
+            return 0
+        dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(PostsSeen).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['account_id', 'post_url'],
+            set_={'status': stmt.excluded.status, 'seen_at': stmt.excluded.seen_at}
+        )
+        db.session.execute(stmt)
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def insert_new_many(rows):
+        """Insert rows, skipping (account_id, post_url) pairs already recorded. Commits once; returns rows inserted."""
+        if not rows:
+            return 0
+        dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(PostsSeen).values(rows).on_conflict_do_nothing(
+            index_elements=['account_id', 'post_url']
+        )
+        result = db.session.execute(stmt)
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def update_status_many(account_id, post_urls, status, from_status=None):
+        """Set the status of an account's posts in one UPDATE (only those still in from_status, if given). Commits; returns rows updated."""
+        if not post_urls:
+            return 0
+        query = PostsSeen.query.filter(PostsSeen.account_id == account_id, PostsSeen.post_url.in_(post_urls))
+        if from_status is not None:
+            query = query.filter(PostsSeen.status == from_status)
+        updated = query.update({PostsSeen.status: status}, synchronize_session=False)
+        db.session.commit()
+        return updated
+
     @staticmethod
     def update(post):
         db.session.commit()
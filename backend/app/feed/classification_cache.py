@@ -0,0 +1,236 @@
+"""
+Two-tier cache for LLM post classifications.
+
+Tier 1 is an in-process LRU with TTL; tier 2 is a SQLite file shared by
+every worker on the host. Keys hash the normalized post content together
+with the account's interests, so the same reel seen by different accounts
+with the same interests is classified once.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_content(text):
+    """Case-fold, NFKC-normalize and collapse whitespace"""
+    text = unicodedata.normalize('NFKC', text or '')
+    return _WHITESPACE.sub(' ', text).strip().casefold()
+
+
+def normalize_interests(interests):
+    """Accept Account.interests as a JSON string or a list; returns a sorted, de-duplicated list"""
+    if isinstance(interests, str):
+        interests = json.loads(interests) if interests else []
+    return sorted({normalize_content(interest) for interest in interests or [] if interest})
+
+
+def classification_key(content, interests, namespace='interest'):
+    payload = '\x1f'.join([namespace, normalize_content(content), *normalize_interests(interests)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, now=None):
+        now = now or time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds=None, now=None):
+        expires_at = (now or time.time()) + (ttl_seconds or self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheStore:
+    """Size-bounded key/value store with TTL in its own SQLite file"""
+
+    def __init__(self, path, max_entries=1_000_000, ttl_seconds=7 * 24 * 3600, prune_every=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = prune_every
+        self._writes = 0
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_last_access ON cache_entries (last_access)")
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys, now=None):
+        """Fetch live entries for keys in one query; refreshes their last_access"""
+        if not keys:
+            return {}
+        now = now or time.time()
+        conn = self._connection()
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*chunk, now)
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            conn.executemany(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+        return found
+
+    def set_many(self, items, ttl_seconds=None, now=None):
+        if not items:
+            return
+        now = now or time.time()
+        expires_at = now + (ttl_seconds or self.ttl_seconds)
+        conn = self._connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+            [(key, json.dumps(value), expires_at, now) for key, value in items.items()]
+        )
+        self._writes += len(items)
+        if self._writes >= self.prune_every:
+            self._writes = 0
+            self.prune(now)
+
+    def prune(self, now=None):
+        """Drop expired entries, then the least recently used ones over max_entries"""
+        now = now or time.time()
+        conn = self._connection()
+        removed = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        return removed
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+class ClassificationCache:
+    """LRU in front of an optional SQLite tier, with hit/miss metrics"""
+
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config):
+        disk_path = config.get('CLASSIFICATION_CACHE_PATH')
+        return cls(
+            memory=LRUCache(
+                max_entries=config.get('CLASSIFICATION_CACHE_MEMORY_ENTRIES', 10000),
+                ttl_seconds=config.get('CLASSIFICATION_CACHE_MEMORY_TTL_SECONDS', 3600)
+            ),
+            disk=SQLiteCacheStore(
+                disk_path,
+                max_entries=config.get('CLASSIFICATION_CACHE_DISK_ENTRIES', 1_000_000),
+                ttl_seconds=config.get('CLASSIFICATION_CACHE_DISK_TTL_SECONDS', 7 * 24 * 3600)
+            ) if disk_path else None
+        )
+
+    def get_many(self, keys):
+        """Return {key: value} for cached keys; promotes disk hits into memory"""
+        found = {}
+        remaining = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                remaining.append(key)
+            else:
+                found[key] = value
+        memory_hits = len(found)
+
+        disk_found = self.disk.get_many(remaining) if self.disk is not None and remaining else {}
+        for key, value in disk_found.items():
+            self.memory.set(key, value)
+        found.update(disk_found)
+
+        with self._lock:
+            self.memory_hits += memory_hits
+            self.disk_hits += len(disk_found)
+            self.misses += len(remaining) - len(disk_found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items):
+        for key, value in items.items():
+            self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set_many(items)
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self.memory),
+                'memory_evictions': self.memory.evictions,
+            }
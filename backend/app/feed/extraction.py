@@ -0,0 +1,259 @@
+"""
+Batched in-page extraction of feed posts.
+
+Instead of an agent inspecting posts one LLM step at a time, FeedExtractor
+runs one JavaScript evaluation per scroll that returns the metadata of
+every post rendered on the page (URL, author, caption, hashtags, media
+type). Posts already extracted in this run, or already recorded for the
+account (the known_urls callback, e.g. the seen-posts Bloom filter), are
+dropped, and the rest are streamed out as an async generator:
+
+    extractor = FeedExtractor(page, 'instagram', known_urls=...)
+    async for post, label in classify_stream(extractor.stream(), classifier, interests):
+        ...
+
+The page only needs Playwright's evaluate() and mouse.wheel(), so the
+same code runs against the live feed and against saved HTML snapshots.
+"""
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from app.utils.bloom_filter import canonicalize_post_url, post_query
+
+MEDIA_TYPES = ('video', 'carousel', 'image', 'text')
+
+# CSS selectors per platform, relative to each post element
+PLATFORM_SELECTORS = {
+    'instagram': {
+        'post': 'article',
+        'link': 'a[href*="/p/"], a[href*="/reel/"]',
+        'author': 'header a[href^="/"]',
+        'caption': 'h1',
+        'hashtag': 'a[href*="/explore/tags/"]',
+        'video': 'video',
+        'carousel': 'button[aria-label="Next"], ul li + li img',
+        'image': 'img:not([alt*="profile picture"])',
+    },
+    'twitter': {
+        'post': 'article[data-testid="tweet"]',
+        'link': 'a[href*="/status/"]:has(time)',
+        'author': '[data-testid="User-Name"] a[href^="/"]',
+        'caption': '[data-testid="tweetText"]',
+        'hashtag': 'a[href*="/hashtag/"]',
+        'video': '[data-testid="videoPlayer"], video',
+        'carousel': None,
+        'image': '[data-testid="tweetPhoto"]',
+    },
+}
+
+# One evaluation returns every rendered post; hidden or zero-size posts are skipped
+EXTRACT_POSTS_JS = """
+(selectors) => {
+  const text = (el) => (el ? (el.innerText || el.textContent || '').trim() : '');
+  const posts = [];
+  for (const root of document.querySelectorAll(selectors.post)) {
+    const box = root.getBoundingClientRect();
+    if (box.width === 0 || box.height === 0) continue;
+    const link = root.querySelector(selectors.link);
+    if (!link) continue;
+    const author = root.querySelector(selectors.author);
+    let mediaType = 'text';
+    if (root.querySelector(selectors.video)) {
+      mediaType = 'video';
+    } else if (selectors.carousel && root.querySelector(selectors.carousel)) {
+      mediaType = 'carousel';
+    } else {
+      const images = root.querySelectorAll(selectors.image).length;
+      mediaType = images > 1 ? 'carousel' : images === 1 ? 'image' : 'text';
+    }
+    posts.push({
+      url: new URL(link.getAttribute('href'), document.baseURI).href,
+      author: author ? author.getAttribute('href') || text(author) : null,
+      caption: text(root.querySelector(selectors.caption)),
+      hashtags: Array.from(root.querySelectorAll(selectors.hashtag), text),
+      media_type: mediaType,
+    });
+  }
+  return posts;
+}
+"""
+
+# Wheel distance to the end of the rendered feed (at least one screen)
+SCROLL_DISTANCE_JS = (
+    "Math.max(window.innerHeight, document.scrollingElement.scrollHeight - window.scrollY - window.innerHeight)"
+)
+
+_HASHTAG = re.compile(r'#(\w+)', re.UNICODE)
+
+
+@dataclass(frozen=True)
+class ExtractedPost:
+    url: str
+    author: Optional[str]
+    caption: str
+    hashtags: Tuple[str, ...]
+    media_type: str
+
+    @property
+    def key(self):
+        return canonicalize_post_url(self.url)
+
+    @property
+    def text(self):
+        """Caption plus any hashtags it does not already contain, for the classifiers"""
+        caption_tags = {tag.casefold() for tag in _HASHTAG.findall(self.caption)}
+        extra = [f'#{tag}' for tag in self.hashtags if tag.casefold() not in caption_tags]
+        return ' '.join([self.caption, *extra]).strip()
+
+
+def parse_post(raw):
+    """ExtractedPost from one evaluation result, or None if it has no usable http(s) URL"""
+    parts = urlsplit((raw.get('url') or '').strip())
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    author = (raw.get('author') or '').strip().strip('/').split('/')[-1].lstrip('@') or None
+    caption = ' '.join((raw.get('caption') or '').split())
+    hashtags = []
+    for tag in list(raw.get('hashtags') or []) + _HASHTAG.findall(caption):
+        tag = tag.strip().lstrip('#')
+        if tag and tag.casefold() not in {existing.casefold() for existing in hashtags}:
+            hashtags.append(tag)
+    media_type = raw.get('media_type') if raw.get('media_type') in MEDIA_TYPES else 'text'
+    return ExtractedPost(
+        url=urlunsplit((parts.scheme, parts.netloc, parts.path, post_query(parts.query), '')),
+        author=author,
+        caption=caption,
+        hashtags=tuple(hashtags),
+        media_type=media_type
+    )
+
+
+@dataclass
+class ExtractionStats:
+    scrolls: int = 0
+    evaluations: int = 0
+    extracted: int = 0          # posts returned by the page, repeats included
+    duplicates: int = 0         # already extracted earlier in this run
+    known: int = 0              # already recorded for the account
+    yielded: int = 0
+    evaluate_seconds: float = 0.0
+    per_scroll: list = field(default_factory=list)
+
+
+class FeedExtractor:
+    def __init__(self, page, platform, max_posts=50, max_scrolls=30, stale_scrolls=3,
+                 scroll_pause=0.8, known_urls=None):
+        """
+        known_urls(urls) returns the subset of urls already recorded for the
+        account; it is called once per scroll with that scroll's new URLs.
+        Extraction stops at max_posts, after max_scrolls, or after
+        stale_scrolls scrolls in a row that turned up nothing new.
+        """
+        if platform not in PLATFORM_SELECTORS:
+            raise ValueError(f"No feed selectors for platform '{platform}'")
+        self.page = page
+        self.platform = platform
+        self.max_posts = max_posts
+        self.max_scrolls = max_scrolls
+        self.stale_scrolls = stale_scrolls
+        self.scroll_pause = scroll_pause
+        self.known_urls = known_urls
+        self.stats = ExtractionStats()
+        self._seen = set()
+
+    async def extract_visible(self):
+        """New posts on the page right now, with one evaluate() call"""
+        start = time.perf_counter()
+        raw_posts = await self.page.evaluate(EXTRACT_POSTS_JS, PLATFORM_SELECTORS[self.platform])
+        self.stats.evaluate_seconds += time.perf_counter() - start
+        self.stats.evaluations += 1
+        self.stats.extracted += len(raw_posts)
+
+        fresh = {}
+        for raw in raw_posts:
+            post = parse_post(raw)
+            if post is None:
+                continue
+            if post.key in self._seen or post.key in fresh:
+                self.stats.duplicates += 1
+                continue
+            fresh[post.key] = post
+        self._seen.update(fresh)
+
+        if fresh and self.known_urls is not None:
+            known = {canonicalize_post_url(url) for url in self.known_urls([post.url for post in fresh.values()])}
+            self.stats.known += len(known)
+            fresh = {key: post for key, post in fresh.items() if key not in known}
+        return list(fresh.values())
+
+    async def stream(self):
+        """Async generator of new ExtractedPosts, scrolling the feed between evaluations"""
+        stale = 0
+        while self.stats.yielded < self.max_posts:
+            seen_before = len(self._seen)
+            posts = await self.extract_visible()
+            self.stats.per_scroll.append(len(posts))
+            for post in posts[:self.max_posts - self.stats.yielded]:
+                self.stats.yielded += 1
+                yield post
+
+            # Only a scroll that loaded nothing new is stale; already-recorded posts still mean the feed moves
+            stale = 0 if len(self._seen) > seen_before else stale + 1
+            if self.stats.yielded >= self.max_posts or stale >= self.stale_scrolls \
+                    or self.stats.scrolls >= self.max_scrolls:
+                return
+            await self.scroll()
+
+    async def scroll(self):
+        # Everything rendered was just extracted, so scroll past it to make the feed load more
+        await self.page.mouse.wheel(0, await self.page.evaluate(SCROLL_DISTANCE_JS))
+        self.stats.scrolls += 1
+        if self.scroll_pause:
+            await self.page.wait_for_timeout(self.scroll_pause * 1000)
+
+
+async def batched(stream, size):
+    """Group an async stream into lists of up to size items"""
+    batch = []
+    async for item in stream:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def classify_stream(posts, classifier, interests, batch_size=20):
+    """
+    Pipeline stage: (post, label) pairs from an async stream of ExtractedPosts.
+
+    classifier is anything with classify(texts, interests) -> labels, e.g.
+    GatedInterestClassifier; each batch is classified with one call, off the
+    event loop so a slow LLM call does not stall other browsers.
+    """
+    async for batch in batched(posts, batch_size):
+        labels = await asyncio.to_thread(classifier.classify, [post.text for post in batch], interests)
+        for post, label in zip(batch, labels):
+            yield post, label
+
+
+async def screen_stream(posts, screen, reason, screened, batch_size=20):
+    """
+    Pipeline stage: pass on the ExtractedPosts that screen keeps.
+
+    screen(batch) -> kept posts (e.g. a SentimentScorer or NoiseBlocker
+    filter) runs once per batch, off the event loop. Posts it drops are
+    appended to screened as (post, reason) so the caller can still record
+    them; they never reach the classifier.
+    """
+    async for batch in batched(posts, batch_size):
+        kept = await asyncio.to_thread(screen, batch)
+        kept_ids = {id(post) for post in kept}
+        screened.extend((post, reason) for post in batch if id(post) not in kept_ids)
+        for post in kept:
+            yield post
@@ -0,0 +1,124 @@
+"""
+LLM-backed "does this post match the account's interests?" classification.
+
+Only content that misses the ClassificationCache is sent to the LLM, in
+batched prompts, and every answer is written back to the cache. Posts the
+LLM leaves out of its answer (or answers malformed) are asked again once;
+if they are still missing they get an unknown label ('relevant': None),
+which is never cached.
+"""
+import json
+
+from app.feed.classification_cache import classification_key, normalize_interests
+
+PROMPT_TEMPLATE = """You classify social media posts for a user interested in: {interests}.
+
+For each numbered post below, decide whether it matches at least one interest.
+Answer with only a JSON array, one object per post, in order:
+[{{"index": 0, "relevant": true, "topic": "<matching interest or null>"}}, ...]
+
+Posts:
+{posts}
+"""
+
+
+def openai_completion(model='gpt-4o-mini'):
+    """Default LLM call using the OpenAI SDK (optional dependency)"""
+    from openai import OpenAI
+    client = OpenAI()
+
+    def complete(prompt):
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{'role': 'user', 'content': prompt}],
+            temperature=0,
+        )
+        return response.choices[0].message.content
+
+    return complete
+
+
+def unknown_label():
+    return {'relevant': None, 'topic': None}
+
+
+class LLMInterestClassifier:
+    def __init__(self, complete, cache=None, batch_size=20, max_post_chars=1000, retries=1):
+        self.complete = complete
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_post_chars = max_post_chars
+        self.retries = retries
+        self.llm_calls = 0
+
+    def classify(self, posts, interests):
+        """
+        Classify post texts; returns one {'relevant': bool, 'topic': str|None}
+        per post, or unknown_label() for posts the LLM never answered.
+        """
+        interests = normalize_interests(interests)
+        keys = [classification_key(post, interests) for post in posts]
+        cached = self.cache.get_many(set(keys)) if self.cache is not None else {}
+
+        # Identical uncached posts in the same call are only sent once
+        pending = {}
+        for post, key in zip(posts, keys):
+            if key not in cached and key not in pending:
+                pending[key] = post
+
+        pending_items = list(pending.items())
+        fresh = {}
+        for start in range(0, len(pending_items), self.batch_size):
+            batch = pending_items[start:start + self.batch_size]
+            labels = self._classify_batch([post for _, post in batch], interests)
+            fresh.update((key, label) for (key, _), label in zip(batch, labels) if label is not None)
+
+        # Only real answers are cached; a missing one is asked again on the next call
+        if self.cache is not None and fresh:
+            self.cache.set_many(fresh)
+        cached.update(fresh)
+        return [cached[key] if key in cached else unknown_label() for key in keys]
+
+    def _classify_batch(self, posts, interests):
+        """Labels for posts, retrying the ones the answer left out; None where still missing"""
+        labels = self._ask(posts, interests)
+        for _ in range(self.retries):
+            missing = [index for index, label in enumerate(labels) if label is None]
+            if not missing:
+                break
+            for index, label in zip(missing, self._ask([posts[index] for index in missing], interests)):
+                labels[index] = label
+        return labels
+
+    def _ask(self, posts, interests):
+        prompt = PROMPT_TEMPLATE.format(
+            interests=', '.join(interests) or 'general content',
+            posts='\n'.join(f"[{index}] {post[:self.max_post_chars]}" for index, post in enumerate(posts))
+        )
+        self.llm_calls += 1
+        answer = self.complete(prompt)
+        return self._parse_answer(answer, len(posts))
+
+    @staticmethod
+    def _parse_answer(answer, expected):
+        """One label per post from the LLM answer, None for posts it left out or answered malformed"""
+        labels = [None] * expected
+        text = (answer or '').strip()
+        if text.startswith('```'):
+            text = text.strip('`')
+            text = text[text.find('['):]
+        try:
+            items = json.loads(text[text.find('['):text.rfind(']') + 1])
+        except ValueError:
+            return labels
+        if not isinstance(items, list):
+            return labels
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get('relevant'), bool):
+                continue
+            index = item.get('index', position)
+            if isinstance(index, int) and 0 <= index < expected:
+                topic = item.get('topic')
+                labels[index] = {'relevant': item['relevant'], 'topic': topic if isinstance(topic, str) else None}
+        return labels
@@ -0,0 +1,181 @@
+"""
+Local interest pre-classifier that gates LLM calls.
+
+Posts are embedded as L2-normalized hashed n-gram vectors (lightly
+stemmed word unigrams + bigrams, sublinear TF). Each interest has a
+centroid: the element-wise max of its seed phrases' binary feature vectors,
+so a post's score is the share of its weight that lands on interest
+vocabulary. A batch of posts is scored against every centroid with one
+sparse gather + segmented sum in NumPy; clearly relevant or clearly
+irrelevant posts are decided locally and only the uncertain band goes to
+the LLM.
+
+A low score on the account's interests only means the seeds do not
+cover the post, not that it is off-topic, so a post is decided
+irrelevant only when another seeded interest covers it and scores clearly
+higher. Posts no seed vocabulary covers (new product names, emoji-only
+captions) go to the LLM.
+"""
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+from app.feed.classification_cache import normalize_content, normalize_interests
+
+_TOKEN = re.compile(r"[#@]?\w+", re.UNICODE)
+DEFAULT_SEEDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'interest_seeds.json')
+
+RELEVANT = 'relevant'
+IRRELEVANT = 'irrelevant'
+UNCERTAIN = 'uncertain'
+
+
+def _stem(token):
+    """Crude suffix stripping so "workouts"/"running" meet "workout"/"run" """
+    if len(token) > 5 and token.endswith('ing'):
+        token = token[:-3]
+        if len(token) > 2 and token[-1] == token[-2]:
+            token = token[:-1]
+    elif len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        token = token[:-1]
+    return token
+
+
+def _features(text, n_features):
+    """Hashed unigram/bigram feature indices with sublinear TF weights"""
+    tokens = [_stem(token.lstrip('#@')) for token in _TOKEN.findall(normalize_content(text))]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode('utf-8')) % n_features
+        counts[index] = counts.get(index, 0) + 1
+    if not counts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return indices, weights / np.linalg.norm(weights)
+
+
+class InterestPrescorer:
+    def __init__(self, seeds=None, n_features=2 ** 18, relevant_threshold=0.4, irrelevant_threshold=0.05,
+                 competing_coverage=0.3, competing_margin=0.25):
+        """
+        A post is irrelevant only if its best interest scores at most
+        irrelevant_threshold while some other seeded interest scores at
+        least competing_coverage and beats it by competing_margin.
+        """
+        if seeds is None:
+            with open(DEFAULT_SEEDS_PATH) as f:
+                seeds = json.load(f)
+        self.seeds = {normalize_content(interest): phrases for interest, phrases in seeds.items()}
+        self.n_features = n_features
+        self.relevant_threshold = relevant_threshold
+        self.irrelevant_threshold = irrelevant_threshold
+        self.competing_coverage = competing_coverage
+        self.competing_margin = competing_margin
+        self._centroids = {}
+
+    def centroid(self, interest):
+        """Dense 0/1 vector of an interest's seed features; unknown interests seed with their own name"""
+        interest = normalize_content(interest)
+        centroid = self._centroids.get(interest)
+        if centroid is None:
+            centroid = np.zeros(self.n_features, dtype=np.float32)
+            for phrase in [interest, *self.seeds.get(interest, [])]:
+                indices, _ = _features(phrase, self.n_features)
+                centroid[indices] = 1.0
+            self._centroids[interest] = centroid
+        return centroid
+
+    def score(self, posts, interests):
+        """Score every post against every interest: array of shape (len(posts), len(interests))"""
+        return self._score(posts, normalize_interests(interests))
+
+    def _score(self, posts, interests):
+        """score() for interests already normalized, in the given column order"""
+        if not posts or not interests:
+            return np.zeros((len(posts), len(interests)), dtype=np.float32)
+
+        centroids = np.stack([self.centroid(interest) for interest in interests])   # (k, n_features)
+        features = [_features(post, self.n_features) for post in posts]
+        lengths = np.fromiter((len(indices) for indices, _ in features), dtype=np.int64, count=len(posts))
+        if not lengths.sum():
+            return np.zeros((len(posts), len(interests)), dtype=np.float32)
+        indices = np.concatenate([indices for indices, _ in features])
+        weights = np.concatenate([weights for _, weights in features])
+
+        # One gather over all non-zeros, then a segmented sum per post
+        contributions = centroids[:, indices] * weights                               # (k, nnz)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        nonempty = lengths > 0
+        scores = np.zeros((len(interests), len(posts)), dtype=np.float32)
+        scores[:, nonempty] = np.add.reduceat(contributions, offsets[nonempty], axis=1)
+        return scores.T
+
+    def decide(self, posts, interests):
+        """Per post: (decision, best_interest, best_score) with decision relevant/irrelevant/uncertain"""
+        interests = normalize_interests(interests)
+        if not interests:
+            return [(UNCERTAIN, None, 0.0) for _ in posts]
+        competing = [interest for interest in self.seeds if interest not in interests]
+        scores = self._score(posts, interests + competing)
+        own, others = scores[:, :len(interests)], scores[:, len(interests):]
+        best = own.argmax(axis=1)
+        best_scores = own[np.arange(len(posts)), best]
+        competing_scores = others.max(axis=1) if competing else np.zeros(len(posts), dtype=np.float32)
+        decisions = []
+        for index, score, competing_score in zip(best, best_scores, competing_scores):
+            if score >= self.relevant_threshold:
+                decision = RELEVANT
+            elif score <= self.irrelevant_threshold and competing_score >= self.competing_coverage \
+                    and competing_score - score >= self.competing_margin:
+                decision = IRRELEVANT
+            else:
+                decision = UNCERTAIN
+            decisions.append((decision, interests[index], float(score)))
+        return decisions
+
+
+class GatedInterestClassifier:
+    """Local pre-classifier first; only uncertain posts reach the LLM classifier"""
+
+    def __init__(self, prescorer, llm_classifier):
+        self.prescorer = prescorer
+        self.llm_classifier = llm_classifier
+        self.local_decisions = 0
+        self.llm_routed = 0
+
+    def classify(self, posts, interests):
+        decisions = self.prescorer.decide(posts, interests)
+        labels = [None] * len(posts)
+        uncertain = []
+        for index, (decision, interest, score) in enumerate(decisions):
+            if decision == UNCERTAIN:
+                uncertain.append(index)
+            else:
+                labels[index] = {
+                    'relevant': decision == RELEVANT,
+                    'topic': interest if decision == RELEVANT else None,
+                    'source': 'local',
+                    'score': score
+                }
+
+        if uncertain:
+            llm_labels = self.llm_classifier.classify([posts[index] for index in uncertain], interests)
+            for index, label in zip(uncertain, llm_labels):
+                labels[index] = {**label, 'source': 'llm', 'score': decisions[index][2]}
+
+        self.local_decisions += len(posts) - len(uncertain)
+        self.llm_routed += len(uncertain)
+        return labels
+
+    def stats(self):
+        total = self.local_decisions + self.llm_routed
+        return {
+            'local_decisions': self.local_decisions,
+            'llm_routed': self.llm_routed,
+            'llm_avoided_fraction': self.local_decisions / total if total else 0.0
+        }
@@ -0,0 +1,340 @@
+"""
+Noise / scam blocker for Account.noise_blocker_enabled.
+
+Rules (keywords, URL domains, regexes) are compiled into a RuleSet:
+
+- keyword rules go into one Aho-Corasick automaton over word tokens, so a
+  scan is a single pass over the post whose cost does not grow with the
+  number of keywords;
+- domain rules are a hash set; each host found in the text or the post's
+  links is checked suffix by suffix ("a.b.example.com" -> "example.com");
+- regex rules with "anchors" only run when the automaton saw one of their
+  anchor phrases; the rest are combined into one alternation with a named
+  group per rule (regexes with their own groups or leading inline flags
+  such as "(?i)" run one by one). Keep un-anchored regexes few - they are
+  the only part whose cost grows with the rule count.
+
+NoiseBlocker owns the current RuleSet and swaps in a fresh one when the
+rules file changes on disk, so workers pick up new rules without a
+restart.
+"""
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from app.feed.classification_cache import normalize_content
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'noise_rules.json')
+RULE_TYPES = ('keyword', 'domain', 'regex')
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Global inline flags ("(?i)...") are only legal at the start of a whole pattern
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+_URL = re.compile(r"(?:https?://|www\.)[^\s<>\"']+|\b(?:[a-z0-9-]+\.)+[a-z]{2,}(?:/[^\s<>\"']*)?", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    type: str
+    pattern: str
+    category: str = 'spam'
+    anchors: tuple = ()
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    rule_id: str
+    category: str
+    type: str
+    matched: str
+
+
+def parse_rules(data):
+    """Validate the rules document ({"rules": [...]}) into Rule objects; raises ValueError"""
+    rules = []
+    seen_ids = set()
+    for position, entry in enumerate(data.get('rules', [])):
+        rule_id = entry.get('id') or f"rule-{position}"
+        rule_type = entry.get('type')
+        pattern = entry.get('pattern')
+        if rule_type not in RULE_TYPES:
+            raise ValueError(f"Rule {rule_id}: type must be one of {', '.join(RULE_TYPES)}")
+        if not pattern or not isinstance(pattern, str):
+            raise ValueError(f"Rule {rule_id}: pattern is required")
+        if rule_id in seen_ids:
+            raise ValueError(f"Duplicate rule id: {rule_id}")
+        seen_ids.add(rule_id)
+        rules.append(Rule(
+            id=rule_id,
+            type=rule_type,
+            pattern=pattern,
+            category=entry.get('category', 'spam'),
+            anchors=tuple(entry.get('anchors', ()))
+        ))
+    return rules
+
+
+def _words(text):
+    return _WORD.findall(normalize_content(text))
+
+
+def _hosts(text, links):
+    """Lower-cased hosts of every URL in the text plus the explicit links"""
+    hosts = []
+    for url in [*_URL.findall(text or ''), *(links or ())]:
+        if '://' not in url:
+            url = f"http://{url}"
+        host = (urlsplit(url).hostname or '').rstrip('.')
+        if host:
+            hosts.append(host[4:] if host.startswith('www.') else host)
+    return hosts
+
+
+class AhoCorasick:
+    """Multi-phrase matcher over word tokens; each phrase maps to a payload"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+    def add(self, words, payload):
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(payload)
+
+    def build(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(word, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        return self
+
+    def __len__(self):
+        return len(self._goto)
+
+    def search(self, words):
+        """Yield the payload of every phrase occurrence, in text order"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class RuleSet:
+    """Immutable compiled form of a rule list"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.automaton = AhoCorasick()
+        self.domains = {}
+        self.anchored = {}
+        self.combined_rules = {}
+        self.standalone = []
+        combined = []
+
+        for rule in self.rules:
+            if rule.type == 'keyword':
+                words = _words(rule.pattern)
+                if not words:
+                    raise ValueError(f"Rule {rule.id}: keyword has no word characters")
+                self.automaton.add(words, ('keyword', rule))
+            elif rule.type == 'domain':
+                self.domains.setdefault(rule.pattern.lower().lstrip('.'), rule)
+            else:
+                try:
+                    compiled = re.compile(rule.pattern, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError(f"Rule {rule.id}: invalid regex: {e}")
+                if rule.anchors:
+                    self.anchored[rule.id] = (rule, compiled)
+                    for anchor in rule.anchors:
+                        self.automaton.add(_words(anchor), ('anchor', rule))
+                elif compiled.groups or _GLOBAL_FLAGS.match(rule.pattern):
+                    # Group numbers / backreferences would shift inside the alternation,
+                    # and global flags cannot sit in the middle of it
+                    self.standalone.append((rule, compiled))
+                else:
+                    group = f"r{len(combined)}"
+                    self.combined_rules[group] = rule
+                    combined.append(f"(?P<{group}>{rule.pattern})")
+        self.automaton.build()
+        try:
+            self.combined = re.compile('|'.join(combined), re.IGNORECASE) if combined else None
+        except re.error as e:
+            # Keeps a bad rule file a ValueError, so a reload leaves the previous rules live
+            raise ValueError(f"Combined regex rules do not compile: {e}")
+
+    def scan(self, text, links=None, first_only=False):
+        """Every rule that fires on the post, at most one hit per rule"""
+        text = text or ''
+        hits = []
+        fired = set()
+
+        def record(rule, matched):
+            if rule.id not in fired:
+                fired.add(rule.id)
+                hits.append(RuleHit(rule.id, rule.category, rule.type, matched))
+
+        # Keyword rules, plus the anchors that arm regex rules, in one automaton pass
+        armed = {}
+        for kind, rule in self.automaton.search(_words(text)):
+            if kind == 'keyword':
+                record(rule, rule.pattern)
+                if first_only:
+                    return hits
+            else:
+                armed[rule.id] = rule
+
+        if self.domains:
+            for host in _hosts(text, links):
+                labels = host.split('.')
+                for start in range(len(labels) - 1):
+                    rule = self.domains.get('.'.join(labels[start:]))
+                    if rule is not None:
+                        record(rule, host)
+                        if first_only:
+                            return hits
+                        break
+
+        for rule in armed.values():
+            match = self.anchored[rule.id][1].search(text)
+            if match:
+                record(rule, match.group(0))
+                if first_only:
+                    return hits
+
+        for rule, compiled in self.standalone:
+            match = compiled.search(text)
+            if match:
+                record(rule, match.group(0))
+                if first_only:
+                    return hits
+
+        if self.combined is not None:
+            for match in self.combined.finditer(text):
+                record(self.combined_rules[match.lastgroup], match.group(0))
+                if first_only:
+                    return hits
+        return hits
+
+
+class NoiseBlocker:
+    """Holds the compiled rules and hot-reloads them when the rules file changes"""
+
+    def __init__(self, path=DEFAULT_RULES_PATH, reload_seconds=5.0, rules=None):
+        # Explicit rules are static; only a rules file is watched for changes
+        self.path = path if rules is None else None
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.reloads = 0
+        self.reload_error = None
+        if rules is not None:
+            self.ruleset = RuleSet(rules)
+        else:
+            self.ruleset = self._load()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            path=config.get('NOISE_RULES_PATH') or DEFAULT_RULES_PATH,
+            reload_seconds=config.get('NOISE_RULES_RELOAD_SECONDS', 5)
+        )
+
+    def _load(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, encoding='utf-8') as f:
+            ruleset = RuleSet(parse_rules(json.load(f)))
+        self._mtime = mtime
+        return ruleset
+
+    def maybe_reload(self, now=None):
+        """Recompile if the rules file changed; a broken file keeps the previous rules live"""
+        now = now or time.monotonic()
+        if self.path is None or now - self._checked_at < self.reload_seconds:
+            return False
+        with self._lock:
+            if now - self._checked_at < self.reload_seconds:
+                return False
+            self._checked_at = now
+            try:
+                if os.stat(self.path).st_mtime_ns == self._mtime:
+                    return False
+                self.ruleset = self._load()
+            except (OSError, ValueError) as e:
+                self.reload_error = str(e)
+                print(f"Noise rules reload error: {str(e)}")  # Debug logging
+                return False
+            self.reload_error = None
+            self.reloads += 1
+            return True
+
+    def scan(self, text, links=None):
+        self.maybe_reload()
+        return self.ruleset.scan(text, links)
+
+    def check(self, text, links=None):
+        """First rule that fires on the post, or None"""
+        self.maybe_reload()
+        hits = self.ruleset.scan(text, links, first_only=True)
+        return hits[0] if hits else None
+
+    def filter_posts(self, posts, enabled=True, text=None, links=None):
+        """
+        Pipeline stage: split posts into (kept, blocked).
+
+        blocked is a list of (post, RuleHit). text/links extract the post
+        text and link list when posts are not plain strings.
+        """
+        posts = list(posts)
+        if not enabled:
+            return posts, []
+        kept, blocked = [], []
+        for post in posts:
+            hit = self.check(text(post) if text else post, links(post) if links else None)
+            if hit is None:
+                kept.append(post)
+            else:
+                blocked.append((post, hit))
+        return kept, blocked
+
+    def filter_for_account(self, account, posts, text=None, links=None):
+        return self.filter_posts(posts, account.noise_blocker_enabled is not False, text=text, links=links)
+
+    def stats(self):
+        ruleset = self.ruleset
+        return {
+            'rules': len(ruleset.rules),
+            'automaton_states': len(ruleset.automaton),
+            'domains': len(ruleset.domains),
+            'anchored_regexes': len(ruleset.anchored),
+            'combined_regexes': len(ruleset.combined_rules),
+            'standalone_regexes': len(ruleset.standalone),
+            'reloads': self.reloads,
+            'reload_error': self.reload_error,
+        }
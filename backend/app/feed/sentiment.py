@@ -0,0 +1,172 @@
+"""
+Offline, batch sentiment scoring for Account.sentiment_filter.
+
+A VADER-style lexicon scorer vectorized over token-id arrays: a batch of
+posts is tokenized into one flat array, valences are looked up with a
+single gather, negation / booster / contrast rules are applied with
+shifted masks that never cross post boundaries, and per-post sums come
+from one bincount. Scores are normalized to a compound value in [-1, 1]
+and cached per normalized text, so repeated posts are never re-scored.
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+from app.feed.classification_cache import LRUCache, normalize_content
+from app.types.enums import SentimentFilter
+
+_TOKEN = re.compile(r"[\w']+|[☀-➿\U0001f300-\U0001faff]", re.UNICODE)
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), 'data', 'sentiment_lexicon.json')
+
+# VADER constants
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+BOOSTER_DECAY = (1.0, 0.95, 0.9)
+CONTRAST_BEFORE = 0.5
+CONTRAST_AFTER = 1.5
+EXCLAMATION_BOOST = 0.292
+MAX_EXCLAMATIONS = 4
+NORMALIZATION_ALPHA = 15.0
+NEUTRAL_THRESHOLD = 0.05
+
+
+def label_for(compound):
+    """Map a compound score to SentimentFilter.POSITIVE/NEGATIVE/NEUTRAL"""
+    if compound >= NEUTRAL_THRESHOLD:
+        return SentimentFilter.POSITIVE
+    if compound <= -NEUTRAL_THRESHOLD:
+        return SentimentFilter.NEGATIVE
+    return SentimentFilter.NEUTRAL
+
+
+class SentimentScorer:
+    def __init__(self, lexicon=None, cache=None):
+        if lexicon is None:
+            with open(DEFAULT_LEXICON_PATH, encoding='utf-8') as f:
+                lexicon = json.load(f)
+        self.cache = cache
+        self.scored = 0
+
+        # Token id 0 is "not in the lexicon"; every table below is indexed by token id
+        words = sorted(
+            set(lexicon.get('valence', {})) | set(lexicon.get('negators', []))
+            | set(lexicon.get('boosters', {})) | set(lexicon.get('contrast', []))
+        )
+        self.vocabulary = {word: token_id for token_id, word in enumerate(words, start=1)}
+        size = len(words) + 1
+        self.valence = np.zeros(size, dtype=np.float32)
+        self.booster = np.zeros(size, dtype=np.float32)
+        self.negator = np.zeros(size, dtype=bool)
+        self.contrast = np.zeros(size, dtype=bool)
+        for word, value in lexicon.get('valence', {}).items():
+            self.valence[self.vocabulary[word]] = value
+        for word, value in lexicon.get('boosters', {}).items():
+            self.booster[self.vocabulary[word]] = value
+        for word in lexicon.get('negators', []):
+            self.negator[self.vocabulary[word]] = True
+        for word in lexicon.get('contrast', []):
+            self.contrast[self.vocabulary[word]] = True
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(cache=LRUCache(
+            max_entries=config.get('SENTIMENT_CACHE_ENTRIES', 50000),
+            ttl_seconds=config.get('SENTIMENT_CACHE_TTL_SECONDS', 24 * 3600)
+        ))
+
+    def _token_ids(self, text):
+        tokens = _TOKEN.findall(text.replace('’', "'"))
+        return [self.vocabulary.get(token, 0) for token in tokens]
+
+    def _score_uncached(self, texts):
+        """Compound scores for already-normalized texts"""
+        count = len(texts)
+        ids_per_text = [self._token_ids(text) for text in texts]
+        lengths = np.fromiter((len(ids) for ids in ids_per_text), dtype=np.int64, count=count)
+        ids = np.fromiter((token_id for ids in ids_per_text for token_id in ids), dtype=np.int64, count=int(lengths.sum()))
+        doc = np.repeat(np.arange(count), lengths)
+
+        valence = self.valence[ids]
+        sign = np.sign(valence)
+        negator = self.negator[ids]
+        booster = self.booster[ids]
+        scale = np.ones_like(valence)
+        boost = np.zeros_like(valence)
+        for distance in range(1, NEGATION_WINDOW + 1):
+            if distance >= len(ids):
+                break
+            same_doc = doc[distance:] == doc[:-distance]
+            # A negator up to three tokens back flips and damps the word
+            flip = same_doc & negator[:-distance]
+            scale[distance:][flip] = NEGATION_SCALAR
+            # Boosters ("very", "slightly") push the word away from / towards zero, with decay
+            boost[distance:] += np.where(same_doc, booster[:-distance], 0.0) * BOOSTER_DECAY[distance - 1]
+        valence = (valence + sign * boost) * scale
+
+        # "but": words before it count half, words after it count one and a half
+        contrast = self.contrast[ids].astype(np.int64)
+        if contrast.any():
+            running = np.cumsum(contrast)
+            doc_start = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            before_doc = np.concatenate(([0], running))[doc_start][doc]
+            seen = running - before_doc - contrast
+            has_contrast = np.bincount(doc, weights=contrast, minlength=count)[doc] > 0
+            valence = np.where(has_contrast, np.where(seen > 0, valence * CONTRAST_AFTER, valence * CONTRAST_BEFORE), valence)
+
+        totals = np.bincount(doc, weights=valence, minlength=count)
+        exclamations = np.fromiter((min(text.count('!'), MAX_EXCLAMATIONS) for text in texts), dtype=np.float64, count=count)
+        totals += np.sign(totals) * exclamations * EXCLAMATION_BOOST
+        return totals / np.sqrt(totals * totals + NORMALIZATION_ALPHA)
+
+    def score(self, texts):
+        """Compound score in [-1, 1] per text, as a float array aligned with texts"""
+        normalized = [normalize_content(text) for text in texts]
+        scores = np.zeros(len(texts), dtype=np.float64)
+
+        # Cache lookups first; identical misses in the same batch are scored once
+        missing = {}
+        for index, text in enumerate(normalized):
+            cached = self.cache.get(text) if self.cache is not None else None
+            if cached is None:
+                missing.setdefault(text, []).append(index)
+            else:
+                scores[index] = cached
+
+        if missing:
+            unique = list(missing)
+            fresh = self._score_uncached(unique)
+            self.scored += len(unique)
+            for text, value in zip(unique, fresh):
+                value = float(value)
+                scores[missing[text]] = value
+                if self.cache is not None:
+                    self.cache.set(text, value)
+        return scores
+
+    def classify(self, texts):
+        """SentimentFilter.POSITIVE/NEGATIVE/NEUTRAL per text"""
+        return [label_for(compound) for compound in self.score(texts)]
+
+    def filter_posts(self, posts, sentiment_filter, text=None):
+        """
+        Pipeline stage: keep posts whose sentiment matches the account's filter.
+
+        sentiment_filter is a SentimentFilter (or its value); ALL / None pass
+        everything through without scoring. text extracts the post text when
+        posts are not plain strings.
+        """
+        if sentiment_filter is None:
+            return list(posts)
+        if not isinstance(sentiment_filter, SentimentFilter):
+            sentiment_filter = SentimentFilter(sentiment_filter)
+        if sentiment_filter == SentimentFilter.ALL:
+            return list(posts)
+
+        posts = list(posts)
+        texts = [text(post) for post in posts] if text else posts
+        return [post for post, label in zip(posts, self.classify(texts)) if label == sentiment_filter]
+
+    def filter_for_account(self, account, posts, text=None):
+        return self.filter_posts(posts, account.sentiment_filter, text=text)
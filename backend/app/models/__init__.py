@@ -1,3 +1,8 @@
 from .account_model import Account
 from .posts_seen_model import PostsSeen
 from .following_recommendations_model import FollowingRecommendation
+from .account_recommendation_stats_model import AccountRecommendationStats
+from .agent_job_model import AgentJob
+from .browser_session_model import BrowserSession
+from .account_version_model import AccountVersion
+from .agent_run_model import AgentRun
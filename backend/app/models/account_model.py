@@ -8,7 +8,7 @@ class Account(db.Model):
     username = db.Column(db.String(50), nullable=False, unique=True)
     password = db.Column(db.String(200), nullable=False)  # TODO: Hash passwords in production
     platform = db.Column(db.Enum(Platform), nullable=False)
-    interests = db.Column(db.Text)  # JSON string of interests
+    interests = db.Column(db.JSON(none_as_null=True))  # list of interest strings
     sentiment_filter = db.Column(db.Enum(SentimentFilter), default=SentimentFilter.POSITIVE)
     noise_blocker_enabled = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
@@ -0,0 +1,12 @@
+from app.db.database import db
+
+class AccountRecommendationStats(db.Model):
+    """Per-account follow decision counters, kept in step with following_recommendations"""
+    __tablename__ = 'account_recommendation_stats'
+
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), primary_key=True)
+    followed_count = db.Column(db.Integer, nullable=False, default=0)
+    skipped_count = db.Column(db.Integer, nullable=False, default=0)
+    pending_count = db.Column(db.Integer, nullable=False, default=0)
+    total_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
@@ -0,0 +1,9 @@
+from app.db.database import db
+
+class AccountVersion(db.Model):
+    """Per-account change counter behind onboarding ETags, bumped in the same transaction as each write"""
+    __tablename__ = 'account_versions'
+
+    # No foreign key: the counter is bumped in the transaction that deletes the account
+    account_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
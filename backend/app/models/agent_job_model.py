@@ -0,0 +1,30 @@
+from app.db.database import db
+from app.types.enums import AgentJobStatus, AgentJobType, Platform
+
+class AgentJob(db.Model):
+    __tablename__ = 'agent_jobs'
+    __table_args__ = (
+        db.Index('ix_agent_jobs_claim', 'platform', 'status', 'available_at'),
+        db.Index('ix_agent_jobs_account_id', 'account_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
+    job_type = db.Column(db.Enum(AgentJobType), nullable=False)
+    platform = db.Column(db.Enum(Platform), nullable=False)
+    status = db.Column(db.Enum(AgentJobStatus), nullable=False, default=AgentJobStatus.QUEUED)
+    payload = db.Column(db.Text)                                   # JSON string of job options
+    result = db.Column(db.Text)                                    # JSON string of the agent result
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    available_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())  # retry backoff
+    lease_owner = db.Column(db.String(100))                        # worker id holding the job
+    lease_expires_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    account = db.relationship('Account', backref=db.backref('agent_jobs', lazy=True))
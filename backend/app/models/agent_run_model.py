@@ -0,0 +1,34 @@
+from app.db.database import db
+from app.types.enums import AgentJobStatus, Platform
+
+class AgentRun(db.Model):
+    """Telemetry for one attempt of an agent job: time, tokens, steps and actions, overall and per phase"""
+    __tablename__ = 'agent_runs'
+    __table_args__ = (
+        db.Index('ix_agent_runs_account_id', 'account_id'),
+        db.Index('ix_agent_runs_platform_started_at', 'platform', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('agent_jobs.id'))
+    platform = db.Column(db.Enum(Platform), nullable=False)
+    attempt = db.Column(db.Integer, nullable=False, default=1)
+    status = db.Column(db.Enum(AgentJobStatus), nullable=False)   # SUCCEEDED, FAILED or CANCELLED
+    posts_to_optimize = db.Column(db.Integer)
+    posts_processed = db.Column(db.Integer, nullable=False, default=0)  # sum of posts_affected in the result
+    step_count = db.Column(db.Integer, nullable=False, default=0)
+    action_count = db.Column(db.Integer, nullable=False, default=0)
+    retries = db.Column(db.Integer, nullable=False, default=0)      # failed steps the agent retried
+    input_tokens = db.Column(db.Integer)
+    output_tokens = db.Column(db.Integer)
+    cost_usd = db.Column(db.Float)
+    duration_seconds = db.Column(db.Float, nullable=False, default=0.0)
+    phases = db.Column(db.JSON)                                     # per-phase totals, see AgentRunTelemetry
+    steps = db.Column(db.JSON)                                      # per-step records
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    account = db.relationship('Account', backref=db.backref('agent_runs', lazy=True))
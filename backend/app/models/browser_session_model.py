@@ -0,0 +1,16 @@
+from app.db.database import db
+from app.types.enums import Platform
+
+class BrowserSession(db.Model):
+    """Encrypted browser storage state (cookies + localStorage) for an account's logged-in session"""
+    __tablename__ = 'browser_sessions'
+
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), primary_key=True)
+    platform = db.Column(db.Enum(Platform), nullable=False)
+    encrypted_state = db.Column(db.LargeBinary, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_used_at = db.Column(db.DateTime)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    miss_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
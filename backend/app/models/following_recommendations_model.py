@@ -3,6 +3,9 @@ from app.types.enums import FollowStatus
 
 class FollowingRecommendation(db.Model):
     __tablename__ = 'following_recommendations'
+    __table_args__ = (
+        db.Index('ix_following_recommendations_account_follow_status', 'account_id', 'follow_status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
@@ -2,6 +2,10 @@ from app.db.database import db
 from app.types.enums import PostStatus
 class PostsSeen(db.Model):
     __tablename__ = 'posts_seen'
+    __table_args__ = (
+        db.Index('uq_posts_seen_account_post_url', 'account_id', 'post_url', unique=True),
+        db.Index('ix_posts_seen_account_status', 'account_id', 'status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     account_id = db.Column(db.Integer, db.ForeignKey('account.id'), nullable=False)
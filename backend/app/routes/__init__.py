@@ -1,6 +1,11 @@
 from flask import Blueprint
 from app.routes.onboarding_routes import onboarding_bp
+from app.routes.posts_seen_routes import posts_seen_bp
+from app.routes.agent_job_routes import agent_jobs_bp
+from app.routes.metrics_routes import metrics_bp
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-api_bp.register_blueprint(onboarding_bp)
\ No newline at end of file
+api_bp.register_blueprint(onboarding_bp)
+api_bp.register_blueprint(posts_seen_bp)
+api_bp.register_blueprint(agent_jobs_bp)
\ No newline at end of file
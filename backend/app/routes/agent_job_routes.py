@@ -0,0 +1,14 @@
+from flask import Blueprint
+from app.controllers.agent_job_controller import AgentJobController
+
+agent_jobs_bp = Blueprint('agent_jobs', __name__, url_prefix='/jobs')
+
+# Submit a feed optimization run for an account
+agent_jobs_bp.route('/feed-optimization', methods=['POST'])(AgentJobController.submit_feed_optimization_job)
+
+# Poll and cancel
+agent_jobs_bp.route('/<int:job_id>', methods=['GET'])(AgentJobController.get_job_status)
+agent_jobs_bp.route('/<int:job_id>/cancel', methods=['POST'])(AgentJobController.cancel_job)
+
+# Agent run telemetry: cost and latency per post processed (?platform=&days=)
+agent_jobs_bp.route('/runs/report', methods=['GET'])(AgentJobController.get_run_report)
@@ -0,0 +1,7 @@
+from flask import Blueprint
+from app.controllers.metrics_controller import MetricsController
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# Prometheus scrape endpoint (outside /api, where scrapers expect it)
+metrics_bp.route('/metrics', methods=['GET'])(MetricsController.export_metrics)
@@ -0,0 +1,10 @@
+from flask import Blueprint
+from app.controllers.posts_seen_controller import PostsSeenController
+
+posts_seen_bp = Blueprint('posts_seen', __name__, url_prefix='/posts-seen')
+
+# Streaming NDJSON bulk upsert, one JSON object per line
+posts_seen_bp.route('/bulk', methods=['POST'])(PostsSeenController.ingest_posts_seen)
+
+# Bulk "already handled?" check backed by the per-account Bloom filter
+posts_seen_bp.route('/check', methods=['POST'])(PostsSeenController.check_posts_seen)
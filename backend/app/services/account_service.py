@@ -3,7 +3,6 @@ from app.models.account_model import Account
 from app.utils.errors import ValidationError, NotFoundError, ConflictError
 from app.types.enums import Platform, SentimentFilter
 from sqlalchemy.exc import IntegrityError
-import json
 
 class AccountService:
     @staticmethod
@@ -33,8 +32,6 @@ class AccountService:
             # Handle platform enum
             platform = Platform(account_data['platform']) if isinstance(account_data['platform'], str) else account_data['platform']
             
-            # Handle interests as JSON string
-            interests_json = json.dumps(account_data.get('interests', [])) if account_data.get('interests') else None
             
             # Handle sentiment filter enum
             sentiment_filter = SentimentFilter(account_data.get('sentiment_filter', 'all')) if account_data.get('sentiment_filter') else SentimentFilter.ALL
@@ -43,7 +40,7 @@ class AccountService:
                 username=account_data['username'],
                 password=account_data['password'],  # TODO: Hash passwords in production
                 platform=platform,
-                interests=interests_json,
+                interests=list(account_data['interests']) if account_data.get('interests') else None,
                 sentiment_filter=sentiment_filter,
                 noise_blocker_enabled=account_data.get('noise_blocker_enabled', True)
             )
@@ -73,7 +70,7 @@ class AccountService:
                 account.platform = Platform(account_data['platform']) if isinstance(account_data['platform'], str) else account_data['platform']
             
             if 'interests' in account_data:
-                account.interests = json.dumps(account_data['interests']) if account_data['interests'] else None
+                account.interests = list(account_data['interests']) if account_data['interests'] else None
             
             if 'sentiment_filter' in account_data:
                 account.sentiment_filter = SentimentFilter(account_data['sentiment_filter']) if isinstance(account_data['sentiment_filter'], str) else account_data['sentiment_filter']
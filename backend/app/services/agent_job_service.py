@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from app.db.repository.agent_job_repository import AgentJobRepository
+from app.models.agent_job_model import AgentJob
+from app.services.account_service import AccountService
+from app.utils.errors import ValidationError, NotFoundError, ConflictError
+from app.types.enums import AgentJobStatus, AgentJobType
+import json
+
+TERMINAL_STATUSES = (AgentJobStatus.SUCCEEDED, AgentJobStatus.FAILED, AgentJobStatus.CANCELLED)
+
+class AgentJobService:
+    @staticmethod
+    def enqueue_feed_optimization(account_id, options=None, max_attempts=3):
+        """Queue a feed optimization run for an account"""
+        options = options or {}
+        AgentJobService._validate_feed_optimization_options(options)
+        account = AccountService.get_account_by_id(account_id)
+        
+        job = AgentJob(
+            account_id=account.id,
+            job_type=AgentJobType.FEED_OPTIMIZATION,
+            platform=account.platform,
+            status=AgentJobStatus.QUEUED,
+            payload=json.dumps(options),
+            max_attempts=max_attempts,
+            available_at=datetime.utcnow()
+        )
+        return AgentJobRepository.create(job)
+
+    @staticmethod
+    def get_job_by_id(job_id):
+        job = AgentJobRepository.get_by_id(job_id)
+        if not job:
+            raise NotFoundError(f"Agent job with id {job_id} not found")
+        return job
+
+    @staticmethod
+    def cancel_job(job_id):
+        """Cancel a queued job immediately, or ask the worker running it to stop"""
+        job = AgentJobService.get_job_by_id(job_id)
+        if job.status in TERMINAL_STATUSES:
+            raise ConflictError(f"Agent job {job_id} is already {job.status.value}")
+        
+        job.cancel_requested = True
+        if job.status == AgentJobStatus.QUEUED:
+            job.status = AgentJobStatus.CANCELLED
+            job.finished_at = datetime.utcnow()
+        return AgentJobRepository.update(job)
+
+    @staticmethod
+    def claim_next_job(platform, worker_id, lease_seconds):
+        now = datetime.utcnow()
+        return AgentJobRepository.claim_next(platform, worker_id, now, now + timedelta(seconds=lease_seconds))
+
+    @staticmethod
+    def heartbeat(job_id, worker_id, lease_seconds):
+        """Renew the lease; returns False if the worker should stop (lease lost or cancel requested)"""
+        now = datetime.utcnow()
+        if not AgentJobRepository.renew_lease(job_id, worker_id, now, now + timedelta(seconds=lease_seconds)):
+            return False
+        return not AgentJobRepository.is_cancel_requested(job_id)
+
+    @staticmethod
+    def is_cancel_requested(job_id):
+        return AgentJobRepository.is_cancel_requested(job_id)
+
+    @staticmethod
+    def complete_job(job_id, worker_id, result):
+        return AgentJobRepository.finish(job_id, worker_id, {
+            'status': AgentJobStatus.SUCCEEDED,
+            'result': json.dumps(result),
+            'error': None,
+            'finished_at': datetime.utcnow()
+        })
+
+    @staticmethod
+    def mark_cancelled(job_id, worker_id):
+        return AgentJobRepository.finish(job_id, worker_id, {
+            'status': AgentJobStatus.CANCELLED,
+            'finished_at': datetime.utcnow()
+        })
+
+    @staticmethod
+    def fail_job(job, worker_id, error, backoff_base_seconds=30, backoff_max_seconds=1800):
+        """Re-queue with exponential backoff, or fail for good once attempts are used up"""
+        now = datetime.utcnow()
+        if job.attempts >= job.max_attempts:
+            return AgentJobRepository.finish(job.id, worker_id, {
+                'status': AgentJobStatus.FAILED,
+                'error': error,
+                'finished_at': now
+            })
+        
+        delay = min(backoff_base_seconds * (2 ** (job.attempts - 1)), backoff_max_seconds)
+        return AgentJobRepository.finish(job.id, worker_id, {
+            'status': AgentJobStatus.QUEUED,
+            'error': error,
+            'available_at': now + timedelta(seconds=delay)
+        })
+
+    @staticmethod
+    def _validate_feed_optimization_options(options):
+        if not isinstance(options, dict):
+            raise ValidationError("options must be an object")
+        
+        if 'posts_to_optimize' in options:
+            posts = options['posts_to_optimize']
+            if not isinstance(posts, int) or isinstance(posts, bool) or not 1 <= posts <= 500:
+                raise ValidationError("posts_to_optimize must be a number between 1 and 500")
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from app.agents.feed_optimization import DEFAULT_POSTS_TO_OPTIMIZE
+from app.db.repository.agent_run_repository import AgentRunRepository
+from app.models.agent_run_model import AgentRun
+from app.types.enums import AgentJobStatus, Platform
+
+# Worker outcome -> recorded run status ('lease_lost' runs were stopped by a dead lease)
+RUN_STATUSES = {
+    'succeeded': AgentJobStatus.SUCCEEDED,
+    'failed': AgentJobStatus.FAILED,
+    'cancelled': AgentJobStatus.CANCELLED,
+    'lease_lost': AgentJobStatus.FAILED,
+}
+
+class AgentRunService:
+    @staticmethod
+    def is_enabled():
+        return current_app.config.get('AGENT_TELEMETRY_ENABLED', True)
+
+    @staticmethod
+    def record_run(context, outcome, value=None):
+        """Persist the telemetry collected for one attempt of a job"""
+        telemetry = context.telemetry
+        if telemetry is None or not AgentRunService.is_enabled():
+            return None
+        
+        telemetry.finish()
+        input_tokens, output_tokens = telemetry.token_totals()
+        cost_usd = telemetry.cost_usd
+        if cost_usd is None:
+            cost_usd = AgentRunService.estimate_cost(input_tokens, output_tokens)
+        
+        if outcome == 'failed':
+            error = value
+        elif outcome == 'lease_lost':
+            error = "Lease lost while running"
+        else:
+            error = None
+        
+        run = AgentRun(
+            account_id=context.account_id,
+            job_id=context.job_id,
+            platform=Platform(context.platform),
+            attempt=context.attempt,
+            status=RUN_STATUSES[outcome],
+            posts_to_optimize=context.payload.get('posts_to_optimize', DEFAULT_POSTS_TO_OPTIMIZE),
+            posts_processed=AgentRunService.count_posts_processed(value) if outcome == 'succeeded' else 0,
+            step_count=len(telemetry.steps),
+            action_count=telemetry.action_count,
+            retries=telemetry.retries,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=cost_usd,
+            duration_seconds=round(telemetry.duration_seconds, 3),
+            phases=telemetry.phase_summary(),
+            steps=telemetry.step_dicts(),
+            error=error,
+            started_at=telemetry.started_at,
+            finished_at=telemetry.finished_at
+        )
+        return AgentRunRepository.create(run)
+
+    @staticmethod
+    def count_posts_processed(result):
+        """Posts the agent reports acting on (sum of actions_taken[].posts_affected)"""
+        if not isinstance(result, dict):
+            return 0
+        total = 0
+        for action in result.get('actions_taken') or []:
+            try:
+                total += max(0, int(action.get('posts_affected') or 0))
+            except (AttributeError, TypeError, ValueError):
+                continue
+        return total
+
+    @staticmethod
+    def estimate_cost(input_tokens, output_tokens):
+        """Cost from the configured per-million-token prices, or None without token counts"""
+        if input_tokens is None and output_tokens is None:
+            return None
+        config = current_app.config
+        return round(
+            (input_tokens or 0) * config.get('AGENT_LLM_INPUT_COST_PER_MTOK', 0.15) / 1e6
+            + (output_tokens or 0) * config.get('AGENT_LLM_OUTPUT_COST_PER_MTOK', 0.60) / 1e6,
+            6
+        )
+
+    @staticmethod
+    def get_cost_latency_report(platform=None, days=None):
+        """Cost and latency per post processed for each posts_to_optimize setting, with per-phase averages"""
+        since = datetime.utcnow() - timedelta(days=days) if days else None
+        
+        phase_totals = {}
+        for posts_to_optimize, phases in AgentRunRepository.iter_phases(platform, since):
+            bucket = phase_totals.setdefault(posts_to_optimize, {})
+            for phase, stats in (phases or {}).items():
+                totals = bucket.setdefault(phase, {'steps': 0, 'seconds': 0.0, 'input_tokens': 0, 'retries': 0})
+                totals['steps'] += stats.get('steps') or 0
+                totals['seconds'] += stats.get('seconds') or 0.0
+                totals['input_tokens'] += stats.get('input_tokens') or 0
+                totals['retries'] += stats.get('retries') or 0
+        
+        buckets = []
+        for row in AgentRunRepository.totals_by_posts_to_optimize(platform, since):
+            posts = row.posts_processed or 0
+            
+            def per_post(value, digits=4):
+                return round(value / posts, digits) if posts and value is not None else None
+            
+            tokens = None
+            if row.input_tokens is not None or row.output_tokens is not None:
+                tokens = (row.input_tokens or 0) + (row.output_tokens or 0)
+            buckets.append({
+                'posts_to_optimize': row.posts_to_optimize,
+                'runs': row.runs,
+                'success_rate': round(row.succeeded / row.runs, 4) if row.runs else None,
+                'posts_processed': posts,
+                'avg_duration_seconds': round(row.duration_seconds / row.runs, 3) if row.runs else None,
+                'seconds_per_post': per_post(row.duration_seconds, 3),
+                'steps_per_post': per_post(row.steps),
+                'actions_per_post': per_post(row.actions),
+                'tokens_per_post': per_post(tokens, 1),
+                'cost_per_post_usd': per_post(row.cost_usd, 6),
+                'retries_per_run': round(row.retries / row.runs, 3) if row.runs else None,
+                'phases': {
+                    phase: {key: round(value / row.runs, 3) for key, value in totals.items()}
+                    for phase, totals in phase_totals.get(row.posts_to_optimize, {}).items()
+                }
+            })
+        
+        return {
+            'platform': platform.value if platform else None,
+            'days': days,
+            'buckets': buckets
+        }
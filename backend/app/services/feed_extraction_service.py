@@ -0,0 +1,113 @@
+import asyncio
+from operator import attrgetter
+from flask import current_app
+from app.feed.extraction import FeedExtractor, classify_stream, screen_stream
+from app.services.posts_seen_service import PostsSeenService
+from app.services.seen_posts_filter_service import SeenPostsFilterService
+
+
+class FeedExtractionService:
+    """Extract -> classify -> record pipeline over an open feed page (see app/feed/extraction.py)"""
+
+    @staticmethod
+    def is_enabled():
+        return current_app.config.get('FEED_EXTRACTION_ENABLED', True)
+
+    @staticmethod
+    async def extract(page, account_id, platform, interests=None, classifier=None, max_posts=50,
+                      account=None, noise_blocker=None, sentiment_scorer=None, **extractor_options):
+        """
+        Stream new posts off the page into the classifier and record them in PostsSeen.
+
+        account carries the account's feed settings (an Account, or the
+        runner's AgentRunContext). Posts a noise_blocker rule fires on (when
+        account.noise_blocker_enabled), then posts that do not match
+        account.sentiment_filter with a sentiment_scorer, are screened out
+        before classification and come back labelled
+        {'relevant': False, 'screened': 'noise' | 'sentiment'}.
+
+        Posts are written as NOT_SEEN in batches of FEED_EXTRACTION_WRITE_BATCH
+        while extraction continues, on a worker thread so other browsers on
+        the event loop keep going. They only count as seen (and reach the
+        seen-posts filter) once mark_handled() is called for them, so posts
+        from a run that fails before the agent acts on them come back next
+        time. Returns {'posts': [(post, label)], 'stats', 'recorded'}; labels
+        of unscreened posts are None without a classifier.
+        """
+        known_urls = None
+        if SeenPostsFilterService.is_enabled():
+            def known_urls(urls):
+                return [url for url, seen in zip(urls, SeenPostsFilterService.contains_many(account_id, urls)) if seen]
+
+        extractor_options.setdefault('max_scrolls', current_app.config.get('FEED_EXTRACTION_MAX_SCROLLS', 30))
+        extractor = FeedExtractor(page, platform, max_posts=max_posts, known_urls=known_urls, **extractor_options)
+        write_batch = current_app.config.get('FEED_EXTRACTION_WRITE_BATCH', 50)
+        classify_batch = current_app.config.get('FEED_EXTRACTION_CLASSIFY_BATCH', 20)
+
+        posts, screened = extractor.stream(), []
+        if noise_blocker is not None and account is not None:
+            posts = screen_stream(
+                posts, lambda batch: noise_blocker.filter_for_account(account, batch, text=attrgetter('text'))[0],
+                'noise', screened, batch_size=classify_batch
+            )
+        if sentiment_scorer is not None and account is not None:
+            posts = screen_stream(
+                posts, lambda batch: sentiment_scorer.filter_for_account(account, batch, text=attrgetter('text')),
+                'sentiment', screened, batch_size=classify_batch
+            )
+
+        async def unlabelled(posts):
+            async for post in posts:
+                yield post, None
+
+        async def with_screened(labelled):
+            # Screened posts are still recorded, so the next run knows them
+            async for item in labelled:
+                while screened:
+                    post, reason = screened.pop(0)
+                    yield post, FeedExtractionService.screened_label(reason)
+                yield item
+            while screened:
+                post, reason = screened.pop(0)
+                yield post, FeedExtractionService.screened_label(reason)
+
+        if classifier is not None:
+            labelled = classify_stream(posts, classifier, interests, batch_size=classify_batch)
+        else:
+            labelled = unlabelled(posts)
+
+        results, pending, recorded = [], [], 0
+        async for post, label in with_screened(labelled):
+            results.append((post, label))
+            pending.append(post)
+            if len(pending) >= write_batch:
+                recorded += await FeedExtractionService._in_thread(
+                    PostsSeenService.record_extracted_posts, account_id, pending
+                )
+                pending = []
+        if pending:
+            recorded += await FeedExtractionService._in_thread(
+                PostsSeenService.record_extracted_posts, account_id, pending
+            )
+
+        return {'posts': results, 'stats': extractor.stats, 'recorded': recorded}
+
+    @staticmethod
+    def screened_label(reason):
+        return {'relevant': False, 'topic': None, 'screened': reason}
+
+    @staticmethod
+    async def mark_handled(account_id, post_urls):
+        """Mark extracted posts the agent has acted on as seen; returns rows updated"""
+        return await FeedExtractionService._in_thread(PostsSeenService.mark_extracted_posts_handled, account_id, post_urls)
+
+    @staticmethod
+    async def _in_thread(func, *args):
+        # A fresh app context gives the thread its own DB session, apart from the event loop's
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                return func(*args)
+
+        return await asyncio.to_thread(run)
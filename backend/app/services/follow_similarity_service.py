@@ -0,0 +1,187 @@
+import threading
+import time
+from flask import current_app
+from app.db.engine_profile import is_memory_sqlite
+from app.db.repository.account_repository import AccountRepository
+from app.db.repository.following_recommendations_repository import FollowingRecommendationsRepository
+from app.types.enums import FollowStatus
+from app.utils.item_similarity import ItemSimilarityModel
+
+RATINGS = {FollowStatus.FOLLOWED: 1, FollowStatus.SKIPPED: -1}
+
+# Per-process models keyed by platform value, built from FollowingRecommendation off the request path
+_models = {}
+_built_at = None
+_rebuild_started_at = None
+_rebuilding = False
+# Ratings recorded while a rebuild scans the table, replayed onto its models before they are swapped in
+_pending = None
+_models_lock = threading.Lock()
+_rebuild_lock = threading.Lock()
+
+class FollowSimilarityService:
+    """Item-item collaborative filtering over FOLLOWED/SKIPPED decisions.
+
+    Decisions made in this process are folded in incrementally as they are
+    committed. The full build from the table runs on a background thread,
+    once at startup and then at most every COLLABORATIVE_REBUILD_SECONDS so
+    processes converge on each other's writes; requests keep using the
+    current models meanwhile, and only one rebuild runs at a time.
+    """
+
+    @staticmethod
+    def is_enabled():
+        return current_app.config.get('COLLABORATIVE_RECOMMENDATIONS_ENABLED', True)
+
+    @staticmethod
+    def get_model(platform):
+        FollowSimilarityService._schedule_rebuild()
+        with _models_lock:
+            model = _models.get(platform)
+            if model is None:
+                model = _models[platform] = FollowSimilarityService._new_model()
+            return model
+
+    @staticmethod
+    def rebuild():
+        """Recompute every platform's model in one pass over the table and swap them in"""
+        global _models, _built_at, _pending, _rebuild_started_at
+        with _rebuild_lock:
+            with _models_lock:
+                _pending = []
+                _rebuild_started_at = time.monotonic()
+            try:
+                models = {}
+                for platform, account_id, recommended_user, follow_status in \
+                        FollowingRecommendationsRepository.iter_decisions():
+                    model = models.get(platform.value)
+                    if model is None:
+                        model = models[platform.value] = FollowSimilarityService._new_model()
+                    model.set_rating(account_id, recommended_user, RATINGS[follow_status])
+            except Exception:
+                with _models_lock:
+                    _pending = None
+                raise
+
+            with _models_lock:
+                for platform, account_id, recommended_user, rating in _pending:
+                    model = models.get(platform)
+                    if model is None:
+                        model = models[platform] = FollowSimilarityService._new_model()
+                    model.set_rating(account_id, recommended_user, rating)
+                _pending = None
+                _models = models
+                _built_at = time.monotonic()
+            return models
+
+    @staticmethod
+    def rebuild_in_background():
+        """Start rebuild() on a daemon thread unless one is already running; returns the thread or None"""
+        global _rebuilding, _rebuild_started_at
+        with _models_lock:
+            if _rebuilding:
+                return None
+            _rebuilding = True
+            _rebuild_started_at = time.monotonic()
+        app = current_app._get_current_object()
+
+        # Each thread gets its own in-memory SQLite database, so those are small enough to build inline
+        if is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+            try:
+                FollowSimilarityService.rebuild()
+            finally:
+                with _models_lock:
+                    _rebuilding = False
+            return None
+
+        def run():
+            global _rebuilding
+            try:
+                with app.app_context():
+                    FollowSimilarityService.rebuild()
+            except Exception as e:
+                print(f"Collaborative rebuild error: {str(e)}")  # Debug logging
+            finally:
+                with _models_lock:
+                    _rebuilding = False
+
+        thread = threading.Thread(target=run, name='follow-similarity-rebuild', daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def record_decisions(decisions, platforms=None):
+        """
+        Fold committed (account_id, recommended_user, follow_status) changes; None status means deleted.
+
+        platforms maps account_id to its platform for callers that already
+        have it; any other accounts are looked up with one query.
+        """
+        if not FollowSimilarityService.is_enabled() or not decisions:
+            return
+        if _built_at is None and _pending is None:
+            return      # nothing built or building yet: the first build reads these from the table
+        platforms = {account_id: getattr(platform, 'value', platform) for account_id, platform in (platforms or {}).items()}
+        missing = {account_id for account_id, _, _ in decisions} - set(platforms)
+        if missing:
+            platforms.update(
+                (account_id, platform.value) for account_id, platform in AccountRepository.get_platforms(missing)
+            )
+
+        # Under the lock, so a rebuild either swaps in before a rating lands or replays it afterwards
+        with _models_lock:
+            for account_id, recommended_user, follow_status in decisions:
+                platform = platforms.get(account_id)
+                if platform is None:
+                    continue
+                rating = RATINGS.get(follow_status, 0)
+                model = _models.get(platform)
+                if model is None:
+                    model = _models[platform] = FollowSimilarityService._new_model()
+                model.set_rating(account_id, recommended_user, rating)
+                if _pending is not None:
+                    _pending.append((platform, account_id, recommended_user, rating))
+
+    @staticmethod
+    def rerank(account_id, platform, recommendations, k):
+        """
+        Blend catalog recommendations with handles followed alongside them.
+
+        recommendations are catalog rows ({'recommended_user', 'reason', 'score'});
+        similar handles are scored by summed cosine similarity to them (and to
+        the account's own decisions), weighted by COLLABORATIVE_WEIGHT, and the
+        best k of both lists are returned.
+        """
+        if not FollowSimilarityService.is_enabled():
+            return recommendations[:k]
+        model = FollowSimilarityService.get_model(platform)
+        own_ratings = model.account_ratings(account_id) if account_id is not None else {}
+        seeds = {rec['recommended_user']: rec['score'] for rec in recommendations}
+        for handle, rating in own_ratings.items():
+            seeds[handle] = seeds.get(handle, 0.0) + rating
+
+        weight = current_app.config.get('COLLABORATIVE_WEIGHT', 1.0)
+        similar = model.score(seeds, k=k, exclude=set(own_ratings) | set(seeds))
+        candidates = list(recommendations) + [
+            {'recommended_user': handle, 'reason': f'Often followed alongside {seed}', 'score': round(weight * score, 4)}
+            for handle, score, seed in similar
+        ]
+        candidates.sort(key=lambda rec: -rec['score'])
+        return candidates[:k]
+
+    @staticmethod
+    def stats():
+        with _models_lock:
+            return {platform: model.stats() for platform, model in _models.items()}
+
+    @staticmethod
+    def _schedule_rebuild():
+        """Start a background rebuild when none has run yet or the last one is older than COLLABORATIVE_REBUILD_SECONDS"""
+        rebuild_seconds = current_app.config.get('COLLABORATIVE_REBUILD_SECONDS', 3600)
+        started_at = _rebuild_started_at
+        if started_at is None or (rebuild_seconds >= 0 and time.monotonic() - started_at >= rebuild_seconds):
+            FollowSimilarityService.rebuild_in_background()
+
+    @staticmethod
+    def _new_model():
+        return ItemSimilarityModel(min_support=current_app.config.get('COLLABORATIVE_MIN_SUPPORT', 2))
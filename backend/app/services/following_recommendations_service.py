@@ -1,4 +1,7 @@
+from flask import current_app
 from app.db.repository.following_recommendations_repository import FollowingRecommendationsRepository
+from app.db.repository.account_recommendation_stats_repository import AccountRecommendationStatsRepository
+from app.services.follow_similarity_service import FollowSimilarityService
 from app.models.following_recommendations_model import FollowingRecommendation
 from app.utils.errors import ValidationError, NotFoundError, ConflictError
 from app.types.enums import FollowStatus
@@ -11,6 +14,12 @@ class FollowingRecommendationsService:
             return FollowingRecommendationsRepository.get_by_account_id(account_id)
         return FollowingRecommendationsRepository.get_all()
 
+    @staticmethod
+    def get_following_recommendations_by_status(account_id, follow_status, limit=None, after_id=None):
+        return FollowingRecommendationsRepository.get_by_account_id_and_status(
+            account_id, FollowStatus(follow_status), limit=limit, after_id=after_id
+        )
+
     @staticmethod
     def get_following_recommendation_by_id(rec_id):
         recommendation = FollowingRecommendationsRepository.get_by_id(rec_id)
@@ -23,20 +32,42 @@ class FollowingRecommendationsService:
         FollowingRecommendationsService._validate_recommendation_data(rec_data)
         
         try:
-            # Handle follow status enum
-            follow_status = FollowStatus(rec_data.get('follow_status', 'pending')) if rec_data.get('follow_status') else None
-            
-            recommendation = FollowingRecommendation(
-                account_id=rec_data['account_id'],
-                recommended_user=rec_data['recommended_user'],
-                reason=rec_data.get('reason'),
-                follow_status=follow_status
+            recommendation = FollowingRecommendationsService._build_recommendation(rec_data)
+            FollowingRecommendationsService._track_status_changes(
+                [(recommendation.account_id, None, recommendation.follow_status or FollowStatus.PENDING)]
             )
-            return FollowingRecommendationsRepository.create(recommendation)
+            FollowingRecommendationsRepository.create(recommendation)
+            FollowingRecommendationsService._record_decisions([recommendation])
+            return recommendation
         except IntegrityError:
             FollowingRecommendationsRepository.rollback()
             raise ConflictError("Failed to create following recommendation")
 
+    @staticmethod
+    def create_following_recommendations(rec_data_list):
+        """Create many recommendations in a single transaction (one multi-row INSERT, one commit)"""
+        # Validate every row up front so a bad row never leaves a partial batch behind
+        for rec_data in rec_data_list:
+            FollowingRecommendationsService._validate_recommendation_data(rec_data)
+        
+        if not rec_data_list:
+            return []
+        
+        try:
+            rows = [
+                FollowingRecommendationsService._build_row(rec_data)
+                for rec_data in rec_data_list
+            ]
+            FollowingRecommendationsService._track_status_changes(
+                [(row['account_id'], None, row['follow_status']) for row in rows]
+            )
+            recommendations = FollowingRecommendationsRepository.insert_many(rows)
+            FollowingRecommendationsService._record_decisions(recommendations)
+            return recommendations
+        except IntegrityError:
+            FollowingRecommendationsRepository.rollback()
+            raise ConflictError("Failed to create following recommendations")
+
     @staticmethod
     def update_following_recommendation(rec_id, rec_data):
         FollowingRecommendationsService._validate_recommendation_data(rec_data, is_update=True)
@@ -46,23 +77,171 @@ class FollowingRecommendationsService:
             raise NotFoundError(f"Following recommendation with id {rec_id} not found")
         
         try:
+            previous_user = recommendation.recommended_user
             recommendation.recommended_user = rec_data.get('recommended_user', recommendation.recommended_user)
             recommendation.reason = rec_data.get('reason', recommendation.reason)
             
             if 'follow_status' in rec_data:
+                previous_status = recommendation.follow_status or FollowStatus.PENDING
                 recommendation.follow_status = FollowStatus(rec_data['follow_status']) if isinstance(rec_data['follow_status'], str) else rec_data['follow_status']
+                FollowingRecommendationsService._track_status_changes(
+                    [(recommendation.account_id, previous_status, recommendation.follow_status)]
+                )
             
-            return FollowingRecommendationsRepository.update(recommendation)
+            FollowingRecommendationsRepository.update(recommendation)
+            if previous_user != recommendation.recommended_user:
+                FollowSimilarityService.record_decisions([(recommendation.account_id, previous_user, None)])
+            FollowSimilarityService.record_decisions(
+                [(recommendation.account_id, recommendation.recommended_user, recommendation.follow_status)]
+            )
+            return recommendation
         except IntegrityError:
             FollowingRecommendationsRepository.rollback()
             raise ConflictError("Failed to update following recommendation")
 
+    @staticmethod
+    def update_follow_statuses(account_id, status_updates):
+        """Apply many (rec_id, follow_status) changes to the account's recommendations with one SELECT and one commit.
+
+        Every id must belong to account_id; ids owned by another account are
+        reported as not found, so callers cannot touch (or probe) other accounts.
+        """
+        parsed_updates = []
+        for rec_id, follow_status in status_updates:
+            try:
+                rec_id = int(rec_id)
+            except (TypeError, ValueError):
+                raise ValidationError(f"Recommendation id must be a valid number, got {rec_id!r}")
+            try:
+                follow_status = FollowStatus(follow_status)
+            except ValueError:
+                valid_statuses = [s.value for s in FollowStatus]
+                raise ValidationError(f"Follow status must be one of: {', '.join(valid_statuses)}")
+            parsed_updates.append((rec_id, follow_status))
+        
+        if not parsed_updates:
+            return []
+        
+        recommendations = FollowingRecommendationsRepository.get_by_ids({rec_id for rec_id, _ in parsed_updates})
+        recommendations_by_id = {rec.id: rec for rec in recommendations}
+        
+        for rec_id, _ in parsed_updates:
+            recommendation = recommendations_by_id.get(rec_id)
+            if not recommendation:
+                raise NotFoundError(f"Following recommendation with id {rec_id} not found")
+            if recommendation.account_id != account_id:
+                raise NotFoundError(f"Following recommendation with id {rec_id} not found for account {account_id}")
+        
+        try:
+            updated_recommendations = []
+            status_changes = []
+            for rec_id, follow_status in parsed_updates:
+                recommendation = recommendations_by_id[rec_id]
+                status_changes.append((recommendation.account_id, recommendation.follow_status or FollowStatus.PENDING, follow_status))
+                recommendation.follow_status = follow_status
+                updated_recommendations.append(recommendation)
+            
+            FollowingRecommendationsService._track_status_changes(status_changes)
+            FollowingRecommendationsRepository.update_many(list(recommendations_by_id.values()))
+            # The commit expired every row; reload them with one IN query instead of one refresh SELECT each,
+            # picking up each account's platform for the similarity model on the way
+            reloaded = FollowingRecommendationsRepository.get_by_ids_with_platforms(list(recommendations_by_id))
+            FollowSimilarityService.record_decisions(
+                [(rec.account_id, rec.recommended_user, rec.follow_status) for rec in updated_recommendations],
+                platforms={rec.account_id: platform for rec, platform in reloaded}
+            )
+            return updated_recommendations
+        except IntegrityError:
+            FollowingRecommendationsRepository.rollback()
+            raise ConflictError("Failed to update following recommendations")
+
     @staticmethod
     def delete_following_recommendation(rec_id):
         recommendation = FollowingRecommendationsRepository.get_by_id(rec_id)
         if not recommendation:
             raise NotFoundError(f"Following recommendation with id {rec_id} not found")
+        FollowingRecommendationsService._track_status_changes(
+            [(recommendation.account_id, recommendation.follow_status or FollowStatus.PENDING, None)]
+        )
         FollowingRecommendationsRepository.delete(recommendation)
+        FollowSimilarityService.record_decisions([(recommendation.account_id, recommendation.recommended_user, None)])
+
+    @staticmethod
+    def get_recommendation_stats(account_id):
+        """Followed/skipped/pending/total counts, from the counters table when enabled"""
+        if FollowingRecommendationsService._counters_enabled():
+            counters = AccountRecommendationStatsRepository.get_by_account_id(account_id)
+            if counters:
+                return {
+                    'followed_count': counters.followed_count,
+                    'skipped_count': counters.skipped_count,
+                    'pending_count': counters.pending_count,
+                    'total_recommendations': counters.total_count
+                }
+        
+        counts = AccountRecommendationStatsRepository.count_by_status(account_id)
+        return {
+            'followed_count': counts.get(FollowStatus.FOLLOWED, 0),
+            'skipped_count': counts.get(FollowStatus.SKIPPED, 0),
+            'pending_count': counts.get(FollowStatus.PENDING, 0),
+            'total_recommendations': sum(counts.values())
+        }
+
+    @staticmethod
+    def _counters_enabled():
+        return current_app.config.get('RECOMMENDATION_COUNTERS_ENABLED', True)
+
+    @staticmethod
+    def _track_status_changes(status_changes):
+        """Fold (account_id, old_status, new_status) changes into the per-account counters.
+
+        old_status is None for inserts and new_status is None for deletes. Runs in
+        the caller's transaction, so counters commit together with the rows.
+        """
+        if not FollowingRecommendationsService._counters_enabled():
+            return
+        
+        deltas_by_account = {}
+        for account_id, old_status, new_status in status_changes:
+            deltas = deltas_by_account.setdefault(account_id, {})
+            if old_status is not None:
+                deltas[old_status] = deltas.get(old_status, 0) - 1
+            if new_status is not None:
+                deltas[new_status] = deltas.get(new_status, 0) + 1
+        
+        for account_id, deltas in deltas_by_account.items():
+            AccountRecommendationStatsRepository.apply_deltas(account_id, deltas)
+
+    @staticmethod
+    def _record_decisions(recommendations):
+        """Feed newly created rows that already carry a follow decision into the similarity model"""
+        FollowSimilarityService.record_decisions([
+            (rec.account_id, rec.recommended_user, rec.follow_status)
+            for rec in recommendations
+            if rec.follow_status in (FollowStatus.FOLLOWED, FollowStatus.SKIPPED)
+        ])
+
+    @staticmethod
+    def _build_recommendation(rec_data):
+        # Handle follow status enum
+        follow_status = FollowStatus(rec_data.get('follow_status', 'pending')) if rec_data.get('follow_status') else None
+        
+        return FollowingRecommendation(
+            account_id=rec_data['account_id'],
+            recommended_user=rec_data['recommended_user'],
+            reason=rec_data.get('reason'),
+            follow_status=follow_status
+        )
+
+    @staticmethod
+    def _build_row(rec_data):
+        """Column values for a bulk insert; every row carries the same keys, so the status default is explicit"""
+        return {
+            'account_id': rec_data['account_id'],
+            'recommended_user': rec_data['recommended_user'],
+            'reason': rec_data.get('reason'),
+            'follow_status': FollowStatus(rec_data['follow_status']) if rec_data.get('follow_status') else FollowStatus.PENDING
+        }
 
     @staticmethod
     def _validate_recommendation_data(rec_data, is_update=False):
@@ -1,7 +1,9 @@
 from app.db.repository.posts_seen_repository import PostsSeenRepository
+from app.services.seen_posts_filter_service import SeenPostsFilterService
 from app.models.posts_seen_model import PostsSeen
 from app.utils.errors import ValidationError, NotFoundError, ConflictError
-from sqlalchemy.exc import IntegrityError
+from app.types.enums import PostStatus
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 class PostsSeenService:
     @staticmethod
@@ -25,12 +27,105 @@ class PostsSeenService:
             post = PostsSeen(
                 account_id=post_data['account_id'],
                 post_url=post_data['post_url'],
-                status=post_data.get('status', 'neutral')
+                status=PostStatus(post_data.get('status') or 'neutral')
             )
-            return PostsSeenRepository.create(post)
+            post = PostsSeenRepository.create(post)
         except IntegrityError:
             PostsSeenRepository.rollback()
             raise ConflictError("Failed to create post seen record")
+        
+        if SeenPostsFilterService.is_enabled():
+            SeenPostsFilterService.mark_seen(post.account_id, [post.post_url])
+        return post
+
+    @staticmethod
+    def ingest_posts_seen(records, account_id=None, batch_size=500, max_errors=1000):
+        """Upsert a stream of (line_number, post_data, error) records in fixed-size batches.
+
+        Invalid lines are reported without aborting the stream. Only the current
+        batch and at most max_errors error entries are held in memory.
+        """
+        summary = {'received': 0, 'written': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+        batch = {}
+        
+        def report(line_number, message):
+            summary['failed'] += 1
+            if len(summary['errors']) < max_errors:
+                summary['errors'].append({'line': line_number, 'message': message})
+            else:
+                summary['errors_truncated'] = True
+        
+        def flush():
+            rows = [row for _, row in batch.values()]
+            try:
+                summary['written'] += PostsSeenRepository.upsert_many(rows)
+            except SQLAlchemyError as e:
+                # Earlier batches stay committed; this batch's lines are reported and the stream goes on
+                PostsSeenRepository.rollback()
+                for line_number, _ in batch.values():
+                    report(line_number, f"Failed to write batch: {getattr(e, 'orig', None) or e}")
+            else:
+                if SeenPostsFilterService.is_enabled():
+                    urls_by_account = {}
+                    for row in rows:
+                        urls_by_account.setdefault(row['account_id'], []).append(row['post_url'])
+                    for row_account_id, post_urls in urls_by_account.items():
+                        SeenPostsFilterService.mark_seen(row_account_id, post_urls)
+            batch.clear()
+        
+        for line_number, post_data, error in records:
+            summary['received'] += 1
+            if error:
+                report(line_number, error)
+                continue
+            
+            if account_id is not None and not post_data.get('account_id'):
+                post_data['account_id'] = account_id
+            
+            try:
+                PostsSeenService._validate_post_data(post_data)
+            except ValidationError as e:
+                report(line_number, e.message)
+                continue
+            
+            # Duplicate keys inside one batch collapse to the latest line
+            batch[(post_data['account_id'], post_data['post_url'])] = (line_number, {
+                'account_id': post_data['account_id'],
+                'post_url': post_data['post_url'],
+                'status': PostStatus(post_data.get('status') or 'neutral'),
+            })
+            if len(batch) >= batch_size:
+                flush()
+        
+        if batch:
+            flush()
+        
+        return summary
+
+    @staticmethod
+    def record_extracted_posts(account_id, posts):
+        """
+        Record a batch of ExtractedPosts as NOT_SEEN; posts already recorded keep their status.
+
+        They stay out of the seen-posts filter until mark_extracted_posts_handled().
+        Returns rows inserted.
+        """
+        rows = list({
+            post.url: {'account_id': account_id, 'post_url': post.url, 'status': PostStatus.NOT_SEEN}
+            for post in posts
+        }.values())
+        return PostsSeenRepository.insert_new_many(rows)
+
+    @staticmethod
+    def mark_extracted_posts_handled(account_id, post_urls):
+        """Move extracted posts from NOT_SEEN to NEUTRAL and add them to the seen-posts filter. Returns rows updated."""
+        post_urls = list(dict.fromkeys(post_urls))
+        updated = PostsSeenRepository.update_status_many(
+            account_id, post_urls, PostStatus.NEUTRAL, from_status=PostStatus.NOT_SEEN
+        )
+        if post_urls and SeenPostsFilterService.is_enabled():
+            SeenPostsFilterService.mark_seen(account_id, post_urls)
+        return updated
 
     @staticmethod
     def update_posts_seen(post_id, post_data):
@@ -41,7 +136,8 @@ class PostsSeenService:
             raise NotFoundError(f"Post seen record with id {post_id} not found")
         
         try:
-            post.status = post_data.get('status', post.status)
+            if post_data.get('status'):
+                post.status = PostStatus(post_data['status'])
             return PostsSeenRepository.update(post)
         except IntegrityError:
             PostsSeenRepository.rollback()
@@ -62,11 +158,17 @@ class PostsSeenService:
                 if field not in post_data or not post_data[field]:
                     raise ValidationError(f"Field '{field}' is required")
 
+        if 'account_id' in post_data and post_data['account_id'] is not None:
+            if isinstance(post_data['account_id'], bool) or not isinstance(post_data['account_id'], int):
+                raise ValidationError("account_id must be an integer")
+
         if 'post_url' in post_data and post_data['post_url']:
+            if not isinstance(post_data['post_url'], str):
+                raise ValidationError("Post URL must be a string")
             if not post_data['post_url'].startswith(('http://', 'https://')):
                 raise ValidationError("Post URL must be a valid URL")
 
         if 'status' in post_data and post_data['status']:
             valid_statuses = ['liked', 'disliked', 'neutral', 'saved']
-            if post_data['status'] not in valid_statuses:
+            if not isinstance(post_data['status'], str) or post_data['status'] not in valid_statuses:
                 raise ValidationError(f"Status must be one of: {', '.join(valid_statuses)}")
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import threading
+import time
+from flask import current_app
+from app.utils.recommendation_catalog import RecommendationCatalog
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'recommendation_catalog.json')
+
+# Per-process catalog, swapped atomically on reload
+_catalog = None
+_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+class RecommendationCatalogService:
+    """Process-wide recommendation catalog, loaded once and reloaded when its file changes"""
+
+    @staticmethod
+    def get_catalog():
+        global _checked_at
+        catalog = _catalog
+        if catalog is None:
+            return RecommendationCatalogService.reload()
+
+        reload_seconds = current_app.config.get('RECOMMENDATION_CATALOG_RELOAD_SECONDS', 30)
+        now = time.monotonic()
+        if reload_seconds >= 0 and now - _checked_at >= reload_seconds:
+            _checked_at = now
+            if catalog.is_stale() or catalog.path != RecommendationCatalogService._catalog_path():
+                try:
+                    return RecommendationCatalogService.reload()
+                except (OSError, ValueError) as e:
+                    print(f"Recommendation catalog reload error: {str(e)}")  # Debug logging
+        return catalog
+
+    @staticmethod
+    def reload():
+        """Load the catalog file and swap it in; a failed load leaves the current catalog live"""
+        global _catalog, _checked_at
+        with _catalog_lock:
+            catalog = RecommendationCatalog.load(RecommendationCatalogService._catalog_path())
+            _catalog = catalog
+            _checked_at = time.monotonic()
+            return catalog
+
+    @staticmethod
+    def recommend(platform, interests):
+        return RecommendationCatalogService.get_catalog().recommend(platform, interests)
+
+    @staticmethod
+    def _catalog_path():
+        return current_app.config.get('RECOMMENDATION_CATALOG_PATH') or DEFAULT_CATALOG_PATH
@@ -0,0 +1,74 @@
+import hashlib
+import threading
+from flask import current_app
+from app.db.repository.account_repository import AccountRepository
+from app.db.repository.account_version_repository import AccountVersionRepository
+from app.utils.response_cache import ResponseCache
+
+# Per-process response cache (created from config on first use)
+_cache = None
+_cache_lock = threading.Lock()
+
+class ResponseCacheService:
+    """Versioned ETags and server-side caching for per-account GET responses"""
+
+    @staticmethod
+    def get_cache():
+        global _cache
+        config = current_app.config
+        if not config.get('RESPONSE_CACHE_ENABLED', True):
+            return None
+        if _cache is None:
+            with _cache_lock:
+                if _cache is None:
+                    _cache = ResponseCache(max_entries=config.get('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+        return _cache
+
+    @staticmethod
+    def current_version(account_id):
+        return AccountVersionRepository.get_version(account_id)
+
+    @staticmethod
+    def cache_key(account_id, step, args):
+        """Key for a response: the account, the step and the remaining query args in a stable order"""
+        return (account_id, step, tuple(sorted(args)))
+
+    @staticmethod
+    def etag(key, version):
+        account_id, step, args = key
+        tag = f"acct-{account_id}-v{version}-s{step}"
+        if args:
+            tag += '-' + hashlib.sha1(repr(args).encode('utf-8')).hexdigest()[:12]
+        return tag
+
+    @staticmethod
+    def fresh_render():
+        """Context manager for rendering a body stored under the current version.
+
+        Account snapshots cached by another process's reads may predate that
+        version, so accounts are read from the database instead.
+        """
+        return AccountRepository.fresh_reads()
+
+    @staticmethod
+    def lookup(key, version):
+        cache = ResponseCacheService.get_cache()
+        return cache.get(key, version) if cache is not None else None
+
+    @staticmethod
+    def store(key, version, status, body):
+        cache = ResponseCacheService.get_cache()
+        if cache is not None:
+            cache.put(key, version, status, body)
+
+    @staticmethod
+    def invalidate_accounts(account_ids):
+        """Drop this process's cached responses for the accounts (other processes miss on the version)"""
+        if _cache is None:
+            return
+        for account_id in {account_id for account_id in account_ids if account_id is not None}:
+            _cache.invalidate_account(account_id)
+
+    @staticmethod
+    def stats():
+        return _cache.stats() if _cache is not None else {'entries': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
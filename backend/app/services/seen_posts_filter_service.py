@@ -0,0 +1,158 @@
+import os
+import threading
+from contextlib import contextmanager
+from flask import current_app
+from app.db.repository.posts_seen_repository import PostsSeenRepository
+from app.utils.bloom_filter import BloomFilter, canonicalize_post_url
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within this process
+    fcntl = None
+
+# Per-process registry of open filters: filter file path -> BloomFilter
+_filters = {}
+_filters_lock = threading.Lock()
+# Stands in for the file lock where fcntl is missing
+_writers_lock = threading.Lock()
+
+class SeenPostsFilterService:
+    """Per-account Bloom filter over canonical post URLs already handled in PostsSeen.
+
+    Answers "have we probably handled this post?" without a DB round trip.
+    A negative answer is exact; a positive one is wrong at most
+    SEEN_POSTS_FILTER_ERROR_RATE of the time.
+
+    Rebuilds write a new file and rename it over the old one, so other
+    workers never see a half-built filter; they notice the new inode on
+    their next lookup and remap it.
+
+    Writers in every process (mark_seen, builds and rebuilds) hold an
+    exclusive flock on the account's .lock file, which is never replaced,
+    and remap the current file under it. Bits and the header count are
+    read-modify-written, so this keeps concurrent workers from losing each
+    other's bits or writing into a file another worker just replaced.
+    """
+
+    @staticmethod
+    def is_enabled():
+        return current_app.config.get('SEEN_POSTS_FILTER_ENABLED', True)
+
+    @staticmethod
+    def get_filter(account_id):
+        """Open the account's filter, mapping it from disk or rebuilding it from PostsSeen"""
+        path = SeenPostsFilterService._filter_path(account_id)
+        bloom = SeenPostsFilterService._mapped(path)
+        if bloom is None:
+            with SeenPostsFilterService._write_lock(path):
+                # Another worker may have built it while we waited for the lock
+                bloom = SeenPostsFilterService._mapped(path) or SeenPostsFilterService._install(
+                    path, SeenPostsFilterService._build(account_id, path)
+                )
+        return bloom
+
+    @staticmethod
+    def rebuild(account_id):
+        """Discard the account's filter and rebuild it from PostsSeen"""
+        path = SeenPostsFilterService._filter_path(account_id)
+        with SeenPostsFilterService._write_lock(path):
+            return SeenPostsFilterService._install(path, SeenPostsFilterService._build(account_id, path))
+
+    @staticmethod
+    def mark_seen(account_id, post_urls):
+        """Record newly inserted posts; grows the filter once it passes its capacity"""
+        path = SeenPostsFilterService._filter_path(account_id)
+        with SeenPostsFilterService._write_lock(path):
+            # Remapped under the lock, so the bits land in the file a rebuild left behind
+            bloom = SeenPostsFilterService._mapped(path) or SeenPostsFilterService._install(
+                path, SeenPostsFilterService._build(account_id, path)
+            )
+            bloom.add_many(canonicalize_post_url(url) for url in post_urls)
+            bloom.flush()
+            if bloom.count > bloom.capacity:
+                SeenPostsFilterService._install(path, SeenPostsFilterService._build(account_id, path))
+
+    @staticmethod
+    def contains_many(account_id, post_urls):
+        """Bulk membership test, one bool per URL in input order"""
+        bloom = SeenPostsFilterService.get_filter(account_id)
+        return bloom.contains_many(canonicalize_post_url(url) for url in post_urls)
+
+    @staticmethod
+    def filter_unseen(account_id, post_urls):
+        """Return only the URLs that are definitely not yet recorded for the account"""
+        seen_flags = SeenPostsFilterService.contains_many(account_id, post_urls)
+        return [url for url, seen in zip(post_urls, seen_flags) if not seen]
+
+    @staticmethod
+    def close_all():
+        with _filters_lock:
+            for bloom in _filters.values():
+                bloom.close()
+            _filters.clear()
+
+    @staticmethod
+    def _mapped(path):
+        """This process's mapping of the filter file, remapped if another worker replaced it; None if there is no file"""
+        with _filters_lock:
+            bloom = _filters.get(path)
+            if bloom is not None and bloom.is_stale():
+                # Another worker rebuilt the filter: drop our mapping of the old file
+                bloom.close()
+                bloom = None
+            if bloom is None:
+                bloom = BloomFilter.load(path)
+                if bloom is not None:
+                    _filters[path] = bloom
+            return bloom
+
+    @staticmethod
+    def _install(path, bloom):
+        with _filters_lock:
+            old = _filters.get(path)
+            if old is not None and old is not bloom:
+                old.close()
+            _filters[path] = bloom
+            return bloom
+
+    @staticmethod
+    @contextmanager
+    def _write_lock(path):
+        """Exclusive lock on the account's filter across processes (and threads, which open their own descriptor)"""
+        with open(f'{path}.lock', 'a+b') as lock_file:
+            if fcntl is None:
+                with _writers_lock:
+                    yield
+                return
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _build(account_id, path):
+        """Build the filter from PostsSeen and rename it into place; callers hold _write_lock"""
+        post_urls = PostsSeenRepository.get_seen_post_urls(account_id)
+        config = current_app.config
+        capacity = max(config.get('SEEN_POSTS_FILTER_CAPACITY', 100_000), 2 * len(post_urls))
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        bloom = BloomFilter.create(
+            capacity,
+            error_rate=config.get('SEEN_POSTS_FILTER_ERROR_RATE', 0.01),
+            path=tmp_path
+        )
+        bloom.add_many(canonicalize_post_url(post_url) for post_url in post_urls)
+        bloom.flush()
+        # The mapping follows the inode, so the built filter stays open under its final name
+        os.replace(tmp_path, path)
+        bloom.path = path
+        return bloom
+
+    @staticmethod
+    def _filter_path(account_id):
+        directory = current_app.config.get('SEEN_POSTS_FILTER_DIR') or os.path.join(
+            current_app.instance_path, 'seen_posts_filters'
+        )
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f'account_{int(account_id)}.bloom')
@@ -1,128 +1,198 @@
-import os
-import asyncio
-from dotenv import load_dotenv
-from browser_use import Agent
-from browser_use.llm import ChatOpenAI
-
-# Load environment variables
-load_dotenv()
-
-# Disable telemetry
-os.environ['ANONYMIZED_TELEMETRY'] = "false"
-
-
-class TwitterLoginService:
-    def __init__(self):
-        # Load credentials from environment variables for security
-        self.credentials = {
-            'x_user': os.getenv('TWITTER_USERNAME'),  # or X_USERNAME
-            'x_pass': os.getenv('TWITTER_PASSWORD')   # or X_PASSWORD
-        }
-        
-        # Validate credentials are loaded
-        if not self.credentials['x_user'] or not self.credentials['x_pass']:
-            raise ValueError(
-                "Twitter credentials not found. Please set TWITTER_USERNAME and TWITTER_PASSWORD in your .env file"
-            )
-        
-        # Initialize LLM
-        self.llm = ChatOpenAI(model='gpt-4o-mini')  # Fixed model name
-    
-    async def login_to_twitter(self):
-        """Login to Twitter/X using browser automation"""
-        
-        # Option 1: Make credentials available for all websites
-        sensitive_data = self.credentials
-        
-        # Option 2: Domain-specific credentials (more secure)
-        # sensitive_data = {
-        #     'https://*.twitter.com': self.credentials,
-        #     'https://*.x.com': self.credentials,
-        #     'https://twitter.com': self.credentials,
-        #     'https://x.com': self.credentials,
-        # }
-        
-        agent = Agent(
-            task='Go to twitter.com (or x.com) and log in with username x_user and password x_pass',
-            sensitive_data=sensitive_data,
-            use_vision=False,  # Disable vision to prevent LLM seeing sensitive data in screenshots
-            llm=self.llm,
-        )
-        
-        try:
-            result = await agent.run()
-            print("✅ Successfully logged into Twitter!")
-            return result
-        except Exception as e:
-            print(f"❌ Failed to login to Twitter: {str(e)}")
-            raise
-    
-    async def login_and_perform_task(self, task_after_login):
-        """Login to Twitter and then perform additional tasks using Chrome"""
-        
-        # Configure browser to use Chrome
-        browser = Browser(
-            browser_type="chromium",
-            headless=False,
-        )
-        
-        sensitive_data = self.credentials
-        
-        full_task = f"""
-        Step 1: Login Process
-        - Navigate to https://x.com/
-        - Click on "Sign in" button
-        - Enter username (x_user) and click "Next"
-        - Enter password (x_pass) and click "Log in"
-        
-        Step 2: After successful login
-        {task_after_login}
-        """
-        
-        agent = Agent(
-            task=full_task,
-            sensitive_data=sensitive_data,
-            browser=browser,  # Use Chrome browser
-            use_vision=False,
-            llm=self.llm,
-        )
-        
-        try:
-            result = await agent.run()
-            print("✅ Successfully completed Twitter login and task!")
-            return result
-        except Exception as e:
-            print(f"❌ Failed to complete Twitter task: {str(e)}")
-            raise
-
-
-async def main():
-    """Example usage of the Twitter login service"""
-    
-    service = TwitterLoginService()
-    
-    try:
-        # Option 1: Just login
-        print("🔐 Logging into Twitter...")
-        await service.login_to_twitter()
-        
-        # Option 2: Login and perform additional task
-        # print("🔐 Logging into Twitter and posting a tweet...")
-        # await service.login_and_perform_task("compose and post a tweet saying 'Hello from browser-use!'")
-        
-        # Option 3: Login and check notifications
-        # print("🔐 Logging into Twitter and checking notifications...")
-        # await service.login_and_perform_task("check my notifications and tell me how many unread notifications I have")
-        
-    except ValueError as e:
-        print(f"❌ Configuration error: {e}")
-        print("💡 Make sure to add these to your .env file:")
-        print("TWITTER_USERNAME=your-username@email.com")
-        print("TWITTER_PASSWORD=your-password")
-        print("OPENAI_API_KEY=your-openai-api-key")
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
+import os
+import asyncio
+from dotenv import load_dotenv
+from browser_use import Agent, Browser
+from browser_use.llm import ChatOpenAI
+from app.agents.macros import LoginMacros
+from app.agents.runners import save_browser_storage_state
+from app.agents.session_cache import BrowserSessionCache, FileSessionStore, SessionCipher, StorageStateFile
+
+# Load environment variables
+load_dotenv()
+
+# Disable telemetry
+os.environ['ANONYMIZED_TELEMETRY'] = "false"
+
+
+class TwitterLoginService:
+    def __init__(self):
+        # Load credentials from environment variables for security
+        self.credentials = {
+            'x_user': os.getenv('TWITTER_USERNAME'),  # or X_USERNAME
+            'x_pass': os.getenv('TWITTER_PASSWORD')   # or X_PASSWORD
+        }
+        
+        # Validate credentials are loaded
+        if not self.credentials['x_user'] or not self.credentials['x_pass']:
+            raise ValueError(
+                "Twitter credentials not found. Please set TWITTER_USERNAME and TWITTER_PASSWORD in your .env file"
+            )
+        
+        # Initialize LLM
+        self.llm = ChatOpenAI(model='gpt-4o-mini')  # Fixed model name
+        
+        # Reuse the logged-in browser state between runs when a cache key is configured
+        cache_key = os.getenv('SESSION_CACHE_KEY')
+        self.session_cache = BrowserSessionCache(
+            FileSessionStore(os.getenv('SESSION_CACHE_DIR', os.path.expanduser('~/.feedwise/sessions'))),
+            SessionCipher(cache_key)
+        ) if cache_key else None
+        
+        # Replay the recorded login click sequence in Playwright; the agent only logs in when it breaks
+        self.login_macros = LoginMacros.from_config({
+            'AGENT_LOGIN_MACROS_ENABLED': os.getenv('AGENT_LOGIN_MACROS_ENABLED', 'true').lower() == 'true',
+            'AGENT_MACRO_DIR': os.getenv('AGENT_MACRO_DIR'),
+        })
+    
+    async def _login_with_macro(self):
+        """Storage state from a macro login, or None if the agent has to log in"""
+        with StorageStateFile() as state_file:
+            outcome = await self.login_macros.login(
+                'twitter', self.credentials['x_user'], self.credentials['x_pass'], state_file.path
+            )
+            print(f"🎬 Login macro: {outcome.path} in {outcome.seconds:.1f}s" + (f" ({outcome.error})" if outcome.error else ""))
+            return state_file.read() if outcome.path == 'macro' else None
+    
+    async def _run_with_session(self, login_steps, task_after_login=None, browser_options=None, **agent_kwargs):
+        """
+        Run an agent from the cached session if one is valid, logging in only when needed.
+
+        Returns (agent history, storage state). The history is None when a
+        login macro logged in and there was no task left for the agent.
+        """
+        cached_state = self.session_cache.get(self.credentials['x_user'], 'twitter') if self.session_cache else None
+        
+        start_state = cached_state
+        if start_state is None and self.login_macros is not None:
+            start_state = await self._login_with_macro()
+            if start_state is not None and not task_after_login:
+                # Logged in without the agent and nothing else to do
+                if self.session_cache:
+                    self.session_cache.put(self.credentials['x_user'], 'twitter', start_state, after_miss=True)
+                return None, start_state
+        
+        if start_state is not None:
+            login_steps = f"""
+        The browser should already be logged in from a previous session.
+        Go to https://x.com/home. Only if a login form appears, log in:
+        {login_steps}
+        """
+        
+        task = login_steps
+        if task_after_login:
+            task = f"""
+        Step 1: Login Process
+        {login_steps}
+        
+        Step 2: After successful login
+        {task_after_login}
+        """
+        
+        with StorageStateFile(start_state) as state_file:
+            browser = Browser(storage_state=state_file.path, **(browser_options or {}))
+            agent = Agent(
+                task=task,
+                sensitive_data=self.credentials,
+                browser=browser,
+                llm=self.llm,
+                **agent_kwargs
+            )
+            result = await agent.run()
+            
+            if start_state is None and not task_after_login and self.login_macros is not None:
+                # A pure agent login: keep its click sequence as the next macro
+                if self.login_macros.learn('twitter', result, self.credentials['x_user'], self.credentials['x_pass'],
+                                           placeholders=self.credentials):
+                    print("🎬 Recorded a new login macro from the agent run")
+            
+            await save_browser_storage_state(browser, state_file.path)
+            storage_state = state_file.read()
+            if self.session_cache:
+                self.session_cache.put(
+                    self.credentials['x_user'], 'twitter', storage_state,
+                    after_miss=cached_state is None
+                )
+                print(f"🍪 Session cache: {self.session_cache.stats()}")
+            return result, storage_state
+    
+    async def login_to_twitter(self):
+        """Login to Twitter/X using browser automation, reusing a cached session when possible.
+
+        Returns the browser-use agent history, or None when a login macro
+        logged in and no agent ran. The logged-in storage state is kept in
+        the session cache when SESSION_CACHE_KEY is set.
+        """
+        
+        # Credentials are exposed to the agent only as the x_user / x_pass placeholders.
+        # Domain-specific credentials (more secure) would look like:
+        # sensitive_data = {
+        #     'https://*.twitter.com': self.credentials,
+        #     'https://*.x.com': self.credentials,
+        #     'https://twitter.com': self.credentials,
+        #     'https://x.com': self.credentials,
+        # }
+        
+        try:
+            result, _ = await self._run_with_session(
+                'Go to twitter.com (or x.com) and log in with username x_user and password x_pass',
+                use_vision=False,  # Disable vision to prevent LLM seeing sensitive data in screenshots
+            )
+            print("✅ Successfully logged into Twitter!")
+            return result
+        except Exception as e:
+            print(f"❌ Failed to login to Twitter: {str(e)}")
+            raise
+    
+    async def login_and_perform_task(self, task_after_login):
+        """Login to Twitter and then perform additional tasks using Chrome"""
+        
+        login_steps = """
+        - Navigate to https://x.com/
+        - Click on "Sign in" button
+        - Enter username (x_user) and click "Next"
+        - Enter password (x_pass) and click "Log in"
+        """
+        
+        try:
+            result, _ = await self._run_with_session(
+                login_steps,
+                task_after_login,
+                browser_options={'headless': False},  # Use Chrome browser
+                use_vision=False,
+            )
+            print("✅ Successfully completed Twitter login and task!")
+            return result
+        except Exception as e:
+            print(f"❌ Failed to complete Twitter task: {str(e)}")
+            raise
+
+async def main():
+    """Example usage of the Twitter login service"""
+    
+    service = TwitterLoginService()
+    
+    try:
+        # Option 1: Just login
+        print("🔐 Logging into Twitter...")
+        await service.login_to_twitter()
+        
+        # Option 2: Login and perform additional task
+        # print("🔐 Logging into Twitter and posting a tweet...")
+        # await service.login_and_perform_task("compose and post a tweet saying 'Hello from browser-use!'")
+        
+        # Option 3: Login and check notifications
+        # print("🔐 Logging into Twitter and checking notifications...")
+        # await service.login_and_perform_task("check my notifications and tell me how many unread notifications I have")
+        
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        print("💡 Make sure to add these to your .env file:")
+        print("TWITTER_USERNAME=your-username@email.com")
+        print("TWITTER_PASSWORD=your-password")
+        print("OPENAI_API_KEY=your-openai-api-key")
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
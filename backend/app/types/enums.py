@@ -12,6 +12,7 @@ class PostStatus(Enum):
     LIKED = "liked"
     DISLIKED = "disliked"
     SAVED = "saved"
+    NEUTRAL = "neutral"
     NOT_SEEN = "not_seen"
 
 class SentimentFilter(Enum):
@@ -24,3 +25,13 @@ class FollowStatus(Enum):
     PENDING = "pending"      # Not yet decided
     FOLLOWED = "followed"    # User chose to follow
     SKIPPED = "skipped"      # User chose not to follow
+
+class AgentJobType(Enum):
+    FEED_OPTIMIZATION = "feed_optimization"
+
+class AgentJobStatus(Enum):
+    QUEUED = "queued"          # Waiting for a worker (or for its retry backoff to pass)
+    RUNNING = "running"        # Claimed by a worker holding a live lease
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"          # Out of retry attempts
+    CANCELLED = "cancelled"
@@ -0,0 +1,171 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+_HEADER = struct.Struct('<8sQIIQ')  # magic, num_bits, num_hashes, capacity, count
+# Bumped when canonicalize_post_url changes, so filters hashed the old way are rebuilt
+_MAGIC = b'FWBLOOM2'
+
+# Share/tracking query parameters; every other parameter may identify the post
+# (YouTube ?v=, Facebook permalink.php?story_fbid=&id=, photo.php?fbid=)
+TRACKING_QUERY_PARAMS = frozenset({
+    'igshid', 'igsh', 'img_index', 'si', 'fbclid', 'gclid', 'mibextid', 'ref', 'ref_src', 'ref_url',
+    's', 't', 'feature', '__cft__', '__tn__',
+})
+
+
+def post_query(query):
+    """The query string with tracking parameters dropped and the rest sorted"""
+    params = [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if key not in TRACKING_QUERY_PARAMS and not key.startswith('utm_')
+    ]
+    return urlencode(sorted(params))
+
+
+def canonicalize_post_url(url):
+    """Normalize a post URL so trivially different links hash the same.
+
+    Scheme, fragment, tracking query parameters, a leading "www." / "m."
+    and trailing slashes are dropped; the host is lowercased. The path
+    keeps its case because post shortcodes are case sensitive, and the
+    remaining query parameters are kept because on some platforms they
+    are the post id.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    for prefix in ('www.', 'm.', 'mobile.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path.rstrip('/')
+    query = post_query(parts.query)
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, optionally backed by a memory-mapped file.
+
+    Uses double hashing over one 128-bit BLAKE2b digest per item, so the cost
+    of add/contains is a single hash plus num_hashes bit probes.
+
+    add_many read-modify-writes bytes and the header count under a thread
+    lock only; when several processes map the same file, callers must
+    serialize writes themselves (SeenPostsFilterService holds a flock).
+    """
+
+    def __init__(self, num_bits, num_hashes, capacity, path=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.capacity = capacity
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._identity = None
+        size = _HEADER.size + (num_bits + 7) // 8
+
+        if path is None:
+            self._buffer = bytearray(size)
+            _HEADER.pack_into(self._buffer, 0, _MAGIC, num_bits, num_hashes, capacity, 0)
+            return
+
+        exists = os.path.exists(path) and os.path.getsize(path) == size
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if not exists:
+            self._file.truncate(size)
+        self._buffer = mmap.mmap(self._file.fileno(), size)
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        if not exists:
+            _HEADER.pack_into(self._buffer, 0, _MAGIC, num_bits, num_hashes, capacity, 0)
+
+    @staticmethod
+    def optimal_parameters(capacity, error_rate):
+        """Bits and hash count for the given capacity and false positive rate"""
+        capacity = max(1, capacity)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    @classmethod
+    def create(cls, capacity, error_rate=0.01, path=None):
+        if path and os.path.exists(path):
+            os.remove(path)
+        num_bits, num_hashes = cls.optimal_parameters(capacity, error_rate)
+        return cls(num_bits, num_hashes, capacity, path=path)
+
+    @classmethod
+    def load(cls, path):
+        """Map an existing filter file; returns None if it is missing or corrupt"""
+        if not os.path.exists(path) or os.path.getsize(path) < _HEADER.size:
+            return None
+        with open(path, 'rb') as f:
+            magic, num_bits, num_hashes, capacity, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or os.path.getsize(path) != _HEADER.size + (num_bits + 7) // 8:
+            return None
+        return cls(num_bits, num_hashes, capacity, path=path)
+
+    def is_stale(self):
+        """True once the file at self.path was replaced or removed since this filter mapped it"""
+        if self._file is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    @property
+    def count(self):
+        return _HEADER.unpack_from(self._buffer, 0)[4]
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        self.add_many([item])
+
+    def add_many(self, items):
+        buffer = self._buffer
+        offset = _HEADER.size
+        added = 0
+        with self._lock:
+            for item in items:
+                new_bit = False
+                for position in self._positions(item):
+                    index = offset + (position >> 3)
+                    mask = 1 << (position & 7)
+                    if not buffer[index] & mask:
+                        buffer[index] |= mask
+                        new_bit = True
+                added += new_bit
+            if added:
+                _HEADER.pack_into(buffer, 0, _MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count + added)
+        return added
+
+    def __contains__(self, item):
+        buffer = self._buffer
+        offset = _HEADER.size
+        return all(buffer[offset + (p >> 3)] & (1 << (p & 7)) for p in self._positions(item))
+
+    def contains_many(self, items):
+        return [item in self for item in items]
+
+    def flush(self):
+        if self._file is not None:
+            self._buffer.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._buffer.flush()
+            self._buffer.close()
+            self._file.close()
+            self._file = None
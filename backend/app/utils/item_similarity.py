@@ -0,0 +1,144 @@
+"""
+Incremental item-item similarity over follow decisions.
+
+Conceptually a sparse accounts x handles matrix R with +1 for FOLLOWED and
+-1 for SKIPPED (PENDING is an empty cell). The model keeps, per handle,
+its squared norm and a sparse row of dot products / co-rater counts with
+every handle it shares a rater with, i.e. the non-zeros of R^T R. Changing
+one cell only touches the rows of the handles that account already rated,
+so follow decisions are folded in without recomputing anything else.
+
+Similarity is cosine over the two handles' rating vectors, ignoring pairs
+with fewer than min_support co-raters.
+"""
+import heapq
+import math
+import threading
+
+
+class ItemSimilarityModel:
+    def __init__(self, min_support=2):
+        self.min_support = min_support
+        self._item_ids = {}       # handle key -> item id
+        self._handles = []        # item id -> display handle
+        self._norms = []          # item id -> sum of squared ratings
+        self._pairs = []          # item id -> {other item id: [dot, co-raters]}
+        self._ratings = {}        # account id -> {item id: rating}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def handle_key(handle):
+        return handle.strip().lstrip('@').casefold()
+
+    def _item_id(self, handle):
+        key = self.handle_key(handle)
+        item_id = self._item_ids.get(key)
+        if item_id is None:
+            item_id = len(self._handles)
+            self._item_ids[key] = item_id
+            self._handles.append(handle)
+            self._norms.append(0)
+            self._pairs.append({})
+        return item_id
+
+    def set_rating(self, account_id, handle, rating):
+        """Set one cell of R (rating +1, -1, or 0 to clear it), updating only the affected rows"""
+        with self._lock:
+            item = self._item_id(handle)
+            rated = self._ratings.get(account_id, {})
+            old = rated.get(item, 0)
+            if old == rating:
+                return
+            self._ratings[account_id] = rated
+            delta = rating - old
+            self._norms[item] += rating * rating - old * old
+            pairs = self._pairs[item]
+            support_change = (rating != 0) - (old != 0)
+            for other, other_rating in rated.items():
+                if other == item:
+                    continue
+                entry = pairs.get(other)
+                if entry is None:
+                    entry = pairs[other] = [0, 0]
+                    self._pairs[other][item] = entry   # both rows share one [dot, count] cell
+                entry[0] += delta * other_rating
+                entry[1] += support_change
+                if entry[1] <= 0:
+                    del pairs[other]
+                    del self._pairs[other][item]
+            if rating:
+                rated[item] = rating
+            else:
+                del rated[item]
+                if not rated:
+                    del self._ratings[account_id]
+
+    def set_ratings(self, ratings):
+        """Fold many (account_id, handle, rating) changes"""
+        with self._lock:
+            for account_id, handle, rating in ratings:
+                self.set_rating(account_id, handle, rating)
+
+    def account_ratings(self, account_id):
+        """The account's non-empty cells as {handle: rating}"""
+        with self._lock:
+            return {self._handles[item]: rating for item, rating in self._ratings.get(account_id, {}).items()}
+
+    def similarity(self, handle_a, handle_b):
+        with self._lock:
+            a = self._item_ids.get(self.handle_key(handle_a))
+            b = self._item_ids.get(self.handle_key(handle_b))
+            if a is None or b is None:
+                return 0.0
+            entry = self._pairs[a].get(b)
+            if entry is None or entry[1] < self.min_support:
+                return 0.0
+            return entry[0] / math.sqrt(self._norms[a] * self._norms[b])
+
+    def score(self, seeds, k=10, exclude=()):
+        """
+        Top-k handles most similar to the weighted seed handles.
+
+        seeds maps handle -> weight; returns [(handle, score, strongest seed)]
+        with positive scores only, never including a seed or an excluded handle.
+        """
+        with self._lock:
+            excluded = {self.handle_key(handle) for handle in exclude}
+            seed_items = {}
+            for handle, weight in seeds.items():
+                item = self._item_ids.get(self.handle_key(handle))
+                if item is not None:
+                    seed_items[item] = weight
+
+            scores = {}
+            best_seed = {}
+            for seed, weight in seed_items.items():
+                seed_norm = self._norms[seed]
+                if not seed_norm:
+                    continue
+                for other, (dot, support) in self._pairs[seed].items():
+                    if support < self.min_support or other in seed_items or not dot:
+                        continue
+                    contribution = weight * dot / math.sqrt(seed_norm * self._norms[other])
+                    scores[other] = scores.get(other, 0.0) + contribution
+                    if contribution > best_seed.get(other, (0.0, None))[0]:
+                        best_seed[other] = (contribution, seed)
+
+            candidates = (
+                (score, item) for item, score in scores.items()
+                if score > 0 and self.handle_key(self._handles[item]) not in excluded
+            )
+            top = heapq.nlargest(k, candidates)
+            return [
+                (self._handles[item], score, self._handles[best_seed[item][1]])
+                for score, item in top
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'accounts': len(self._ratings),
+                'handles': len(self._handles),
+                'ratings': sum(len(rated) for rated in self._ratings.values()),
+                'pairs': sum(len(pairs) for pairs in self._pairs) // 2,
+            }
@@ -0,0 +1,48 @@
+"""
+Flask JSON provider backed by orjson.
+
+Drop-in for Flask's DefaultJSONProvider: same sort_keys / compact /
+debug-indent behaviour and the same fallbacks for dates, UUIDs,
+dataclasses and __html__ objects (via DefaultJSONProvider.default). orjson
+is optional; without it, or for payloads it cannot encode, the stdlib
+encoder is used.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def _orjson_option(self, indent=False):
+        # Let Flask's default() format datetimes/dataclasses exactly like the stdlib provider does
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _encode(self, obj, indent=False):
+        """UTF-8 JSON bytes, or None when orjson is unavailable or cannot encode obj"""
+        if orjson is None:
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option(indent))
+        except (orjson.JSONEncodeError, TypeError):
+            return None
+
+    def dumps(self, obj, **kwargs):
+        # Explicit json.dumps kwargs (cls=, separators=, ...) need the stdlib encoder
+        encoded = None if kwargs else self._encode(obj)
+        return encoded.decode('utf-8') if encoded is not None else super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        encoded = self._encode(obj, indent=indent)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,137 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters and histograms are keyed by (name, label values) and guarded by
+one lock; render() writes the text format (version 0.0.4) that Prometheus
+scrapes. Collectors are callables returning extra samples at render time,
+so components that already keep their own counters (caches) are read only
+when /metrics is scraped.
+"""
+import math
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(upper bound, cumulative count)] ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._help = {}          # name -> (type, help)
+        self._counters = {}      # name -> {label items: value}
+        self._histograms = {}    # name -> {label items: Histogram}
+        self._buckets = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        self._help[name] = ('counter', help_text)
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self._help[name] = ('histogram', help_text)
+        self._histograms.setdefault(name, {})
+        self._buckets[name] = buckets
+
+    def inc(self, name, labels=None, amount=1):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, labels=None):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets[name])
+            histogram.observe(value)
+
+    def add_collector(self, collector):
+        """collector() -> [(name, type, help, [(labels dict, value)])], called on every render"""
+        self._collectors.append(collector)
+
+    def snapshot(self, name):
+        """{label items: value or (sum, count)} for one metric"""
+        with self._lock:
+            if name in self._counters:
+                return dict(self._counters[name])
+            return {key: (h.sum, h.count) for key, h in self._histograms.get(name, {}).items()}
+
+    def reset(self):
+        with self._lock:
+            for series in self._counters.values():
+                series.clear()
+            for series in self._histograms.values():
+                series.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._help.items()):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == 'counter':
+                    for key, value in sorted(self._counters[name].items()):
+                        lines.append(f"{name}{_labels(key)} {_number(value)}")
+                    continue
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for bound, count in histogram.cumulative():
+                        le = '+Inf' if bound == math.inf else _number(bound)
+                        lines.append(f"{name}_bucket{_labels(key + (('le', le),))} {count}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+            collectors = list(self._collectors)
+
+        for collector in collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(items):
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
@@ -0,0 +1,61 @@
+import json
+
+def iter_ndjson(stream, chunk_size=64 * 1024, max_line_bytes=64 * 1024):
+    """Incrementally parse an NDJSON byte stream.
+
+    Yields (line_number, record, error) tuples, where exactly one of record
+    and error is set. Blank lines are skipped. At most one chunk plus one
+    line is held in memory, so arbitrarily large uploads stay flat.
+    """
+    buffer = b''
+    line_number = 0
+    oversized = False
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+
+        # Walk the lines by offset and cut the buffer once per chunk, not once per line
+        start = 0
+        while True:
+            newline = buffer.find(b'\n', start)
+            if newline == -1:
+                break
+            line = buffer[start:newline]
+            start = newline + 1
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None, f"Line exceeds {max_line_bytes} bytes"
+                continue
+            result = _parse_line(line, line_number)
+            if result:
+                yield result
+        buffer = buffer[start:]
+
+        if len(buffer) > max_line_bytes:
+            # Drop the partial line and skip ahead to the next newline
+            buffer = b''
+            oversized = True
+
+    if oversized:
+        yield line_number + 1, None, f"Line exceeds {max_line_bytes} bytes"
+    elif buffer:
+        result = _parse_line(buffer, line_number + 1)
+        if result:
+            yield result
+
+
+def _parse_line(line, line_number):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return line_number, None, f"Invalid JSON: {e}"
+    if not isinstance(record, dict):
+        return line_number, None, "Each line must be a JSON object"
+    return line_number, record, None
@@ -0,0 +1,135 @@
+"""
+In-memory recommendation catalog.
+
+The catalog file maps platform -> interest -> handles with a relevance
+score. On load it is turned into an inverted index
+(platform, interest) -> handles ranked by score, so a request only does
+one dict lookup per interest, a merge of a few short lists and a top-k.
+"""
+import heapq
+import json
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    handle: str
+    reason: str
+    score: float
+
+
+def normalize_handle(handle):
+    handle = handle.strip()
+    return handle if handle.startswith('@') else f'@{handle}'
+
+
+def normalize_interest(interest):
+    return ' '.join(interest.split()).lower()
+
+
+class RecommendationCatalog:
+    def __init__(self, index, defaults=None, per_interest=2, total=5, path=None, mtime=None):
+        self.index = index
+        self.defaults = defaults or {}
+        self.per_interest = per_interest
+        self.total = total
+        self.path = path
+        self.mtime = mtime
+
+    @classmethod
+    def from_dict(cls, data, path=None, mtime=None):
+        """Build the index from the catalog document; raises ValueError on malformed entries"""
+        def ranked(entries, where):
+            parsed = {}
+            for entry in entries:
+                try:
+                    handle = normalize_handle(entry['handle'])
+                    item = CatalogEntry(handle, entry.get('reason', ''), float(entry.get('score', 0.0)))
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    raise ValueError(f"Invalid catalog entry under {where}: {entry!r}")
+                # A handle listed twice under one interest keeps its best score
+                key = handle.casefold()
+                if key not in parsed or item.score > parsed[key].score:
+                    parsed[key] = item
+            return tuple(sorted(parsed.values(), key=lambda item: -item.score))
+
+        raw = {}
+        defaults = {}
+        for platform, platform_data in data.get('platforms', {}).items():
+            platform = platform.lower()
+            for interest, entries in platform_data.get('interests', {}).items():
+                raw.setdefault((platform, normalize_interest(interest)), []).extend(entries)
+            defaults[platform] = ranked(platform_data.get('defaults', []), f"{platform}/defaults")
+        index = {key: ranked(entries, '/'.join(key)) for key, entries in raw.items()}
+
+        limits = data.get('limits', {})
+        return cls(
+            index,
+            defaults=defaults,
+            per_interest=int(limits.get('per_interest', 2)),
+            total=int(limits.get('total', 5)),
+            path=path,
+            mtime=mtime
+        )
+
+    @classmethod
+    def load(cls, path):
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), path=path, mtime=mtime)
+
+    def is_stale(self):
+        """True when the backing file changed since this catalog was loaded"""
+        if self.path is None:
+            return False
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except OSError:
+            return False
+
+    def recommend(self, platform, interests, per_interest=None, k=None):
+        """
+        Top-k handles for the interests on a platform.
+
+        Each interest contributes its best per_interest handles; a handle
+        matched by several interests is returned once, with the scores
+        summed and the reason of its strongest interest. Falls back to the
+        platform defaults when no interest is in the catalog.
+        """
+        platform = (platform or '').lower()
+        per_interest = self.per_interest if per_interest is None else per_interest
+        k = self.total if k is None else k
+
+        merged = {}
+        for interest in interests or []:
+            for entry in self.index.get((platform, normalize_interest(interest)), ())[:per_interest]:
+                key = entry.handle.casefold()
+                current = merged.get(key)
+                if current is None:
+                    # [total score, best score, best entry, first-seen order]
+                    merged[key] = [entry.score, entry.score, entry, len(merged)]
+                else:
+                    current[0] += entry.score
+                    if entry.score > current[1]:
+                        current[1], current[2] = entry.score, entry
+
+        if not merged:
+            return [
+                {'recommended_user': entry.handle, 'reason': entry.reason, 'score': entry.score}
+                for entry in self.defaults.get(platform, ())[:k]
+            ]
+
+        top = heapq.nlargest(k, merged.values(), key=lambda item: (item[0], -item[3]))
+        return [
+            {'recommended_user': entry.handle, 'reason': entry.reason, 'score': round(total, 4)}
+            for total, _, entry, _ in top
+        ]
+
+    def stats(self):
+        platforms = {platform for platform, _ in self.index} | set(self.defaults)
+        return {
+            'platforms': len(platforms),
+            'interests': len(self.index),
+            'handles': sum(len(entries) for entries in self.index.values()),
+        }
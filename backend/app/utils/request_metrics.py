@@ -0,0 +1,147 @@
+"""
+Per-request SQL and latency instrumentation.
+
+init_request_metrics() installs nothing unless METRICS_ENABLED is set, so
+a disabled deployment carries no request or engine hooks at all. When
+enabled it:
+
+- times every statement with before/after_cursor_execute on each engine
+  and charges it to the current request (statements issued outside a
+  request, e.g. by the agent workers, are ignored);
+- records per route, method and onboarding step: request count by
+  status, latency, statements per request and SQL time per request;
+- logs likely N+1 patterns, i.e. the same SELECT issued
+  METRICS_N_PLUS_ONE_THRESHOLD or more times by one request.
+"""
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.utils.metrics import COUNT_BUCKETS, LATENCY_BUCKETS, MetricsRegistry
+
+registry = MetricsRegistry()
+registry.counter('feedwise_http_requests_total', 'HTTP requests by route, method, step and status')
+registry.histogram('feedwise_http_request_duration_seconds', 'Request latency', LATENCY_BUCKETS)
+registry.histogram('feedwise_sql_statements_per_request', 'SQL statements issued per request', COUNT_BUCKETS)
+registry.histogram('feedwise_sql_seconds_per_request', 'Time spent in SQL per request', LATENCY_BUCKETS)
+registry.counter('feedwise_sql_statements_total', 'SQL statements issued while serving requests')
+registry.counter('feedwise_n_plus_one_total', 'Requests that repeated one SELECT at least the N+1 threshold')
+
+_QUERY_START = '_metrics_query_start'
+
+
+class RequestSQL:
+    """Statements charged to the current request"""
+    __slots__ = ('statements', 'seconds', 'texts')
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.texts = Counter()
+
+
+def init_request_metrics(app, engines):
+    """Install request and SQL hooks when METRICS_ENABLED is set"""
+    if not app.config.get('METRICS_ENABLED', False):
+        return False
+    for engine in engines.values():
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    return True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_QUERY_START].pop()
+    stats = g.get('_request_sql') if has_request_context() else None
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.seconds += elapsed
+    stats.texts[statement] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_QUERY_START):
+        connection.info[_QUERY_START].pop()
+
+
+def _start_request():
+    g._request_started = time.perf_counter()
+    g._request_sql = RequestSQL()
+
+
+def _finish_request(response):
+    started = g.pop('_request_started', None)
+    stats = g.pop('_request_sql', None)
+    if started is None or stats is None:
+        return response
+
+    step = request.args.get('step', '')
+    labels = {
+        'route': request.url_rule.rule if request.url_rule is not None else 'unmatched',
+        'method': request.method,
+        'step': step if step.isdigit() else '',
+    }
+    registry.inc('feedwise_http_requests_total', {**labels, 'status': str(response.status_code)})
+    registry.observe('feedwise_http_request_duration_seconds', time.perf_counter() - started, labels)
+    registry.observe('feedwise_sql_statements_per_request', stats.statements, labels)
+    registry.observe('feedwise_sql_seconds_per_request', stats.seconds, labels)
+    if stats.statements:
+        registry.inc('feedwise_sql_statements_total', labels, stats.statements)
+
+    threshold = current_app.config.get('METRICS_N_PLUS_ONE_THRESHOLD', 5)
+    repeated = [
+        (count, statement) for statement, count in stats.texts.items()
+        if count >= threshold and statement.lstrip()[:6].upper() == 'SELECT'
+    ]
+    if repeated:
+        registry.inc('feedwise_n_plus_one_total', labels)
+        count, statement = max(repeated)
+        current_app.logger.warning(
+            "Possible N+1: %s %s step=%s ran the same SELECT %d times: %s",
+            labels['method'], labels['route'], labels['step'] or '-', count, ' '.join(statement.split())[:200]
+        )
+    return response
+
+
+def _cache_samples():
+    """Hit/miss/size counters the caches already keep, read at scrape time"""
+    from app.db.repository import account_cache
+    from app.services.response_cache_service import ResponseCacheService
+
+    accounts = account_cache.stats()
+    responses = ResponseCacheService.stats()
+    return [
+        ('feedwise_cache_hits_total', 'counter', 'Cache hits', [
+            ({'cache': 'account_request'}, accounts['request_hits']),
+            ({'cache': 'account_process'}, accounts['process_hits']),
+            ({'cache': 'response'}, responses['hits']),
+        ]),
+        ('feedwise_cache_misses_total', 'counter', 'Cache misses', [
+            ({'cache': 'account'}, accounts['misses']),
+            ({'cache': 'response'}, responses['misses']),
+        ]),
+        ('feedwise_cache_entries', 'gauge', 'Entries held in process-wide caches', [
+            ({'cache': 'account'}, accounts['process_entries']),
+            ({'cache': 'response'}, responses['entries']),
+        ]),
+    ]
+
+
+registry.add_collector(_cache_samples)
+
+
+def render():
+    return registry.render()
@@ -0,0 +1,73 @@
+"""
+Server-side cache of rendered onboarding responses.
+
+Entries are keyed by (account_id, step, query args) and tagged with the
+account's change counter (AccountVersion) at render time. A lookup only
+hits when the stored version equals the current one, so a write that bumps
+the counter makes older entries unreachable even in processes that never
+saw the write; invalidate_account() just frees them early in this one.
+"""
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Thread-safe LRU of key -> (version, status, body bytes)"""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._keys_by_account = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key, version, status, body):
+        with self._lock:
+            self._entries[key] = (version, status, body)
+            self._entries.move_to_end(key)
+            self._keys_by_account.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_account(self, account_id):
+        with self._lock:
+            for key in list(self._keys_by_account.get(account_id, ())):
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_account.clear()
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        keys = self._keys_by_account.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_account[key[0]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
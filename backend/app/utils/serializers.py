@@ -0,0 +1,68 @@
+"""
+Precompiled response serializers for ORM models.
+
+Each serializer resolves its attribute list once into a single
+operator.attrgetter, so serializing an instance is one C-level attribute
+fetch plus a converter per field, instead of a hand-built dict with
+inline conditionals at every call site.
+"""
+from operator import attrgetter
+
+
+def enum_value(value):
+    return value.value if value is not None else None
+
+
+def isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def list_or_empty(value):
+    return list(value) if value else []
+
+
+class ModelSerializer:
+    """fields: attribute names, or (key, converter) / (key, attribute, converter) tuples"""
+
+    def __init__(self, *fields):
+        specs = []
+        for field in fields:
+            if isinstance(field, str):
+                field = (field, field, None)
+            elif len(field) == 2:
+                field = (field[0], field[0], field[1])
+            specs.append(tuple(field))
+        self.fields = tuple(specs)
+        self.keys = tuple(key for key, _, _ in specs)
+        self._converters = tuple(converter for _, _, converter in specs)
+        self._plain = all(converter is None for converter in self._converters)
+        get = attrgetter(*(attribute for _, attribute, _ in specs))
+        # attrgetter with one name returns the bare value; keep the tuple shape
+        self._get = get if len(specs) > 1 else (lambda obj: (get(obj),))
+
+    def __call__(self, obj):
+        values = self._get(obj)
+        if self._plain:
+            return dict(zip(self.keys, values))
+        return {
+            key: value if convert is None else convert(value)
+            for key, value, convert in zip(self.keys, values, self._converters)
+        }
+
+    def many(self, objs):
+        return [self(obj) for obj in objs]
+
+    def extend(self, *fields):
+        """A new serializer with this one's fields followed by extra ones"""
+        return ModelSerializer(*self.fields, *fields)
+
+
+# Onboarding response shapes
+ACCOUNT_SUMMARY = ModelSerializer('id', 'username', ('platform', enum_value), ('created_at', isoformat))
+ACCOUNT_PROFILE = ModelSerializer(
+    'id', 'username', ('platform', enum_value), ('interests', list_or_empty),
+    ('sentiment_filter', enum_value), 'noise_blocker_enabled'
+)
+ACCOUNT_DETAIL = ACCOUNT_PROFILE.extend(('created_at', isoformat))
+RECOMMENDATION = ModelSerializer('id', 'recommended_user', 'reason', ('follow_status', enum_value))
+RECOMMENDATION_STATUS = ModelSerializer('id', 'recommended_user', ('follow_status', enum_value))
@@ -0,0 +1,86 @@
+"""
+Benchmark: Account SELECTs per onboarding request with and without the cache
+
+Runs the onboarding flow (create, preferences PUT, step 2, step 3 x3)
+for N accounts through the test client, counting statements that read
+the account table per request type, first with ACCOUNT_CACHE_ENABLED off
+and then on, and reports the cache hit rate.
+
+Usage: python -m benchmarks.account_cache [accounts]
+"""
+import re
+import sys
+from collections import Counter
+
+from sqlalchemy import event
+
+from benchmarks.common import make_bench_app, remove_bench_db
+
+ACCOUNT_SELECT = re.compile(r'^\s*SELECT\b.*\bFROM account\b', re.IGNORECASE | re.DOTALL)
+
+
+def run_flow(app, accounts, prefix):
+    from app.db.database import db
+
+    selects = Counter()
+    current = {'step': None}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if ACCOUNT_SELECT.search(statement):
+            selects[current['step']] += 1
+
+    client = app.test_client()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        for i in range(accounts):
+            current['step'] = 'create'
+            account_id = client.post('/api/onboarding/?step=0', json={
+                'username': f'{prefix}_{i}', 'password': 'benchpass', 'platform': 'instagram'
+            }).get_json()['account']['id']
+            current['step'] = 'preferences'
+            client.put('/api/onboarding/update', json={
+                'type': 'preferences', 'account_id': account_id,
+                'data': {'interests': ['fitness', 'technology']}
+            })
+            current['step'] = 'step 2'
+            client.get(f'/api/onboarding/?step=2&account_id={account_id}')
+            current['step'] = 'step 3'
+            for _ in range(3):
+                client.get(f'/api/onboarding/?step=3&account_id={account_id}')
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    per_request = {'create': 1, 'preferences': 1, 'step 2': 1, 'step 3': 3}
+    return {step: selects[step] / (accounts * calls) for step, calls in per_request.items()}
+
+
+def run(accounts=200):
+    app, db_path = make_bench_app()
+    from app.db.repository import account_cache
+
+    app.config['ACCOUNT_CACHE_ENABLED'] = False
+    uncached = run_flow(app, accounts, 'nocache')
+
+    app.config['ACCOUNT_CACHE_ENABLED'] = True
+    account_cache.clear()
+    before = account_cache.stats()
+    cached = run_flow(app, accounts, 'cache')
+    after = account_cache.stats()
+    remove_bench_db(app, db_path)
+
+    print(f"Account SELECTs per request ({accounts} accounts):")
+    print(f"  {'request':<12} {'no cache':>9} {'cache':>9}")
+    for step in uncached:
+        print(f"  {step:<12} {uncached[step]:>9.2f} {cached[step]:>9.2f}")
+    hits = (after['request_hits'] - before['request_hits']) + (after['process_hits'] - before['process_hits'])
+    lookups = hits + after['misses'] - before['misses']
+    print(f"Cache hit rate: {hits / max(1, lookups):.0%} "
+          f"(request map {after['request_hits'] - before['request_hits']}, "
+          f"process LRU {after['process_hits'] - before['process_hits']}, "
+          f"misses {after['misses'] - before['misses']})")
+    return uncached, cached
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,111 @@
+"""
+Benchmark: wall-clock of sequential vs. orchestrated (parallel) agent runs
+
+Simulates agent runs for 1 to 8 interests, with every agent step a
+fixed-cost sleep (STEP_SECONDS stands in for ~4 s of LLM call plus
+browser action). The sequential run is one agent doing login, the feed
+pass and every interest in turn. The parallel run goes through the real
+FeedOptimizationOrchestrator: one login, then the same subtasks, each
+paying BROWSER_START_STEPS to start a browser from the saved session, at
+concurrency caps 2, 3 and 4. Both do the same agent work, so the gap is
+what the fan-out buys. Ends with a run where one interest always fails,
+to show the other subtasks' results survive.
+
+Usage: python -m benchmarks.agent_orchestration [step_ms]
+"""
+import asyncio
+import sys
+import time
+
+from app.agents.orchestrator import FeedOptimizationOrchestrator, plan_subtasks
+from app.agents.runners import AgentRunContext
+
+INTERESTS = ['fitness', 'technology', 'cooking', 'travel', 'photography', 'music', 'finance', 'gaming']
+POSTS_TO_OPTIMIZE = 50
+LOGIN_STEPS = 6
+RESEARCH_STEPS = 6          # searching for and following accounts, per interest
+BROWSER_START_STEPS = 1     # starting a browser from the saved session, per subtask
+SECONDS_PER_REAL_STEP = 4.0
+
+
+def subtask_steps(subtask):
+    # Roughly one step per two posts, plus the research an interest needs
+    steps = subtask.posts_to_optimize // 2 + 2
+    return steps + (RESEARCH_STEPS if subtask.kind == 'interest' else 0)
+
+
+def subtask_result(subtask):
+    topic = subtask.name if subtask.kind == 'interest' else 'feed'
+    return {
+        'interests_processed': [subtask.name] if subtask.kind == 'interest' else [],
+        'actions_taken': [{'topic': topic, 'action_taken': 'liked', 'posts_affected': subtask.posts_to_optimize}],
+        'feed_relevance_score': 70,
+        'recommendations_for_future': [f'Keep engaging with {topic}'],
+    }
+
+
+def make_context(interests):
+    return AgentRunContext(
+        job_id=1, account_id=1, username='bench', password='benchpass', platform='instagram',
+        interests=interests, payload={'posts_to_optimize': POSTS_TO_OPTIMIZE}
+    )
+
+
+async def run_sequential(context, step_seconds):
+    steps = LOGIN_STEPS + sum(subtask_steps(s) for s in plan_subtasks(context.interests, POSTS_TO_OPTIMIZE))
+    await asyncio.sleep(steps * step_seconds)
+    return steps
+
+
+async def run_parallel(context, step_seconds, concurrency, failing=()):
+    attempts = {}
+
+    async def login(context):
+        await asyncio.sleep(LOGIN_STEPS * step_seconds)
+        return {'cookies': []}
+
+    async def run_subtask(context, subtask, session):
+        attempts[subtask.name] = attempts.get(subtask.name, 0) + 1
+        await asyncio.sleep((BROWSER_START_STEPS + subtask_steps(subtask)) * step_seconds)
+        if subtask.name in failing:
+            raise RuntimeError(f"simulated failure in {subtask.name}")
+        return subtask_result(subtask)
+
+    orchestrator = FeedOptimizationOrchestrator(login, run_subtask, concurrency=concurrency)
+    return await orchestrator.run(context), attempts
+
+
+def timed(coroutine):
+    start = time.perf_counter()
+    value = asyncio.run(coroutine)
+    return time.perf_counter() - start, value
+
+
+def run(step_ms=20):
+    step_seconds = step_ms / 1000
+    scale = SECONDS_PER_REAL_STEP / step_seconds
+    caps = (2, 3, 4)
+
+    print(f"Simulated agent runs ({step_ms} ms per step, shown as real seconds at {SECONDS_PER_REAL_STEP:.0f} s/step):")
+    print(f"  {'interests':>9} {'sequential':>11} " + ' '.join(f"{f'cap={cap}':>14}" for cap in caps))
+    for count in (1, 2, 4, 8):
+        context = make_context(INTERESTS[:count])
+        sequential, _ = timed(run_sequential(context, step_seconds))
+        cells = []
+        for cap in caps:
+            parallel, _ = timed(run_parallel(context, step_seconds, cap))
+            cells.append(f"{parallel * scale:>6.0f}s {sequential / parallel:>5.2f}x")
+        print(f"  {count:>9} {sequential * scale:>10.0f}s " + ' '.join(f"{cell:>14}" for cell in cells))
+
+    context = make_context(INTERESTS[:4])
+    _, (result, attempts) = timed(run_parallel(context, step_seconds, 3, failing={'cooking'}))
+    print("Failure isolation (4 interests, 'cooking' always fails):")
+    print(f"  interests_processed: {', '.join(result['interests_processed'])}")
+    print(f"  failed_subtasks: {result['failed_subtasks']}")
+    print(f"  attempts at 'cooking': {attempts['cooking']}, posts affected: "
+          f"{sum(action['posts_affected'] for action in result['actions_taken'])}")
+    return result
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,104 @@
+"""
+Shared helpers for backend benchmarks
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+def bench_db_path():
+    """A fresh path for a throwaway SQLite file"""
+    fd, db_path = tempfile.mkstemp(prefix='feedwise-bench-', suffix='.db')
+    os.close(fd)
+    os.remove(db_path)
+    return db_path
+
+
+def make_bench_app(db_path=None, **config):
+    """Create an app bound to a throwaway SQLite file; keyword arguments override Config settings"""
+    if db_path is None:
+        db_path = bench_db_path()
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import create_app
+    from app.config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+    for key, value in config.items():
+        setattr(Config, key, value)
+
+    return create_app(), db_path
+
+
+def reset_process_caches(app):
+    """Forget per-process state built from another database (Account, response and collaborative caches)"""
+    from app.db.repository import account_cache
+    from app.services.follow_similarity_service import FollowSimilarityService
+    from app.services.response_cache_service import ResponseCacheService
+
+    with app.app_context():
+        account_cache.clear()
+        cache = ResponseCacheService.get_cache()
+        if cache is not None:
+            cache.clear()
+        FollowSimilarityService.rebuild()
+
+
+def remove_bench_db(app, db_path):
+    """Close the app's connections and delete its database along with the WAL/shared-memory files"""
+    from app.db.database import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    for path in (db_path, f'{db_path}-wal', f'{db_path}-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class CommitCounter:
+    """Counts session commits while active"""
+
+    def __init__(self, session):
+        self.session = session
+        self.commits = 0
+
+    def _on_commit(self, session):
+        self.commits += 1
+
+    def __enter__(self):
+        event.listen(self.session, 'after_commit', self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.session, 'after_commit', self._on_commit)
+
+
+class StatementCounter:
+    """Counts SQL statements executed on an engine while active, and the INSERTs per table"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = 0
+        self.inserts = {}
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        words = statement.split(None, 3)
+        if len(words) > 2 and words[0].upper() == 'INSERT' and words[1].upper() == 'INTO':
+            self.inserts[words[2]] = self.inserts.get(words[2], 0) + 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+@contextmanager
+def timed(label, results):
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
@@ -0,0 +1,114 @@
+"""
+Benchmark: polling onboarding steps 2 and 3 with conditional GETs
+
+Sets up N onboarded accounts, then polls step 2 and step 3 for each one
+in three modes: plain GETs with RESPONSE_CACHE_ENABLED off, plain GETs
+with the response cache on, and GETs that send back the last ETag in
+If-None-Match. Reports requests/sec, statements against the
+following_recommendations / stats tables per poll, and checks that a
+follow status PUT changes the ETag.
+
+Usage: python -m benchmarks.conditional_get [accounts] [polls]
+"""
+import re
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import event
+
+from benchmarks.common import make_bench_app, remove_bench_db
+
+RECOMMENDATION_TABLES = re.compile(r'\b(following_recommendations|account_recommendation_stats)\b', re.IGNORECASE)
+
+
+def setup_accounts(client, accounts):
+    account_ids = []
+    for i in range(accounts):
+        account_id = client.post('/api/onboarding/?step=0', json={
+            'username': f'poller_{i}', 'password': 'benchpass', 'platform': 'instagram'
+        }).get_json()['account']['id']
+        client.put('/api/onboarding/update', json={
+            'type': 'preferences', 'account_id': account_id,
+            'data': {'interests': ['fitness', 'technology', 'travel']}
+        })
+        account_ids.append(account_id)
+    return account_ids
+
+
+def poll(app, client, account_ids, polls, conditional):
+    from app.db.database import db
+
+    statements = Counter()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements['total'] += 1
+        if RECOMMENDATION_TABLES.search(statement):
+            statements['recommendations'] += 1
+
+    etags = {}
+    statuses = Counter()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    start = time.perf_counter()
+    try:
+        for _ in range(polls):
+            for account_id in account_ids:
+                for step in (2, 3):
+                    url = f'/api/onboarding/?step={step}&account_id={account_id}'
+                    headers = {'If-None-Match': etags[url]} if conditional and url in etags else {}
+                    response = client.get(url, headers=headers)
+                    statuses[response.status_code] += 1
+                    etags[url] = response.headers.get('ETag')
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    elapsed = time.perf_counter() - start
+    requests = polls * len(account_ids) * 2
+    return {
+        'requests_per_sec': requests / elapsed,
+        'statements': statements['total'] / requests,
+        'recommendation_statements': statements['recommendations'] / requests,
+        'not_modified': statuses[304] / requests,
+    }
+
+
+def run(accounts=100, polls=5):
+    app, db_path = make_bench_app()
+    client = app.test_client()
+    account_ids = setup_accounts(client, accounts)
+
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    plain = poll(app, client, account_ids, polls, conditional=False)
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    cached = poll(app, client, account_ids, polls, conditional=False)
+    conditional = poll(app, client, account_ids, polls, conditional=True)
+
+    # A follow decision must change the tag so the next poll gets a fresh body
+    url = f'/api/onboarding/?step=2&account_id={account_ids[0]}'
+    before = client.get(url)
+    recommendation_id = before.get_json()['recommendations'][0]['id']
+    client.put('/api/onboarding/update', json={
+        'type': 'follow_status', 'account_id': account_ids[0],
+        'recommendations': [{'id': recommendation_id, 'follow_status': 'followed'}]
+    })
+    after = client.get(url, headers={'If-None-Match': before.headers['ETag']})
+    remove_bench_db(app, db_path)
+
+    print(f"Polling steps 2+3 ({accounts} accounts x {polls} polls):")
+    print(f"  {'mode':<22} {'req/s':>8} {'SQL/req':>8} {'rec SQL/req':>12} {'304s':>6}")
+    for label, result in (('plain GET', plain), ('response cache', cached), ('If-None-Match', conditional)):
+        print(f"  {label:<22} {result['requests_per_sec']:>8.0f} {result['statements']:>8.2f} "
+              f"{result['recommendation_statements']:>12.2f} {result['not_modified']:>6.0%}")
+    print(f"After a follow status PUT: {after.status_code} "
+          f"({before.headers['ETag']} -> {after.headers['ETag']})")
+    if after.status_code != 200 or after.headers['ETag'] == before.headers['ETag']:
+        raise SystemExit("ETag did not change after a write")
+    return plain, cached, conditional
+
+
+if __name__ == '__main__':
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    )
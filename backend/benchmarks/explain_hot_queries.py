@@ -0,0 +1,53 @@
+"""
+Check: hot per-account queries must be served by an index
+
+Runs EXPLAIN QUERY PLAN for the repository lookups and exits non-zero
+if any of them falls back to a full table scan.
+
+Usage: python -m benchmarks.explain_hot_queries
+"""
+import sys
+
+from sqlalchemy import text
+
+from benchmarks.common import make_bench_app, remove_bench_db
+
+
+def explain(session, query):
+    compiled = query.statement.compile(session.get_bind(), compile_kwargs={'literal_binds': True})
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [row[-1] for row in rows]
+
+
+def run():
+    app, db_path = make_bench_app()
+
+    from app.db.database import db
+    from app.models import FollowingRecommendation, PostsSeen
+    from app.types.enums import FollowStatus, PostStatus
+
+    failures = []
+    with app.app_context():
+        hot_queries = {
+            'posts_seen by account': PostsSeen.query.filter_by(account_id=1),
+            'posts_seen by account+status': PostsSeen.query.filter_by(account_id=1, status=PostStatus.LIKED),
+            'posts_seen by account+post_url': PostsSeen.query.filter_by(account_id=1, post_url='https://x.com/p/1'),
+            'recommendations by account': FollowingRecommendation.query.filter_by(account_id=1),
+            'recommendations by account+follow_status': FollowingRecommendation.query.filter_by(
+                account_id=1, follow_status=FollowStatus.PENDING
+            ),
+        }
+
+        for label, query in hot_queries.items():
+            plan = explain(db.session, query)
+            uses_index = any('USING' in step and 'INDEX' in step for step in plan)
+            print(f"{'✅' if uses_index else '❌'} {label}: {' | '.join(plan)}")
+            if not uses_index:
+                failures.append(label)
+
+    remove_bench_db(app, db_path)
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if run() else 0)
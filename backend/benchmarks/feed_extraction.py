@@ -0,0 +1,124 @@
+"""
+Benchmark: batched in-page feed extraction on saved feed snapshots
+
+Opens the saved home feeds in benchmarks/fixtures/feeds with Playwright
+(headless Chromium, offline) and runs FeedExtractionService over each:
+one JavaScript evaluation per scroll, dedup against posts already
+extracted and already recorded, the local pre-scorer as the classifier,
+and PostsSeen writes in batches. Reports evaluations, posts per scroll,
+duplicates dropped, insert statements and wall-clock. The posts are then
+marked handled, as the runner does once the agent's feed pass succeeds,
+and the same feed is run again to show every post is now known and
+nothing is rewritten.
+The agent figure is posts x --agent-step-seconds for inspecting posts
+one LLM step at a time.
+
+Usage: python -m benchmarks.feed_extraction [--posts N] [--agent-step-seconds S]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from sqlalchemy import event
+
+from benchmarks.common import make_bench_app, remove_bench_db
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'feeds')
+SNAPSHOTS = {'instagram': 'instagram_home.html', 'twitter': 'twitter_home.html'}
+INTERESTS = ['fitness', 'technology']
+
+
+class UncertainIsIrrelevant:
+    """Stands in for the LLM behind the pre-scorer, so the benchmark makes no API calls"""
+
+    def classify(self, posts, interests):
+        return [{'relevant': False, 'topic': None} for _ in posts]
+
+
+async def extract_snapshot(account_id, platform, classifier, max_posts):
+    from playwright.async_api import async_playwright
+    from app.services.feed_extraction_service import FeedExtractionService
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page(viewport={'width': 1280, 'height': 900})
+            await page.goto('file://' + os.path.join(FIXTURES, SNAPSHOTS[platform]))
+            start = time.perf_counter()
+            extraction = await FeedExtractionService.extract(
+                page, account_id, platform, INTERESTS, classifier=classifier,
+                max_posts=max_posts, scroll_pause=0.2
+            )
+            return extraction, time.perf_counter() - start
+        finally:
+            await browser.close()
+
+
+def count_inserts(engine):
+    counter = {'inserts': 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT INTO POSTS_SEEN'):
+            counter['inserts'] += 1
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    return counter
+
+
+def run(max_posts=100, agent_step_seconds=4.0):
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        print("Playwright is not installed (pip install playwright && playwright install chromium)")
+        return None
+
+    from app.db.database import db
+    from app.feed.interest_prescorer import GatedInterestClassifier, InterestPrescorer
+    from app.services.feed_extraction_service import FeedExtractionService
+
+    app, db_path = make_bench_app(FEED_EXTRACTION_WRITE_BATCH=20)
+    classifier = GatedInterestClassifier(InterestPrescorer(), UncertainIsIrrelevant())
+    client = app.test_client()
+    results = {}
+    try:
+        with app.app_context():
+            counter = count_inserts(db.engine)
+            for platform in SNAPSHOTS:
+                account_id = client.post('/api/onboarding/?step=0', json={
+                    'username': f'extract_{platform}', 'password': 'benchpass', 'platform': platform
+                }).get_json()['account']['id']
+
+                print(f"{SNAPSHOTS[platform]}:")
+                for label in ('first pass', 'second pass'):
+                    counter['inserts'] = 0
+                    extraction, seconds = asyncio.run(
+                        extract_snapshot(account_id, platform, classifier, max_posts)
+                    )
+                    stats = extraction['stats']
+                    relevant = sum(1 for _, post_label in extraction['posts'] if post_label['relevant'])
+                    print(f"  {label}: {stats.yielded} new posts in {stats.evaluations} evaluations "
+                          f"({stats.per_scroll} per scroll), {stats.duplicates} duplicates, {stats.known} known")
+                    print(f"    evaluate {stats.evaluate_seconds / max(1, stats.evaluations) * 1000:.1f} ms/scroll, "
+                          f"total {seconds:.2f}s; {relevant} relevant; "
+                          f"{extraction['recorded']} rows recorded in {counter['inserts']} INSERTs")
+                    results[(platform, label)] = (stats.yielded, seconds)
+                    if label == 'first pass':
+                        asyncio.run(FeedExtractionService.mark_handled(
+                            account_id, [post.url for post, _ in extraction['posts']]
+                        ))
+
+                posts, seconds = results[(platform, 'first pass')]
+                print(f"  agent inspecting {posts} posts one step each: ~{posts * agent_step_seconds:.0f}s "
+                      f"(extraction {seconds:.2f}s)")
+    finally:
+        remove_bench_db(app, db_path)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--agent-step-seconds', type=float, default=4.0)
+    args = parser.parse_args()
+    run(args.posts, args.agent_step_seconds)
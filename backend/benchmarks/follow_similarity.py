@@ -0,0 +1,106 @@
+"""
+Benchmark: item-item collaborative filtering build time and query latency
+
+Generates follow decisions for N accounts (default 100,000) over 2,000
+handles grouped into 50 communities: each account follows a few handles
+from its community and skips a couple from elsewhere. Reports
+
+- full build of the model from the decisions,
+- the same build through FollowSimilarityService.rebuild() reading the
+  following_recommendations table (skipped with --no-db),
+- incremental update cost per follow decision,
+- top-k query latency for an account's catalog seeds.
+
+Usage: python -m benchmarks.follow_similarity [accounts] [--no-db]
+"""
+import random
+import sys
+import time
+
+from app.utils.item_similarity import ItemSimilarityModel
+
+HANDLES = 2000
+COMMUNITIES = 50
+
+
+def synthetic_decisions(accounts, seed=21):
+    rng = random.Random(seed)
+    per_community = HANDLES // COMMUNITIES
+    decisions = []
+    for account_id in range(1, accounts + 1):
+        community = rng.randrange(COMMUNITIES)
+        members = range(community * per_community, (community + 1) * per_community)
+        for handle in rng.sample(members, rng.randint(3, 6)):
+            decisions.append((account_id, f"@creator{handle}", 1))
+        for _ in range(rng.randint(0, 2)):
+            decisions.append((account_id, f"@creator{rng.randrange(HANDLES)}", -1))
+    return decisions
+
+
+def build_through_db(decisions):
+    from benchmarks.common import make_bench_app, remove_bench_db
+    app, db_path = make_bench_app()
+
+    from app.db.database import db
+    from app.models.account_model import Account
+    from app.models.following_recommendations_model import FollowingRecommendation
+    from app.services.follow_similarity_service import FollowSimilarityService
+
+    with app.app_context():
+        account_ids = sorted({account_id for account_id, _, _ in decisions})
+        db.session.execute(Account.__table__.insert(), [
+            {'id': account_id, 'username': f'bench_{account_id}', 'password': 'x', 'platform': 'INSTAGRAM'}
+            for account_id in account_ids
+        ])
+        db.session.execute(FollowingRecommendation.__table__.insert(), [
+            {'account_id': account_id, 'recommended_user': handle,
+             'follow_status': 'FOLLOWED' if rating > 0 else 'SKIPPED'}
+            for account_id, handle, rating in decisions
+        ])
+        db.session.commit()
+
+        start = time.perf_counter()
+        FollowSimilarityService.rebuild()
+        elapsed = time.perf_counter() - start
+    remove_bench_db(app, db_path)
+    return elapsed
+
+
+def run(accounts=100_000, with_db=True, queries=2000):
+    rng = random.Random(4)
+    decisions = synthetic_decisions(accounts)
+
+    model = ItemSimilarityModel(min_support=2)
+    start = time.perf_counter()
+    model.set_ratings(decisions)
+    build = time.perf_counter() - start
+    stats = model.stats()
+    print(f"Decisions: {len(decisions):,} from {accounts:,} accounts over {stats['handles']:,} handles "
+          f"({stats['pairs']:,} co-rated pairs)")
+    print(f"In-memory build: {build:.2f} s")
+
+    if with_db:
+        print(f"Rebuild from following_recommendations: {build_through_db(decisions):.2f} s")
+
+    updates = [(rng.randint(1, accounts), f"@creator{rng.randrange(HANDLES)}", 1) for _ in range(queries)]
+    start = time.perf_counter()
+    model.set_ratings(updates)
+    print(f"Incremental update: {(time.perf_counter() - start) / len(updates) * 1e6:.1f} us/decision")
+
+    latencies = []
+    for _ in range(queries):
+        community = rng.randrange(COMMUNITIES) * (HANDLES // COMMUNITIES)
+        seeds = {f"@creator{community + offset}": 1.0 - offset * 0.1 for offset in range(3)}
+        start = time.perf_counter()
+        model.score(seeds, k=5, exclude=seeds)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"Top-5 query (3 seeds): p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    return build, p99
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    run(int(args[0]) if args else 100_000, with_db='--no-db' not in sys.argv)
@@ -0,0 +1,60 @@
+"""
+Benchmark: local interest pre-classifier throughput and LLM calls avoided
+
+Scores the labeled fixture corpus (benchmarks/fixtures/interest_corpus.jsonl)
+for the interests fitness/development/technology, reports how many posts
+were decided locally, how often those local decisions agree with the
+labels, how many on-topic posts were wrongly decided irrelevant (these
+end up hidden by the agent), and posts/sec when scoring the corpus
+replicated to N posts. The corpus includes on-topic posts the seed
+vocabulary does not cover, which must go to the LLM.
+
+Usage: python -m benchmarks.interest_prescorer [posts]
+"""
+import json
+import os
+import sys
+import time
+
+from app.feed.interest_prescorer import IRRELEVANT, RELEVANT, UNCERTAIN, InterestPrescorer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'interest_corpus.jsonl')
+INTERESTS = ['fitness', 'development', 'technology']
+
+
+def load_corpus():
+    with open(FIXTURE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(total_posts=50_000, batch_size=1000):
+    corpus = load_corpus()
+    prescorer = InterestPrescorer()
+
+    decisions = prescorer.decide([post['text'] for post in corpus], INTERESTS)
+    local = [(post, decision) for post, decision in zip(corpus, decisions) if decision[0] != UNCERTAIN]
+    correct = sum(
+        1 for post, (decision, interest, _) in local
+        if (decision == RELEVANT and post['interest'] == interest)
+        or (decision == IRRELEVANT and post['interest'] is None)
+    )
+    hidden_on_topic = sum(1 for post, (decision, _, _) in local if decision == IRRELEVANT and post['interest'])
+
+    texts = [post['text'] for post in corpus]
+    stream = (texts * (total_posts // len(texts) + 1))[:total_posts]
+    start = time.perf_counter()
+    for offset in range(0, total_posts, batch_size):
+        prescorer.score(stream[offset:offset + batch_size], INTERESTS)
+    elapsed = time.perf_counter() - start
+
+    avoided = len(local) / len(corpus)
+    print(f"Corpus: {len(corpus)} labeled posts, interests: {', '.join(INTERESTS)}")
+    print(f"Decided locally: {len(local)}/{len(corpus)} ({avoided:.0%} of LLM calls avoided)")
+    print(f"Local decision accuracy: {correct}/{len(local)} ({correct / max(1, len(local)):.0%})")
+    print(f"On-topic posts decided irrelevant: {hidden_on_topic}")
+    print(f"Throughput: {total_posts / elapsed:,.0f} posts/sec (batches of {batch_size})")
+    return avoided, correct / max(1, len(local))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
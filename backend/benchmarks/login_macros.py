@@ -0,0 +1,181 @@
+"""
+Benchmark: login macros vs. the agent on local login page fixtures
+
+Replays the builtin login scripts against the offline pages in
+benchmarks/fixtures/login with Playwright (headless Chromium) and
+reports the median login time for each:
+
+- twitter.html / instagram.html: the builtin scripts as shipped
+- twitter_redesign.html: primary selectors gone; the fallbacks match and
+  are promoted to the front of the saved script
+- twitter_changed.html: nothing matches, so the agent fallback runs, its
+  history is recorded as a new script, and the next login replays that
+  script without the agent
+
+Without --agent the fallback is a scripted stand-in that performs the
+same actions and returns a browser-use-shaped history, and the pure-agent
+time is estimated as steps x --agent-step-seconds. With --agent (needs
+browser-use and OPENAI_API_KEY) a real Agent logs in to twitter.html.
+
+Usage: python -m benchmarks.login_macros [--runs N] [--agent] [--agent-step-seconds S]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from app.agents.macros import LoginMacros, MacroStore
+from app.agents.session_cache import StorageStateFile
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'login')
+USERNAME = 'bench_user'
+PASSWORD = 'bench_password'
+# browser-use usually needs one step per field and button on a login form
+AGENT_LOGIN_STEPS = 5
+
+
+def fixture_url(name):
+    return 'file://' + os.path.join(FIXTURES, name)
+
+
+class ScriptedAgentHistory:
+    """Just enough of a browser-use AgentHistoryList for LoginMacros.learn()"""
+
+    def __init__(self, actions):
+        self.actions = actions
+
+    def model_actions(self):
+        return self.actions
+
+    def is_done(self):
+        return True
+
+    def is_successful(self):
+        return True
+
+
+def _element(tag, **attributes):
+    return SimpleNamespace(tag_name=tag, attributes=attributes, xpath=None, css_selector=None)
+
+
+async def scripted_agent_login(url, state_path):
+    """Logs in to twitter_changed.html the way an agent would, without an LLM"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context()
+            page = await context.new_page()
+            await page.goto(url)
+            await page.fill('#handle', USERNAME)
+            await page.fill('#secret', PASSWORD)
+            await page.click('#continue')
+            await page.wait_for_selector('[data-testid="AppTabBar_Home_Link"]')
+            await context.storage_state(path=state_path)
+        finally:
+            await browser.close()
+
+    return ScriptedAgentHistory([
+        {'go_to_url': {'url': url}, 'interacted_element': None},
+        {'input_text': {'index': 1, 'text': '<secret>fw_user</secret>'},
+         'interacted_element': _element('input', id='handle', name='session[handle]', type='text')},
+        {'input_text': {'index': 2, 'text': '<secret>fw_pass</secret>'},
+         'interacted_element': _element('input', id='secret', name='session[secret]', type='text')},
+        {'click_element_by_index': {'index': 3},
+         'interacted_element': _element('div', id='continue', role='link', **{'data-testid': 'ocfContinue'})},
+        {'done': {'text': 'Logged in', 'success': True}, 'interacted_element': None},
+    ])
+
+
+async def real_agent_login(url):
+    from browser_use import Agent, Browser, ChatOpenAI
+
+    browser = Browser(headless=True)
+    agent = Agent(
+        llm=ChatOpenAI(model='gpt-4o-mini'),
+        task=f"Go to {url} and log in with username fw_user and password fw_pass. Stop once Home is showing.",
+        browser=browser,
+        sensitive_data={'fw_user': USERNAME, 'fw_pass': PASSWORD},
+        use_vision=False,
+    )
+    try:
+        start = time.perf_counter()
+        history = await agent.run()
+        return time.perf_counter() - start, len(history.history)
+    finally:
+        await browser.kill()
+
+
+async def time_logins(macros, platform, fixture, runs, agent_login=None):
+    outcomes = []
+    for _ in range(runs):
+        with StorageStateFile() as state_file:
+            fallback = (lambda: agent_login(fixture_url(fixture), state_file.path)) if agent_login else None
+            outcomes.append(await macros.login(
+                platform, USERNAME, PASSWORD, state_file.path, agent_login=fallback,
+                placeholders={'fw_user': USERNAME, 'fw_pass': PASSWORD}, start_url=fixture_url(fixture)
+            ))
+    return outcomes
+
+
+def describe(label, outcomes):
+    paths = ', '.join(sorted({outcome.path for outcome in outcomes}))
+    median = statistics.median(outcome.seconds for outcome in outcomes)
+    print(f"  {label:<34} {median * 1000:>8.0f} ms  ({len(outcomes)} runs, path: {paths})")
+    return median
+
+
+async def run(runs=5, use_agent=False, agent_step_seconds=4.0):
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        print("Playwright is not installed (pip install playwright && playwright install chromium)")
+        return None
+
+    directory = tempfile.mkdtemp(prefix='feedwise-macros-')
+    try:
+        store = MacroStore(directory)
+        macros = LoginMacros(store, step_timeout_ms=2000)
+
+        print("Macro logins on local fixtures:")
+        twitter = describe('twitter.html (builtin)', await time_logins(macros, 'twitter', 'twitter.html', runs))
+        describe('instagram.html (builtin)', await time_logins(macros, 'instagram', 'instagram.html', runs))
+        print(f"  instagram script after promotion: v{store.get('instagram').version}")
+
+        redesign = await time_logins(macros, 'twitter', 'twitter_redesign.html', 1)
+        describe('twitter_redesign.html (fallbacks)', redesign)
+        print(f"  twitter script after promotion: v{store.get('twitter').version}, "
+              f"username selectors {store.get('twitter').steps[1].selectors}")
+
+        changed = await time_logins(macros, 'twitter', 'twitter_changed.html', 1, scripted_agent_login)
+        describe('twitter_changed.html (agent fallback)', changed)
+        recorded = store.get('twitter')
+        print(f"  recorded: {changed[0].recorded}, script now {recorded.source} v{recorded.version} "
+              f"with {len(recorded.steps)} steps (fallback cost includes {changed[0].failed_step + 1} failed macro steps)")
+        describe('twitter_changed.html (recorded)', await time_logins(macros, 'twitter', 'twitter_changed.html', runs))
+
+        if use_agent:
+            agent_seconds, steps = await real_agent_login(fixture_url('twitter.html'))
+            print(f"Pure agent login on twitter.html: {agent_seconds * 1000:.0f} ms in {steps} steps")
+        else:
+            agent_seconds = AGENT_LOGIN_STEPS * agent_step_seconds
+            print(f"Pure agent login (estimated, {AGENT_LOGIN_STEPS} steps x {agent_step_seconds:.1f}s): "
+                  f"{agent_seconds * 1000:.0f} ms")
+        print(f"Macro speedup on twitter.html: {agent_seconds / twitter:.1f}x")
+        return twitter, agent_seconds
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--agent', action='store_true', help='also time a real browser-use agent login')
+    parser.add_argument('--agent-step-seconds', type=float, default=4.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.agent, args.agent_step_seconds))
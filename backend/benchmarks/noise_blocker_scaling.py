@@ -0,0 +1,98 @@
+"""
+Benchmark: noise blocker scan cost vs. rule count and text length
+
+Compiles synthetic rule sets of 100, 1,000 and 10,000 rules (keywords,
+domains and anchored regexes) and scans the same post stream with each,
+then scans posts of growing length with the 10k set. Per-post cost should
+stay flat as rules grow and grow linearly with text length. Also checks
+that editing the rules file is picked up without rebuilding the blocker.
+
+Usage: python -m benchmarks.noise_blocker_scaling [posts]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.feed.noise_blocker import NoiseBlocker, RuleSet, parse_rules
+
+VOCABULARY = ("today the new update shipped with faster builds and our team went hiking after the "
+              "gym session coffee city weekend launch design recipe thread camera photo review").split()
+
+
+def synthetic_rules(count, seed=11):
+    rng = random.Random(seed)
+    rules = []
+    for index in range(count):
+        kind = index % 20
+        if kind < 14:
+            words = [f"spamword{rng.randint(0, 50_000)}" for _ in range(rng.randint(1, 3))]
+            rules.append({'id': f"kw-{index}", 'type': 'keyword', 'category': 'spam', 'pattern': ' '.join(words)})
+        elif kind < 19:
+            rules.append({'id': f"dom-{index}", 'type': 'domain', 'category': 'scam', 'pattern': f"promo{index}.example"})
+        else:
+            rules.append({
+                'id': f"re-{index}", 'type': 'regex', 'category': 'ad',
+                'pattern': rf"offer{index}\s+\d+%", 'anchors': [f"offer{index}"]
+            })
+    return rules
+
+
+def synthetic_posts(count, words_per_post=40, seed=5):
+    rng = random.Random(seed)
+    posts = []
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, k=words_per_post)
+        if rng.random() < 0.3:
+            words.append(f"https://cdn{rng.randint(0, 99)}.images.example/p/{rng.randint(0, 10**6)}")
+        posts.append(' '.join(words))
+    return posts
+
+
+def time_scan(ruleset, posts):
+    start = time.perf_counter()
+    for post in posts:
+        ruleset.scan(post)
+    return (time.perf_counter() - start) / len(posts) * 1e6
+
+
+def check_hot_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rules.json')
+        with open(path, 'w') as f:
+            json.dump({'rules': [{'id': 'a', 'type': 'keyword', 'pattern': 'first rule'}]}, f)
+        blocker = NoiseBlocker(path=path, reload_seconds=0)
+        before = blocker.check('this has the second rule')
+        with open(path, 'w') as f:
+            json.dump({'rules': [{'id': 'b', 'type': 'keyword', 'pattern': 'second rule'}]}, f)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        after = blocker.check('this has the second rule')
+        return before is None and after is not None and after.rule_id == 'b'
+
+
+def run(total_posts=5000):
+    posts = synthetic_posts(total_posts)
+    print(f"Scan cost per 40-word post ({total_posts} posts):")
+    costs = {}
+    for count in (100, 1_000, 10_000):
+        start = time.perf_counter()
+        ruleset = RuleSet(parse_rules({'rules': synthetic_rules(count)}))
+        compile_ms = (time.perf_counter() - start) * 1000
+        costs[count] = time_scan(ruleset, posts)
+        print(f"  {count:>6,} rules: {costs[count]:7.1f} us/post (compile {compile_ms:,.0f} ms)")
+
+    print("Scan cost vs. text length (10,000 rules):")
+    for words in (25, 100, 400, 1600):
+        cost = time_scan(ruleset, synthetic_posts(max(200, total_posts // words * 10), words_per_post=words))
+        print(f"  {words:>5} words: {cost:8.1f} us/post ({cost / words:.2f} us/word)")
+
+    reload_ok = check_hot_reload()
+    print(f"Hot reload picked up edited rules file: {'yes' if reload_ok else 'NO'}")
+    return costs[10_000] / costs[100], reload_ok
+
+
+if __name__ == '__main__':
+    ratio, reload_ok = run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
+    sys.exit(0 if reload_ok else 1)
@@ -0,0 +1,346 @@
+"""
+Load benchmark: the full onboarding flow against pre-seeded databases
+
+Each virtual user runs step 0 (create), PUT preferences, step 2 (fetch),
+PUT follow_status (decide every recommendation) and step 3 (complete)
+through create_app()'s test client. --concurrency worker threads share
+--flows flows, each with its own deterministic RNG, so runs are
+reproducible for a given seed.
+
+Databases with --accounts existing accounts (5 recommendations and a
+counters row each) are generated once and kept under benchmarks/.seeds/;
+every run works on a copy. Seeds are keyed by size, RNG seed and schema
+version, so a new migration produces fresh ones.
+
+Reports throughput, p50/p99 latency and SQL statements per request for
+each step. Results are compared against benchmarks/baselines/
+onboarding_load.json (per accounts x concurrency) and the run fails when
+throughput drops by more than --threshold, a step's p99 grows by more
+than --latency-threshold, or a step issues more statements than
+--query-threshold allows. Throughput and latency baselines are machine
+specific: regenerate them with --update-baseline on the machine that
+runs the comparison.
+
+Usage:
+  python -m benchmarks.onboarding_load [--accounts 10000 100000 1000000]
+      [--concurrency 4] [--flows 400] [--threshold 0.2] [--latency-threshold 0.5]
+      [--update-baseline]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+from benchmarks.common import bench_db_path, make_bench_app, remove_bench_db, reset_process_caches
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_DIR = os.path.join(BENCH_DIR, '.seeds')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'onboarding_load.json')
+
+STEPS = ('create', 'preferences', 'fetch', 'follow_status', 'complete')
+INTERESTS = ['technology', 'fitness', 'sports', 'travel', 'food', 'music', 'gaming', 'fashion']
+PLATFORMS = ['twitter', 'instagram']
+RECOMMENDATIONS_PER_ACCOUNT = 5
+SEED_CHUNK = 10000
+
+# Latency changes smaller than this are noise at the timer's resolution
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+def schema_version():
+    from app.db.migrations import MIGRATIONS
+    return max(version for version, _, _ in MIGRATIONS)
+
+
+def seed_path(accounts, seed):
+    return os.path.join(SEED_DIR, f'onboarding-{accounts}-s{seed}-v{schema_version()}.db')
+
+
+def build_seed(path, accounts, seed):
+    """Bulk-insert accounts with recommendations and counters, bypassing the API"""
+    from app.db.database import db
+    from app.models import Account, AccountRecommendationStats, FollowingRecommendation
+    from app.types.enums import FollowStatus, Platform, SentimentFilter
+
+    os.makedirs(SEED_DIR, exist_ok=True)
+    partial = f'{path}.partial'
+    app, _ = make_bench_app(partial)
+    rng = random.Random(seed)
+    created_at = datetime(2024, 1, 1)
+    statuses = [FollowStatus.PENDING, FollowStatus.FOLLOWED, FollowStatus.SKIPPED]
+    started = time.perf_counter()
+
+    with app.app_context():
+        for first in range(1, accounts + 1, SEED_CHUNK):
+            ids = range(first, min(first + SEED_CHUNK, accounts + 1))
+            account_rows, recommendation_rows, stats_rows = [], [], []
+            for account_id in ids:
+                account_rows.append({
+                    'id': account_id,
+                    'username': f'seed_{account_id}',
+                    'password': 'seedpass',
+                    'platform': Platform(rng.choice(PLATFORMS)),
+                    'interests': rng.sample(INTERESTS, 3),
+                    'sentiment_filter': SentimentFilter.POSITIVE,
+                    'noise_blocker_enabled': True,
+                    'created_at': created_at,
+                })
+                counts = {status: 0 for status in statuses}
+                for n in range(RECOMMENDATIONS_PER_ACCOUNT):
+                    status = rng.choice(statuses)
+                    counts[status] += 1
+                    recommendation_rows.append({
+                        'account_id': account_id,
+                        'recommended_user': f'@seed_handle_{rng.randrange(5000)}',
+                        'reason': 'Seeded recommendation',
+                        'follow_status': status,
+                        'created_at': created_at,
+                    })
+                stats_rows.append({
+                    'account_id': account_id,
+                    'followed_count': counts[FollowStatus.FOLLOWED],
+                    'skipped_count': counts[FollowStatus.SKIPPED],
+                    'pending_count': counts[FollowStatus.PENDING],
+                    'total_count': RECOMMENDATIONS_PER_ACCOUNT,
+                    'updated_at': created_at,
+                })
+            db.session.execute(Account.__table__.insert(), account_rows)
+            db.session.execute(FollowingRecommendation.__table__.insert(), recommendation_rows)
+            db.session.execute(AccountRecommendationStats.__table__.insert(), stats_rows)
+            db.session.commit()
+        # Closing every connection checkpoints the WAL back into the file before it is moved
+        for engine in db.engines.values():
+            engine.dispose()
+    os.replace(partial, path)
+    print(f"Seeded {accounts} accounts in {time.perf_counter() - started:.1f}s -> {path}")
+
+
+def prepare_database(accounts, seed):
+    path = seed_path(accounts, seed)
+    if not os.path.exists(path):
+        build_seed(path, accounts, seed)
+    db_path = bench_db_path()
+    shutil.copyfile(path, db_path)
+    return db_path
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_load(accounts, concurrency, flows, seed, warmup=20):
+    from app.db.database import db
+
+    db_path = prepare_database(accounts, seed)
+    app, _ = make_bench_app(db_path)
+    reset_process_caches(app)
+
+    current = threading.local()
+    lock = threading.Lock()
+    latencies = {step: [] for step in STEPS}
+    statements = {step: 0 for step in STEPS}
+    failures = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        step = getattr(current, 'step', None)
+        if step is not None:
+            with lock:
+                statements[step] += 1
+
+    def timed_call(step, call):
+        current.step = step
+        start = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - start
+        current.step = None
+        with lock:
+            latencies[step].append(elapsed)
+            if response.status_code >= 400:
+                failures.append((step, response.status_code))
+        return response
+
+    def user(flow, client):
+        rng = random.Random(f'{seed}-{flow}')
+        username = f'load_{flow}'
+        account = timed_call('create', lambda: client.post('/api/onboarding/?step=0', json={
+            'username': username, 'password': 'loadpass', 'platform': rng.choice(PLATFORMS)
+        })).get_json()['account']
+        account_id = account['id']
+        timed_call('preferences', lambda: client.put('/api/onboarding/update', json={
+            'type': 'preferences', 'account_id': account_id,
+            'data': {'interests': rng.sample(INTERESTS, 3)}
+        }))
+        recommendations = timed_call(
+            'fetch', lambda: client.get(f'/api/onboarding/?step=2&account_id={account_id}')
+        ).get_json()['recommendations']
+        timed_call('follow_status', lambda: client.put('/api/onboarding/update', json={
+            'type': 'follow_status', 'account_id': account_id,
+            'recommendations': [
+                {'id': rec['id'], 'follow_status': rng.choice(('followed', 'skipped'))}
+                for rec in recommendations
+            ]
+        }))
+        timed_call('complete', lambda: client.get(f'/api/onboarding/?step=3&account_id={account_id}'))
+
+    def worker(index):
+        client = app.test_client()
+        for flow in range(index, flows, concurrency):
+            user(flow, client)
+
+    # Warm-up flows (not measured) load the catalog and build the collaborative model
+    warmup_client = app.test_client()
+    for flow in range(warmup):
+        user(f'warmup_{flow}', warmup_client)
+    for step in STEPS:
+        latencies[step].clear()
+        statements[step] = 0
+    failures.clear()
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', count)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        elapsed = time.perf_counter() - start
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', count)
+        remove_bench_db(app, db_path)
+
+    if failures:
+        raise SystemExit(f"{len(failures)} requests failed, e.g. {failures[:5]}")
+
+    requests = flows * len(STEPS)
+    return {
+        'accounts': accounts,
+        'concurrency': concurrency,
+        'flows': flows,
+        'seed': seed,
+        'warmup': warmup,
+        'requests_per_sec': round(requests / elapsed, 1),
+        'flows_per_sec': round(flows / elapsed, 2),
+        'steps': {
+            step: {
+                'p50_ms': round(percentile(latencies[step], 0.50) * 1000, 3),
+                'p99_ms': round(percentile(latencies[step], 0.99) * 1000, 3),
+                'queries_per_request': round(statements[step] / flows, 2),
+            }
+            for step in STEPS
+        },
+    }
+
+
+def baseline_key(result):
+    return f"{result['accounts']}x{result['concurrency']}"
+
+
+def compare(result, baseline, threshold, latency_threshold, query_threshold):
+    """Regressions of result against one baseline entry, as readable strings"""
+    regressions = []
+    if result['requests_per_sec'] < baseline['requests_per_sec'] * (1 - threshold):
+        regressions.append(
+            f"throughput {result['requests_per_sec']} req/s < baseline {baseline['requests_per_sec']} req/s"
+        )
+    for step, stats in result['steps'].items():
+        expected = baseline['steps'].get(step)
+        if expected is None:
+            continue
+        p99, base_p99 = stats['p99_ms'], expected['p99_ms']
+        if p99 > base_p99 * (1 + latency_threshold) and p99 - base_p99 > MIN_LATENCY_DELTA_MS:
+            regressions.append(f"{step}: p99 {p99} ms > baseline {base_p99} ms")
+        if stats['queries_per_request'] > expected['queries_per_request'] * (1 + query_threshold):
+            regressions.append(
+                f"{step}: {stats['queries_per_request']} queries/request > baseline {expected['queries_per_request']}"
+            )
+    return regressions
+
+
+def print_result(result):
+    print(f"Onboarding load: {result['accounts']} seeded accounts, concurrency {result['concurrency']}, "
+          f"{result['flows']} flows")
+    print(f"  throughput: {result['requests_per_sec']} req/s ({result['flows_per_sec']} flows/s)")
+    print(f"  {'step':<14} {'p50 ms':>8} {'p99 ms':>8} {'SQL/req':>8}")
+    for step, stats in result['steps'].items():
+        print(f"  {step:<14} {stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['queries_per_request']:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--accounts', type=int, nargs='+', default=[10000])
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--flows', type=int, default=400)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured flows run first')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed fractional throughput drop')
+    # p99 of a few hundred samples under thread contention moves ~25% between identical runs
+    parser.add_argument('--latency-threshold', type=float, default=0.5, help='allowed fractional p99 increase')
+    # Statement counts shift slightly with thread interleaving (collaborative recommendations
+    # depend on which decisions landed first), so they get a small tolerance of their own
+    parser.add_argument('--query-threshold', type=float, default=0.05,
+                        help='allowed fractional increase in statements per request')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', help='also write this run\'s results as JSON')
+    args = parser.parse_args(argv)
+
+    results = [
+        run_load(accounts, args.concurrency, args.flows, args.seed, args.warmup)
+        for accounts in args.accounts
+    ]
+    for result in results:
+        print_result(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        for result in results:
+            baselines[baseline_key(result)] = result
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    failed = False
+    for result in results:
+        key = baseline_key(result)
+        if key not in baselines:
+            print(f"No baseline for {key}; run with --update-baseline to record one")
+            continue
+        regressions = compare(result, baselines[key], args.threshold, args.latency_threshold, args.query_threshold)
+        if regressions:
+            failed = True
+            print(f"REGRESSION vs baseline {key}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+        else:
+            print(f"OK vs baseline {key}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark: recommendation catalog lookup cost vs. catalog size
+
+Builds synthetic catalogs with 100 / 1,000 / 5,000 interests per platform
+(50 handles each, with handles shared across interests so merging and
+de-duplication are exercised) and times recommend() for accounts with 5
+interests. Per-request cost should not depend on catalog size. Also
+checks that a reload picks up an edited catalog file.
+
+Usage: python -m benchmarks.recommendation_catalog [requests]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.utils.recommendation_catalog import RecommendationCatalog
+
+PLATFORMS = ['twitter', 'instagram']
+
+
+def synthetic_catalog(interests_per_platform, handles_per_interest=50, seed=3):
+    rng = random.Random(seed)
+    handle_pool = interests_per_platform * 10
+    platforms = {}
+    for platform in PLATFORMS:
+        interests = {}
+        for index in range(interests_per_platform):
+            handles = rng.sample(range(handle_pool), handles_per_interest)
+            interests[f"interest{index}"] = [
+                {'handle': f"@creator{handle}", 'reason': f"Posts about interest{index}", 'score': round(rng.random(), 3)}
+                for handle in handles
+            ]
+        platforms[platform] = {'interests': interests, 'defaults': [{'handle': f'@{platform}', 'score': 0.5}]}
+    return {'limits': {'per_interest': 2, 'total': 5}, 'platforms': platforms}
+
+
+def check_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'catalog.json')
+        with open(path, 'w') as f:
+            json.dump(synthetic_catalog(10), f)
+        catalog = RecommendationCatalog.load(path)
+        with open(path, 'w') as f:
+            json.dump({'platforms': {'twitter': {'interests': {'new': [{'handle': '@fresh', 'score': 1}]}}}}, f)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        if not catalog.is_stale():
+            return False
+        reloaded = RecommendationCatalog.load(path)
+        return reloaded.recommend('twitter', ['new'])[0]['recommended_user'] == '@fresh'
+
+
+def run(requests=20_000):
+    rng = random.Random(9)
+    print(f"recommend() cost, 5 interests per account ({requests:,} requests):")
+    for size in (100, 1_000, 5_000):
+        data = synthetic_catalog(size)
+        start = time.perf_counter()
+        catalog = RecommendationCatalog.from_dict(data)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        accounts = [
+            (rng.choice(PLATFORMS), [f"interest{rng.randrange(size)}" for _ in range(5)])
+            for _ in range(requests)
+        ]
+        start = time.perf_counter()
+        for platform, interests in accounts:
+            catalog.recommend(platform, interests)
+        per_request = (time.perf_counter() - start) / requests * 1e6
+        stats = catalog.stats()
+        print(f"  {size:>5,} interests/platform ({stats['handles']:,} entries): "
+              f"{per_request:5.1f} us/request (load {load_ms:,.0f} ms)")
+
+    reload_ok = check_reload()
+    print(f"Reload picked up edited catalog file: {'yes' if reload_ok else 'NO'}")
+    return reload_ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000) else 1)
@@ -0,0 +1,65 @@
+"""
+Benchmark: commits and statements per preferences PUT when generating recommendations
+
+Compares the old per-row path (one commit per recommendation) with the
+batched path used by OnboardingService.generate_recommendations. Commits
+alone do not show per-row INSERTs or refresh SELECTs inside one
+transaction, so SQL statements and following_recommendations INSERTs are
+counted too.
+
+Usage: python -m benchmarks.recommendation_commits [accounts]
+"""
+import sys
+
+from benchmarks.common import CommitCounter, StatementCounter, make_bench_app, remove_bench_db, timed
+
+
+def run(accounts=200):
+    app, db_path = make_bench_app()
+
+    from app.db.database import db
+    from app.services.account_service import AccountService
+    from app.services.following_recommendations_service import FollowingRecommendationsService
+    from app.services.onboarding_service import OnboardingService
+
+    interests = ['technology', 'fitness', 'sports', 'travel']
+    results = {}
+
+    with app.app_context():
+        account_ids = []
+        for i in range(accounts * 2):
+            account = AccountService.create_account({
+                'username': f'bench_user_{i}',
+                'password': 'benchpass',
+                'platform': 'twitter',
+                'interests': interests,
+            })
+            account_ids.append(account.id)
+        per_row_ids, batched_ids = account_ids[:accounts], account_ids[accounts:]
+
+        engine = db.engine
+        with CommitCounter(db.session) as per_row, StatementCounter(engine) as per_row_sql, timed('per_row', results):
+            for account_id in per_row_ids:
+                for rec_data in OnboardingService._get_sample_recommendations(interests, 'twitter'):
+                    rec_data['account_id'] = account_id
+                    FollowingRecommendationsService.create_following_recommendation(rec_data)
+
+        with CommitCounter(db.session) as batched, StatementCounter(engine) as batched_sql, timed('batched', results):
+            for account_id in batched_ids:
+                OnboardingService.generate_recommendations(account_id)
+
+        rows = len(OnboardingService._get_sample_recommendations(interests, 'twitter'))
+
+    remove_bench_db(app, db_path)
+
+    print(f"Recommendations per request: {rows}")
+    for label, key, commits, sql in (('Per-row', 'per_row', per_row, per_row_sql), ('Batched', 'batched', batched, batched_sql)):
+        print(f"{label + ':':9} {commits.commits / accounts:.1f} commits/request, "
+              f"{sql.statements / accounts:.1f} statements/request "
+              f"({sql.inserts.get('following_recommendations', 0) / accounts:.1f} recommendation INSERTs), "
+              f"{results[key] / accounts * 1000:.2f} ms/request")
+    return per_row.commits / accounts, batched.commits / accounts
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,64 @@
+"""
+Benchmark: cost of request/SQL instrumentation and per-step query counts
+
+Runs the onboarding flow (create, preferences PUT, step 2, step 3) for N
+accounts on an app with METRICS_ENABLED off and on, compares the time per
+flow, then prints the statements and SQL time per request that the
+enabled app recorded for each route and step.
+
+Usage: python -m benchmarks.request_metrics [accounts]
+"""
+import sys
+import time
+
+from benchmarks.common import make_bench_app, remove_bench_db
+
+
+def run_flow(app, accounts, prefix):
+    client = app.test_client()
+    start = time.perf_counter()
+    for i in range(accounts):
+        account_id = client.post('/api/onboarding/?step=0', json={
+            'username': f'{prefix}_{i}', 'password': 'benchpass', 'platform': 'instagram'
+        }).get_json()['account']['id']
+        client.put('/api/onboarding/update', json={
+            'type': 'preferences', 'account_id': account_id,
+            'data': {'interests': ['fitness', 'technology']}
+        })
+        client.get(f'/api/onboarding/?step=2&account_id={account_id}')
+        client.get(f'/api/onboarding/?step=3&account_id={account_id}')
+    return (time.perf_counter() - start) / accounts
+
+
+def run(accounts=300):
+    from app.utils.request_metrics import registry
+
+    disabled_app, disabled_path = make_bench_app(METRICS_ENABLED=False)
+    disabled = run_flow(disabled_app, accounts, 'plain')
+    remove_bench_db(disabled_app, disabled_path)
+
+    enabled_app, enabled_path = make_bench_app(METRICS_ENABLED=True)
+    registry.reset()
+    enabled = run_flow(enabled_app, accounts, 'metered')
+    scrape = enabled_app.test_client().get('/metrics')
+    remove_bench_db(enabled_app, enabled_path)
+
+    print(f"Onboarding flow ({accounts} accounts, 4 requests each):")
+    print(f"  metrics off: {disabled * 1000:.2f} ms/flow")
+    print(f"  metrics on:  {enabled * 1000:.2f} ms/flow ({(enabled / disabled - 1) * 100:+.1f}%)")
+
+    statements = registry.snapshot('feedwise_sql_statements_per_request')
+    sql_time = registry.snapshot('feedwise_sql_seconds_per_request')
+    print("Per request (from the enabled run):")
+    print(f"  {'method':<6} {'route':<24} {'step':<5} {'SQL/req':>8} {'SQL ms/req':>11}")
+    for key, (total, count) in sorted(statements.items()):
+        labels = dict(key)
+        seconds = sql_time[key][0]
+        print(f"  {labels['method']:<6} {labels['route']:<24} {labels['step'] or '-':<5} "
+              f"{total / count:>8.1f} {seconds / count * 1000:>11.3f}")
+    print(f"/metrics: {scrape.status_code}, {len(scrape.get_data())} bytes")
+    return disabled, enabled
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
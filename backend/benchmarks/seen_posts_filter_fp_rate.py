@@ -0,0 +1,55 @@
+"""
+Benchmark: seen-post Bloom filter false positive rate and throughput
+
+Fills a memory-mapped filter with N canonical post URLs (default 1M),
+probes it with URLs that were never inserted, and exits non-zero if the
+measured false positive rate exceeds 1.5x the configured target.
+
+Usage: python -m benchmarks.seen_posts_filter_fp_rate [entries] [error_rate]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.utils.bloom_filter import BloomFilter, canonicalize_post_url
+
+
+def run(entries=1_000_000, error_rate=0.01, probes=200_000):
+    fd, path = tempfile.mkstemp(prefix='feedwise-bloom-', suffix='.bloom')
+    os.close(fd)
+
+    bloom = BloomFilter.create(entries, error_rate=error_rate, path=path)
+    members = (canonicalize_post_url(f'https://www.instagram.com/p/seen{i}/') for i in range(entries))
+
+    start = time.perf_counter()
+    bloom.add_many(members)
+    bloom.flush()
+    insert_seconds = time.perf_counter() - start
+    bloom.close()
+
+    # Re-map from disk to prove the filter survives a restart
+    bloom = BloomFilter.load(path)
+    assert canonicalize_post_url('https://instagram.com/p/seen42') in bloom
+
+    non_members = [canonicalize_post_url(f'https://www.instagram.com/p/fresh{i}/') for i in range(probes)]
+    start = time.perf_counter()
+    false_positives = sum(bloom.contains_many(non_members))
+    query_seconds = time.perf_counter() - start
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    bloom.close()
+    os.remove(path)
+
+    fp_rate = false_positives / probes
+    print(f"Entries: {entries:,}  bits: {bloom.num_bits:,}  hashes: {bloom.num_hashes}  file: {size_mb:.2f} MB")
+    print(f"Insert:  {entries / insert_seconds:,.0f} urls/sec")
+    print(f"Query:   {probes / query_seconds:,.0f} urls/sec")
+    print(f"False positive rate: {fp_rate:.4%} (target {error_rate:.2%})")
+    return fp_rate <= error_rate * 1.5
+
+
+if __name__ == '__main__':
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    error_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    sys.exit(0 if run(entries, error_rate) else 1)
@@ -0,0 +1,77 @@
+"""
+Benchmark: local sentiment scoring throughput
+
+Scores N synthetic posts (unique texts, so nothing is served from the
+cache) in batches, then re-scores the same stream to measure the LRU
+cache path, and checks a handful of labeled sentences. Exits non-zero if
+cold throughput falls below the target, so sentiment filtering stays
+cheap enough to never need a remote model.
+
+Usage: python -m benchmarks.sentiment_throughput [posts] [min_posts_per_sec]
+"""
+import random
+import sys
+import time
+
+from app.feed.classification_cache import LRUCache
+from app.feed.sentiment import SentimentScorer
+from app.types.enums import SentimentFilter
+
+LABELED = [
+    ("Absolutely love this new workout routine, feeling amazing! 💪", SentimentFilter.POSITIVE),
+    ("Congrats to the team on shipping v2, great work", SentimentFilter.POSITIVE),
+    ("This update is not bad at all", SentimentFilter.POSITIVE),
+    ("Worst customer service ever. Never ordering again 😡", SentimentFilter.NEGATIVE),
+    ("The app keeps crashing and support is useless", SentimentFilter.NEGATIVE),
+    ("Not happy with how slow the new release is", SentimentFilter.NEGATIVE),
+    ("The camera is good but the battery life is terrible", SentimentFilter.NEGATIVE),
+    ("New episode drops Friday at 6pm", SentimentFilter.NEUTRAL),
+    ("Thread: how we migrated our database to Postgres", SentimentFilter.NEUTRAL),
+    ("Leg day. 5 sets of squats and deadlifts", SentimentFilter.NEUTRAL),
+]
+
+FILLER = ("today we tried the new gym routine with friends after work and the results were in "
+          "the city team app update release coffee weekend thread video post").split()
+SENTIMENT_WORDS = "love great awesome good nice happy bad terrible hate awful boring sad not very really but".split()
+
+
+def synthetic_posts(count, seed=7):
+    rng = random.Random(seed)
+    posts = []
+    for index in range(count):
+        words = rng.choices(FILLER, k=rng.randint(12, 30)) + rng.choices(SENTIMENT_WORDS, k=rng.randint(0, 4))
+        rng.shuffle(words)
+        posts.append(f"{' '.join(words)} #{index}")
+    return posts
+
+
+def run(total_posts=100_000, min_rate=20_000, batch_size=2000):
+    scorer = SentimentScorer(cache=LRUCache(max_entries=total_posts))
+
+    labels = scorer.classify([text for text, _ in LABELED])
+    correct = sum(1 for (_, expected), label in zip(LABELED, labels) if label == expected)
+
+    posts = synthetic_posts(total_posts)
+    start = time.perf_counter()
+    for offset in range(0, total_posts, batch_size):
+        scorer.score(posts[offset:offset + batch_size])
+    cold = total_posts / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for offset in range(0, total_posts, batch_size):
+        scorer.score(posts[offset:offset + batch_size])
+    warm = total_posts / (time.perf_counter() - start)
+
+    print(f"Labeled sentences: {correct}/{len(LABELED)} correct")
+    print(f"Cold (lexicon scoring): {cold:,.0f} posts/sec (batches of {batch_size})")
+    print(f"Warm (LRU cache hits):  {warm:,.0f} posts/sec")
+    print(f"Target: {min_rate:,} posts/sec cold")
+    return cold >= min_rate
+
+
+if __name__ == '__main__':
+    ok = run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    )
+    sys.exit(0 if ok else 1)
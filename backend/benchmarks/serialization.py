@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: per-response serialization cost for onboarding responses
+
+Compares the previous hand-built dicts (json.loads on the interests Text
+column, stdlib json encoder as configured by Flask's default provider)
+with the precompiled serializers and FastJSONProvider, for the step 3
+account payload and a step 2 page of 50 recommendations.
+
+Usage: python -m benchmarks.serialization [iterations]
+"""
+import json
+import sys
+import time
+from datetime import datetime
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.models.account_model import Account
+from app.models.following_recommendations_model import FollowingRecommendation
+from app.types.enums import FollowStatus, Platform, SentimentFilter
+from app.utils.json_provider import FastJSONProvider, orjson
+from app.utils.serializers import ACCOUNT_PROFILE, RECOMMENDATION
+
+INTERESTS = ['fitness', 'technology', 'travel', 'photography', 'music']
+
+
+def legacy_account(account, interests_text):
+    return {
+        'id': account.id,
+        'username': account.username,
+        'platform': account.platform.value if account.platform else None,
+        'interests': json.loads(interests_text) if interests_text else [],
+        'sentiment_filter': account.sentiment_filter.value if account.sentiment_filter else None,
+        'noise_blocker_enabled': account.noise_blocker_enabled
+    }
+
+
+def legacy_recommendation(rec):
+    return {
+        'id': rec.id,
+        'recommended_user': rec.recommended_user,
+        'reason': rec.reason,
+        'follow_status': rec.follow_status.value if rec.follow_status else None
+    }
+
+
+def per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(iterations=20_000):
+    app = Flask(__name__)
+    legacy_json = DefaultJSONProvider(app)
+    fast_json = FastJSONProvider(app)
+
+    account = Account(
+        id=1, username='bench_user', password='x', platform=Platform.INSTAGRAM, interests=list(INTERESTS),
+        sentiment_filter=SentimentFilter.POSITIVE, noise_blocker_enabled=True, created_at=datetime(2024, 1, 1)
+    )
+    interests_text = json.dumps(INTERESTS)
+    recommendations = [
+        FollowingRecommendation(
+            id=i, account_id=1, recommended_user=f'@creator{i}', reason='Often followed alongside @nike',
+            follow_status=FollowStatus.PENDING
+        )
+        for i in range(50)
+    ]
+    stats = {'followed_count': 3, 'skipped_count': 2, 'total_recommendations': 5}
+
+    def step3_legacy():
+        return legacy_json.dumps({'account': legacy_account(account, interests_text), 'stats': stats},
+                                 separators=(',', ':'))
+
+    def step3_fast():
+        return fast_json._encode({'account': ACCOUNT_PROFILE(account), 'stats': stats})
+
+    def step2_legacy():
+        return legacy_json.dumps({'recommendations': [legacy_recommendation(rec) for rec in recommendations]},
+                                 separators=(',', ':'))
+
+    def step2_fast():
+        return fast_json._encode({'recommendations': RECOMMENDATION.many(recommendations)})
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    for label, legacy, fast, n in (
+        ('step 3 (account + stats)', step3_legacy, step3_fast, iterations),
+        ('step 2 (50 recommendations)', step2_legacy, step2_fast, max(1, iterations // 10)),
+    ):
+        before, after = per_call_us(legacy, n), per_call_us(fast, n)
+        print(f"{label:<28} hand-built + json: {before:7.1f} us   serializer + fast json: {after:7.1f} us "
+              f"({before / after:.1f}x)")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,148 @@
+"""
+Benchmark: reader/writer throughput under the SQLite engine profiles
+
+Runs reader threads polling onboarding steps 2 and 3 alongside writer
+threads PUTting follow decisions for a fixed duration, once with the
+previous engine setup (default journal mode and synchronous, SQLAlchemy's
+default pool, no read engine) and once with the tuned profile (WAL,
+synchronous=NORMAL, mmap, busy_timeout, sized pool and a query_only read
+engine on the same file). Response and Account caches are disabled so
+every request reaches the database.
+
+Usage: python -m benchmarks.sqlite_concurrency [readers] [writers] [seconds]
+"""
+import random
+import sys
+import threading
+import time
+
+from benchmarks.common import bench_db_path, make_bench_app, remove_bench_db
+
+ACCOUNTS = 50
+
+PROFILES = {
+    'default': {
+        'SQLITE_TUNING_ENABLED': False,
+        'DB_POOL_SIZE': 5,
+        'DB_MAX_OVERFLOW': 10,
+    },
+    'tuned': {
+        'SQLITE_TUNING_ENABLED': True,
+        'DB_POOL_SIZE': 10,
+        'DB_MAX_OVERFLOW': 20,
+    },
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def setup_accounts(client):
+    accounts = []
+    for i in range(ACCOUNTS):
+        account_id = client.post('/api/onboarding/?step=0', json={
+            'username': f'concurrent_{i}', 'password': 'benchpass', 'platform': 'twitter'
+        }).get_json()['account']['id']
+        client.put('/api/onboarding/update', json={
+            'type': 'preferences', 'account_id': account_id,
+            'data': {'interests': ['technology', 'fitness', 'travel']}
+        })
+        recommendation_ids = [
+            rec['id'] for rec in
+            client.get(f'/api/onboarding/?step=2&account_id={account_id}').get_json()['recommendations']
+        ]
+        accounts.append((account_id, recommendation_ids))
+    return accounts
+
+
+def run_profile(name, readers, writers, seconds):
+    db_path = bench_db_path()
+    read_uri = f'sqlite:///{db_path}' if name == 'tuned' else None
+    app, db_path = make_bench_app(
+        db_path,
+        SQLALCHEMY_READ_DATABASE_URI=read_uri,
+        RESPONSE_CACHE_ENABLED=False,
+        ACCOUNT_CACHE_ENABLED=False,
+        COLLABORATIVE_RECOMMENDATIONS_ENABLED=False,
+        **PROFILES[name]
+    )
+    accounts = setup_accounts(app.test_client())
+
+    latencies = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader(seed):
+        client = app.test_client()
+        rng = random.Random(seed)
+        while not stop.is_set():
+            account_id, _ = rng.choice(accounts)
+            start = time.perf_counter()
+            response = client.get(f'/api/onboarding/?step={rng.choice((2, 3))}&account_id={account_id}')
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies['read'].append(elapsed)
+                errors['read'] += response.status_code != 200
+
+    def writer(seed):
+        client = app.test_client()
+        rng = random.Random(seed)
+        while not stop.is_set():
+            account_id, recommendation_ids = rng.choice(accounts)
+            start = time.perf_counter()
+            response = client.put('/api/onboarding/update', json={
+                'type': 'follow_status', 'account_id': account_id,
+                'recommendations': [
+                    {'id': rec_id, 'follow_status': rng.choice(('followed', 'skipped'))}
+                    for rec_id in recommendation_ids
+                ]
+            })
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies['write'].append(elapsed)
+                errors['write'] += response.status_code != 200
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    remove_bench_db(app, db_path)
+
+    return {
+        kind: {
+            'per_sec': len(values) / seconds,
+            'p50_ms': percentile(values, 0.5) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'errors': errors[kind],
+        }
+        for kind, values in latencies.items()
+    }
+
+
+def run(readers=8, writers=2, seconds=5.0):
+    results = {name: run_profile(name, readers, writers, seconds) for name in PROFILES}
+
+    print(f"SQLite concurrency ({readers} readers, {writers} writers, {seconds:.0f}s per profile):")
+    print(f"  {'profile':<9} {'kind':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for name, result in results.items():
+        for kind, stats in result.items():
+            print(f"  {name:<9} {kind:<6} {stats['per_sec']:>8.0f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p95_ms']:>8.2f} {stats['errors']:>7}")
+    return results
+
+
+if __name__ == '__main__':
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    )
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
-Initialize/recreate database with current schema
+Initialize database and apply pending schema migrations
+
+Existing data is kept. Pass --reset to delete the SQLite file and start
+from an empty schema.
 """
 from app import create_app
 from app.db.database import db
+from app.db.migrations import get_applied_versions, run_migrations
 import os
+import sys
 
-def init_database():
+def init_database(reset=False):
     """Initialize database with current schema"""
+    # create_app() creates missing tables and applies pending migrations
     app = create_app()
     
     with app.app_context():
@@ -19,31 +25,41 @@ def init_database():
         print(f"  Account columns: {[col.name for col in Account.__table__.columns]}")
         
         # Get database file path
-        db_path = app.config.get('SQLALCHEMY_DATABASE_URI', '').replace('sqlite:///', '')
+        db_path = db.engine.url.database
         
         print(f"🗄️  Database file: {db_path}")
         
-        # Remove existing database file if it exists
-        if db_path and os.path.exists(db_path):
+        # Remove existing database file only when explicitly asked to
+        if reset and db_path and os.path.exists(db_path):
             print(f"🗑️  Removing existing database: {db_path}")
-            os.remove(db_path)
+            for engine in db.engines.values():
+                engine.dispose()
+            # WAL mode leaves -wal/-shm files next to the database
+            for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            
+            print("🏗️  Creating database tables...")
+            db.create_all()
         
-        # Create all tables with current schema
-        print("🏗️  Creating database tables...")
-        db.create_all()
+        print("⬆️  Applying migrations...")
+        run_migrations(db.engine, verbose=True)
+        print(f"📌 Schema versions applied: {sorted(get_applied_versions(db.engine))}")
         
         # Verify tables were created
         inspector = db.inspect(db.engine)
         tables = inspector.get_table_names()
         
-        print("✅ Created tables:")
+        print("✅ Tables:")
         for table in tables:
             columns = inspector.get_columns(table)
             print(f"  📋 {table}:")
             for col in columns:
                 print(f"    - {col['name']} ({col['type']})")
+            for index in inspector.get_indexes(table):
+                print(f"    🔑 {index['name']} ({', '.join(index['column_names'])})")
         
         print("\n🎉 Database initialized successfully!")
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database(reset='--reset' in sys.argv[1:])
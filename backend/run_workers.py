@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Run the agent job worker pool
+
+Workers claim queued jobs from the agent_jobs table and run them with the
+runner named by AGENT_RUNNER ('browser_use' or 'stub'). Concurrency per
+platform comes from AGENT_WORKER_CONCURRENCY, e.g. "instagram=2,twitter=1".
+With AGENT_RUN_MODE=parallel each browser_use job logs in once and then runs
+up to AGENT_SUBTASK_CONCURRENCY per-interest subtasks side by side.
+"""
+from app import create_app
+from app.agents.macros import LoginMacros
+from app.agents.runners import get_runner
+from app.agents.session_cache import BrowserSessionCache
+from app.agents.worker_pool import AgentWorkerPool
+from app.feed.classification_cache import ClassificationCache
+from app.feed.interest_classifier import LLMInterestClassifier, openai_completion
+from app.feed.interest_prescorer import GatedInterestClassifier, InterestPrescorer
+from app.feed.noise_blocker import NoiseBlocker
+from app.feed.sentiment import SentimentScorer
+import os
+import time
+
+def build_feed_classifier(config):
+    """Local pre-scorer in front of the cached LLM classifier, or None if the LLM client cannot be built"""
+    try:
+        classifier = GatedInterestClassifier(
+            InterestPrescorer(),
+            LLMInterestClassifier(openai_completion(), ClassificationCache.from_config(config))
+        )
+    except Exception as e:
+        # No openai package or no API key: posts are still extracted and recorded, just not triaged
+        print(f"🏷️ Feed classifier disabled: {e}")
+        return None
+    return classifier
+
+def build_noise_blocker(config):
+    """Hot-reloading blocker over NOISE_RULES_PATH, shared by every worker, or None if the rules cannot be loaded"""
+    try:
+        blocker = NoiseBlocker.from_config(config)
+    except (OSError, ValueError) as e:
+        print(f"🚫 Noise blocker disabled: {e}")
+        return None
+    print(f"🚫 Noise blocker: {blocker.stats()['rules']} rules from {blocker.path} (reload check every {blocker.reload_seconds}s)")
+    return blocker
+
+def run_workers():
+    app = create_app()
+    runner_options = {}
+    if app.config['AGENT_RUNNER'] == 'browser_use':
+        session_cache = BrowserSessionCache.from_config(app.config)
+        print(f"🍪 Browser session cache: {'enabled' if session_cache else 'disabled (no SESSION_CACHE_KEY)'}")
+        runner_options['session_cache'] = session_cache
+        runner_options['mode'] = app.config['AGENT_RUN_MODE']
+        runner_options['subtask_concurrency'] = app.config['AGENT_SUBTASK_CONCURRENCY']
+        runner_options['subtask_retries'] = app.config['AGENT_SUBTASK_RETRIES']
+        login_macros = LoginMacros.from_config(app.config, os.path.join(app.instance_path, 'login_macros'))
+        print(f"🎬 Login macros: {'enabled' if login_macros else 'disabled'}")
+        runner_options['login_macros'] = login_macros
+        runner_options['feed_extraction'] = app.config['FEED_EXTRACTION_ENABLED']
+        runner_options['feed_classifier'] = build_feed_classifier(app.config)
+        runner_options['noise_blocker'] = build_noise_blocker(app.config)
+        runner_options['sentiment_scorer'] = SentimentScorer.from_config(app.config)
+        print(f"🧭 Run mode: {app.config['AGENT_RUN_MODE']} (up to {app.config['AGENT_SUBTASK_CONCURRENCY']} subtasks at once)")
+    runner = get_runner(app.config['AGENT_RUNNER'], **runner_options)
+    pool = AgentWorkerPool.from_config(app, runner)
+    
+    workers = ', '.join(f"{platform.value}={count}" for platform, count in pool.concurrency.items())
+    print(f"🤖 Starting agent workers ({app.config['AGENT_RUNNER']} runner): {workers}")
+    pool.start()
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers, waiting for running jobs...")
+        pool.stop()
+
+if __name__ == "__main__":
+    run_workers()